@@ -1,5 +1,6 @@
 import logging
 import os
+from typing import Callable
 
 from django.apps import AppConfig
 from django.conf import settings
@@ -32,13 +33,64 @@ class APIConfig(AppConfig):
             self.perform_time_consuming_initializations()
 
     def perform_time_consuming_initializations(self):
-        from CreeDictionary.API.search import affix
-        from morphodict.lexicon.models import wordform_cache
+        """Load everything that would otherwise be loaded on first use
 
+        With MORPHODICT_PRELOAD_BEFORE_FORK, this runs once in the uwsgi master
+        process, and the workers share what it loads.
+        """
         logger.debug("preloading caches")
-        affix.cache.preload()
-        wordform_cache.preload()
-        if settings.MORPHODICT_ENABLE_CVD:
-            cvd.preload_models()
-
+        for name, initializer in startup_initializers():
+            logger.debug(f"preloading {name}")
+            initializer()
         logger.debug("done")
+
+
+def startup_initializers() -> list[tuple[str, Callable[[], object]]]:
+    """The steps of perform_time_consuming_initializations(), by name
+
+    The profilestartup command times each one separately.
+    """
+    from CreeDictionary.API.search import affix, fuzzy
+    from CreeDictionary.API.search.preverbs import preverb_index
+    from CreeDictionary.CreeDictionary.paradigm.generation import (
+        default_paradigm_manager,
+    )
+    from CreeDictionary.CreeDictionary.relabelling import read_labels
+    from CreeDictionary.phrase_translate.translate import (
+        eng_phrase_to_crk_features_fst,
+    )
+    from morphodict.analysis import (
+        relaxed_analyzer,
+        strict_analyzer,
+        strict_generator,
+    )
+    from morphodict.lexicon.models import wordform_cache
+
+    initializers: list[tuple[str, Callable[[], object]]] = [
+        (
+            "source-language affix searcher",
+            lambda: affix.cache.source_language_affix_searcher,
+        ),
+        (
+            "target-language affix searcher",
+            lambda: affix.cache.target_language_affix_searcher,
+        ),
+    ]
+    if settings.MORPHODICT_ENABLE_FUZZY_SEARCH:
+        initializers.append(("fuzzy searcher", fuzzy.cache.preload))
+    initializers += [
+        ("preverb index", preverb_index.preload),
+        ("morpheme rankings", wordform_cache.preload),
+        ("relabellings", read_labels),
+        ("paradigm manager", default_paradigm_manager),
+        ("strict analyzer FST", strict_analyzer),
+        ("relaxed analyzer FST", relaxed_analyzer),
+        ("strict generator FST", strict_generator),
+        ("English phrase FST", eng_phrase_to_crk_features_fst),
+    ]
+    if settings.MORPHODICT_ENABLE_CVD:
+        initializers += [
+            ("definition vectors", cvd.preload_definition_vectors),
+            ("news vectors", cvd.preload_news_vectors),
+        ]
+    return initializers
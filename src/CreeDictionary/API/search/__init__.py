@@ -1,16 +1,41 @@
-from .runner import search
+from __future__ import annotations
 
+from typing import NamedTuple, Optional
 
-def search_with_affixes(query: str, include_auto_definitions=False):
+# runner has to be imported before the other modules in this package, which
+# otherwise end up importing each other in a circle.
+from .runner import search  # isort: skip
+
+from crkeng.app.preferences import DisplayMode, AnimateEmoji
+from .batch import search_many
+from .core import SearchRun
+from .query import Query, treat_query
+from .result_cache import search_result_cache
+
+
+def search_with_affixes(
+    query: str,
+    include_auto_definitions=False,
+    limit: Optional[int] = None,
+    offset: int = 0,
+):
     """
     Search for wordforms matching:
      - the wordform text
      - the definition keyword text
      - affixes of the wordform text
      - affixes of the definition keyword text
+
+    limit and offset select the page of results that the returned SearchRun
+    presents.
     """
 
-    return search(query=query, include_auto_definitions=include_auto_definitions)
+    return search(
+        query=query,
+        include_auto_definitions=include_auto_definitions,
+        limit=limit,
+        offset=offset,
+    )
 
 
 def simple_search(query: str, include_auto_definitions=False):
@@ -20,8 +45,80 @@ def simple_search(query: str, include_auto_definitions=False):
     Does NOT try to match affixes!
     """
 
-    return search(
-        query=query,
+    return cached_serialized_search(
+        query,
         include_affixes=False,
         include_auto_definitions=include_auto_definitions,
-    ).serialized_presentation_results()
+    ).results
+
+
+class SerializedSearchResults(NamedTuple):
+    #: None when the results came from the cache
+    search_run: Optional[SearchRun]
+    #: The requested page of serialized presentation results
+    results: list
+    #: How many results there are on all pages
+    total_count: int
+
+
+def cached_serialized_search(
+    query: str,
+    *,
+    include_affixes=True,
+    include_auto_definitions=False,
+    display_mode=DisplayMode.default,
+    animate_emoji=AnimateEmoji.default,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> SerializedSearchResults:
+    """
+    Search, returning serialized presentation results, using the process-wide
+    search result cache.
+
+    The results list is shared with other callers, so do not mutate it.
+
+    Queries with verbose:1 are never cached, since their output includes
+    per-request debugging information.
+    """
+
+    def run_search():
+        return search(
+            query=query,
+            include_affixes=include_affixes,
+            include_auto_definitions=include_auto_definitions,
+            limit=limit,
+            offset=offset,
+        )
+
+    def serialize(search_run):
+        return (
+            search_run.serialized_presentation_results(
+                display_mode=display_mode, animate_emoji=animate_emoji
+            ),
+            search_run.result_count,
+        )
+
+    if Query(query).verbose:
+        search_run = run_search()
+        return SerializedSearchResults(search_run, *serialize(search_run))
+
+    search_runs: list[SearchRun] = []
+
+    def compute():
+        search_run = run_search()
+        search_runs.append(search_run)
+        return serialize(search_run)
+
+    key = (
+        treat_query(query),
+        include_affixes,
+        include_auto_definitions,
+        display_mode,
+        animate_emoji,
+        limit,
+        offset,
+    )
+    results, total_count = search_result_cache.get_or_compute(key, compute)
+    return SerializedSearchResults(
+        search_runs[0] if search_runs else None, results, total_count
+    )
@@ -18,7 +18,7 @@ import dawg
 from django.conf import settings
 
 from morphodict.lexicon.models import Wordform, TargetLanguageKeyword
-from CreeDictionary.utils import get_modified_distance
+from CreeDictionary.utils import get_modified_distances
 from CreeDictionary.utils.cree_lev_dist import remove_cree_diacritics
 from morphodict.lexicon.util import to_source_language_keyword
 from .types import (
@@ -111,14 +111,16 @@ def do_source_language_affix_search(search_run: core.SearchRun):
         search_run.internal_query,
         cache.source_language_affix_searcher,
     )
-    for word in matching_words:
+    matching_words = list(matching_words)
+    distances = get_modified_distances(
+        [word.text for word in matching_words], search_run.internal_query
+    )
+    for word, distance in zip(matching_words, distances):
         search_run.add_result(
             Result(
                 word,
                 source_language_affix_match=True,
-                query_wordform_edit_distance=get_modified_distance(
-                    word.text, search_run.internal_query
-                ),
+                query_wordform_edit_distance=float(distance),
             )
         )
 
@@ -0,0 +1,218 @@
+"""
+Searching for many queries at once
+
+Clients that annotate whole paragraphs, like the click-in-text reading
+assistant, would otherwise send one request—and run several SQL queries and
+FST lookups—per word. search_many() runs the same searches as simple_search()
+for a whole batch of queries, but shares the database work between them:
+
+  - one query for the target-language keywords of every query
+  - one query for the source-language keywords of every query
+  - one relaxed FST analysis per distinct query, and one `analysis_key__in`
+    query for all the resulting analyses
+  - one `prefetch_related_objects` pass over every result wordform
+
+CVD and ESPT still run per query, since they have nothing to share.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.conf import settings
+
+from crkeng.app.preferences import DisplayMode, AnimateEmoji
+from CreeDictionary.utils import get_modified_distance
+from CreeDictionary.utils.english_keyword_extraction import stem_keywords
+from CreeDictionary.utils.types import cast_away_optional
+from morphodict.analysis import RichAnalysis, rich_analyze_relaxed
+from morphodict.lexicon.models import (
+    Wordform,
+    SourceLanguageKeyword,
+    TargetLanguageKeyword,
+)
+from morphodict.lexicon.util import (
+    to_source_language_keyword,
+    to_target_language_keyword,
+)
+from .core import SearchRun
+from .cvd_search import do_cvd_search
+from .espt import EsptSearch
+from .fuzzy import do_source_language_fuzzy_search, should_do_fuzzy_search
+from .lookup import add_relaxed_analysis_results
+from .presentation import prefetch_for_presentation
+from .query import CvdSearchType
+from .runner import is_almost_certainly_cree, search
+from .types import Result
+from .util import first_non_none_value
+
+
+def search_many(
+    queries: Iterable[str],
+    *,
+    include_auto_definitions=False,
+    display_mode=DisplayMode.default,
+    animate_emoji=AnimateEmoji.default,
+) -> dict[str, list]:
+    """
+    Search for each of the queries, returning a dict mapping each distinct
+    query to its serialized presentation results.
+
+    Like simple_search(), this does NOT try to match affixes.
+    """
+    search_runs = {
+        query: SearchRun(query=query, include_auto_definitions=include_auto_definitions)
+        for query in dict.fromkeys(queries)
+    }
+
+    batched_runs = []
+    for query, search_run in search_runs.items():
+        if (
+            settings.MORPHODICT_ENABLE_CVD
+            and search_run.query.cvd == CvdSearchType.EXCLUSIVE
+        ):
+            # A debugging mode with its own sort order; not worth batching
+            search_runs[query] = search(
+                query=query,
+                include_affixes=False,
+                include_auto_definitions=include_auto_definitions,
+            )
+        else:
+            batched_runs.append(search_run)
+
+    espt_searches = {}
+    for search_run in batched_runs:
+        if search_run.query.espt:
+            espt_searches[search_run] = EsptSearch(search_run)
+            with search_run.stage("espt_analysis"):
+                espt_searches[search_run].analyze_query()
+
+    _fetch_target_language_keyword_results(batched_runs)
+    _fetch_source_language_keyword_results(batched_runs)
+    _fetch_relaxed_analysis_results(batched_runs)
+
+    if settings.MORPHODICT_ENABLE_CVD:
+        for search_run in batched_runs:
+            cvd_search_type = cast_away_optional(
+                first_non_none_value(
+                    search_run.query.cvd, default=CvdSearchType.DEFAULT
+                )
+            )
+            if cvd_search_type.should_do_search() and not is_almost_certainly_cree(
+                search_run
+            ):
+                with search_run.stage("cvd"):
+                    do_cvd_search(search_run)
+
+    if settings.MORPHODICT_ENABLE_FUZZY_SEARCH:
+        for search_run in batched_runs:
+            if should_do_fuzzy_search(search_run):
+                with search_run.stage("source_language_fuzzy"):
+                    do_source_language_fuzzy_search(search_run)
+
+    for search_run, espt_search in espt_searches.items():
+        with search_run.stage("espt_inflection"):
+            espt_search.inflect_search_results()
+
+    # Every SearchRun prefetches these again before presenting its results,
+    # but Django skips instances whose related objects are already loaded.
+    prefetch_for_presentation(
+        [
+            result.wordform
+            for search_run in search_runs.values()
+            for result in search_run.unsorted_results()
+        ]
+    )
+
+    return {
+        query: search_run.serialized_presentation_results(
+            display_mode=display_mode, animate_emoji=animate_emoji
+        )
+        for query, search_run in search_runs.items()
+    }
+
+
+def _fetch_target_language_keyword_results(search_runs: list[SearchRun]):
+    # normalized keyword → [(search_run, stemmed keyword)]
+    runs_by_keyword = defaultdict(list)
+    for search_run in search_runs:
+        for stemmed_keyword in stem_keywords(search_run.internal_query):
+            runs_by_keyword[to_target_language_keyword(stemmed_keyword)].append(
+                (search_run, stemmed_keyword)
+            )
+    if not runs_by_keyword:
+        return
+
+    for keyword in TargetLanguageKeyword.objects.filter(
+        normalized_text__in=runs_by_keyword.keys()
+    ).select_related("wordform__lemma"):
+        for search_run, stemmed_keyword in runs_by_keyword[keyword.normalized_text]:
+            search_run.add_result(
+                Result(
+                    keyword.wordform, target_language_keyword_match=[stemmed_keyword]
+                )
+            )
+
+
+def _fetch_source_language_keyword_results(search_runs: list[SearchRun]):
+    runs_by_keyword = defaultdict(list)
+    for search_run in search_runs:
+        runs_by_keyword[to_source_language_keyword(search_run.internal_query)].append(
+            search_run
+        )
+    if not runs_by_keyword:
+        return
+
+    for keyword in SourceLanguageKeyword.objects.filter(
+        text__in=runs_by_keyword.keys()
+    ).select_related("wordform__lemma"):
+        for search_run in runs_by_keyword[keyword.text]:
+            search_run.add_result(
+                Result(
+                    keyword.wordform,
+                    source_language_keyword_match=[keyword.text],
+                    query_wordform_edit_distance=get_modified_distance(
+                        search_run.internal_query, keyword.wordform.text
+                    ),
+                )
+            )
+
+
+def _fetch_relaxed_analysis_results(search_runs: list[SearchRun]):
+    analyses_by_text: dict[str, set[RichAnalysis]] = {}
+    for search_run in search_runs:
+        text = search_run.internal_query
+        if text not in analyses_by_text:
+            analyses_by_text[text] = set(rich_analyze_relaxed(text))
+
+    all_analyses = set().union(*analyses_by_text.values())
+    if not all_analyses:
+        return
+
+    db_matches_by_analysis = defaultdict(list)
+    for wordform in Wordform.objects.filter(
+        analysis_key__in=[a.smushed() for a in all_analyses]
+    ):
+        db_matches_by_analysis[wordform.analysis].append(wordform)
+
+    # Lemmas for the analyses that are not in the database, e.g., forms with
+    # reduplication, used to build synthetic wordforms.
+    unmatched_lemmas = {
+        a.lemma for a in all_analyses if a not in db_matches_by_analysis
+    }
+    lemmas_by_text = defaultdict(list)
+    if unmatched_lemmas:
+        for wordform in Wordform.objects.filter(
+            text__in=unmatched_lemmas, is_lemma=True
+        ):
+            lemmas_by_text[wordform.text].append(wordform)
+
+    for search_run in search_runs:
+        fst_analyses = analyses_by_text[search_run.internal_query]
+        add_relaxed_analysis_results(
+            search_run,
+            fst_analyses,
+            [wf for a in fst_analyses for wf in db_matches_by_analysis.get(a, [])],
+            lemma_candidates=lambda analysis: lemmas_by_text.get(analysis.lemma, []),
+        )
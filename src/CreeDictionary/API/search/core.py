@@ -1,11 +1,10 @@
 from typing import Iterable, Callable, Any, Optional
 
-from django.db.models import prefetch_related_objects
-
 from crkeng.app.preferences import DisplayMode, AnimateEmoji
 from morphodict.lexicon.models import WordformKey
-from . import types, presentation
+from . import types, presentation, ranking
 from .query import Query
+from .timing import StageTiming, measure_stage
 from .types import Result
 from .util import first_non_none_value
 
@@ -19,24 +18,41 @@ class SearchRun:
     and to add results to the result collection for future ranking.
     """
 
-    def __init__(self, query: str, include_auto_definitions=None):
+    def __init__(
+        self,
+        query: str,
+        include_auto_definitions=None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ):
         self.query = Query(query)
         self.include_auto_definitions = first_non_none_value(
             self.query.auto, include_auto_definitions, default=False
         )
+        self.limit = limit
+        self.offset = offset
         self._results = {}
         self._verbose_messages = []
+        self._stage_timings = []
+        self._add_count = 0
 
     include_auto_definition: bool
+    # Which page of the sorted results to present; a limit of None means all
+    limit: Optional[int]
+    offset: int
     _results: dict[WordformKey, types.Result]
     VerboseMessage = dict[str, str]
     _verbose_messages: list[VerboseMessage]
+    _stage_timings: list[StageTiming]
+    # How many times add_result() has been called, for stage instrumentation
+    _add_count: int
     # Set this to use a custom sort function
     sort_function: Optional[Callable[[Result], Any]] = None
 
     def add_result(self, result: types.Result):
         if not isinstance(result, types.Result):
             raise TypeError(f"{result} is {type(result)}, not Result")
+        self._add_count += 1
         key = result.wordform.key
         if key in self._results:
             self._results[key].add_features_from(result)
@@ -52,37 +68,44 @@ class SearchRun:
     def unsorted_results(self) -> Iterable[types.Result]:
         return self._results.values()
 
-    def sorted_results(self) -> list[types.Result]:
+    def sorted_results(self, limit: Optional[int] = None) -> list[types.Result]:
+        """
+        Return the results, best first.
+
+        If limit is given, only the best `limit` results are returned, which
+        saves sorting all the others.
+        """
         results = list(self._results.values())
-        for r in results:
-            r.assign_default_relevance_score()
+        scores = ranking.assign_relevance_scores(results)
 
         if self.sort_function is not None:
             results.sort(key=self.sort_function)
-        else:
-            results.sort()
-        return results
+            return results[:limit]
+        return [results[i] for i in ranking.top_k_indices(scores, limit)]
 
     def presentation_results(
         self,
         display_mode=DisplayMode.default,
         animate_emoji=AnimateEmoji.default,
     ) -> list[presentation.PresentationResult]:
-        results = self.sorted_results()
-        prefetch_related_objects(
-            [r.wordform for r in results],
-            "lemma__definitions__citations",
-            "definitions__citations",
-        )
-        return [
-            presentation.PresentationResult(
-                r,
-                search_run=self,
-                display_mode=display_mode,
-                animate_emoji=animate_emoji,
-            )
-            for r in results
-        ]
+        """
+        Return PresentationResults for the requested page of results only, so
+        that results that will not be shown are never relabelled, prefetched,
+        or serialized.
+        """
+        with self.stage("presentation"):
+            end = None if self.limit is None else self.offset + self.limit
+            results = self.sorted_results(limit=end)[self.offset :]
+            presentation.prefetch_for_presentation([r.wordform for r in results])
+            return [
+                presentation.PresentationResult(
+                    r,
+                    search_run=self,
+                    display_mode=display_mode,
+                    animate_emoji=animate_emoji,
+                )
+                for r in results
+            ]
 
     def serialized_presentation_results(
         self, display_mode=DisplayMode.default, animate_emoji=AnimateEmoji.default
@@ -92,6 +115,11 @@ class SearchRun:
         )
         return [r.serialize() for r in results]
 
+    @property
+    def result_count(self) -> int:
+        """The number of results on all pages"""
+        return len(self._results)
+
     def add_verbose_message(self, message=None, **messages):
         """
         Add any arbitrary JSON-serializable data to be displayed to the user at the
@@ -115,9 +143,35 @@ class SearchRun:
         if messages:
             self._verbose_messages.append(messages)
 
+    def stage(self, name: str):
+        """
+        Record wall time, SQL query count, and number of results added for the
+        search stage run inside this context manager.
+
+            with search_run.stage("cvd"):
+                do_cvd_search(search_run)
+        """
+        add_count_before = self._add_count
+        return measure_stage(
+            name,
+            results_added=lambda: self._add_count - add_count_before,
+            record=self.record_stage_timing,
+        )
+
+    def record_stage_timing(self, timing: StageTiming):
+        self._stage_timings.append(timing)
+
+    @property
+    def stage_timings(self) -> list[StageTiming]:
+        return self._stage_timings
+
     @property
     def verbose_messages(self):
-        return self._verbose_messages
+        if not self._stage_timings:
+            return self._verbose_messages
+        return self._verbose_messages + [
+            {"stage_timings": [t.serialize() for t in self._stage_timings]}
+        ]
 
     @property
     def internal_query(self):
@@ -1,9 +1,11 @@
-import itertools
 import logging
 
+from django.db.models import Q
+
 from CreeDictionary.API.search.core import SearchRun
 from CreeDictionary.API.search.types import Result
 from CreeDictionary.cvd import (
+    definition_vector_index,
     definition_vectors,
     google_news_vectors,
     extract_keyed_words,
@@ -11,7 +13,9 @@ from CreeDictionary.cvd import (
     DefinitionVectorsNotFoundException,
 )
 from CreeDictionary.cvd.definition_keys import (
+    CvdKey,
     cvd_key_to_wordform_query,
+    cvd_keys_to_wordform_ids,
     wordform_query_matches,
 )
 from morphodict.lexicon.models import Wordform
@@ -33,35 +37,79 @@ def do_cvd_search(search_run: SearchRun):
     query_vector = vector_for_keys(google_news_vectors(), keys)
 
     try:
-        closest = definition_vectors().similar_by_vector(query_vector, 50)
+        closest = definition_vector_index().similar_by_vector(query_vector, 50)
     except DefinitionVectorsNotFoundException:
         logger.exception("")
         return
 
+    wordform_ids = cvd_keys_to_wordform_ids(
+        definition_vectors(), [cvd_key for cvd_key, similarity in closest]
+    )
+    if wordform_ids is None:
+        add_results_by_wordform_query(search_run, closest)
+        return
+
+    wordforms = Wordform.objects.in_bulk(set(wordform_ids))
+    # An import since this process loaded the vectors may have recreated some
+    # wordforms under new ids; find those the old way
+    not_found = []
+    for (cvd_key, similarity), wordform_id in zip(closest, wordform_ids):
+        wordform = wordforms.get(wordform_id)
+        if wordform is None:
+            not_found.append((cvd_key, similarity))
+        else:
+            search_run.add_result(
+                Result(wordform, cosine_vector_distance=cosine_distance(similarity))
+            )
+    if not_found:
+        add_results_by_wordform_query(search_run, not_found)
+
+
+def cosine_distance(similarity: float) -> float:
+    # gensim uses the terminology, similarity = 1 - distance. Its
+    # similarity is a number from 0 to 1, with more similar items having
+    # similarity closer to 1. A distance should be small for things that
+    # are close together.
+    return 1 - similarity
+
+
+def add_results_by_wordform_query(
+    search_run: SearchRun, closest: list[tuple[CvdKey, float]]
+):
+    """Find the wordforms of CVD keys by their text and analysis
+
+    For definition vectors built before they stored the wordform ids.
+    """
     wordform_queries = [
-        cvd_key_to_wordform_query(similarity) for similarity, weight in closest
+        cvd_key_to_wordform_query(cvd_key) for cvd_key, similarity in closest
     ]
     similarities = [similarity for cvd_key, similarity in closest]
 
-    # Get all possible wordforms in one big query. We will select more than we
-    # need, then filter it down later, but this will have to do until we get
-    # better homonym handling.
+    # Get all possible wordforms in one big query: analyzed wordforms through
+    # the analysis_key index, and unanalyzed ones by text. We may select more
+    # than we need, then filter it down later, but this will have to do until
+    # we get better homonym handling.
     wordform_results = Wordform.objects.filter(
-        text__in=set(wf["text"] for wf in wordform_queries)
+        Q(
+            analysis_key__in=set(
+                wf["analysis_key"] for wf in wordform_queries if "analysis_key" in wf
+            )
+        )
+        | Q(
+            text__in=set(
+                wf["text"] for wf in wordform_queries if "analysis_key" not in wf
+            ),
+            analysis_key__isnull=True,
+        )
     )
 
     # Now match back up
-    wordforms_by_text = {
-        text: list(wordforms)
-        for text, wordforms in itertools.groupby(wordform_results, key=lambda x: x.text)
-    }
+    wordforms_by_text: dict[str, list[Wordform]] = {}
+    for wordform in wordform_results:
+        wordforms_by_text.setdefault(wordform.text, []).append(wordform)
 
     for similarity, wordform_query in zip(similarities, wordform_queries):
-        # gensim uses the terminology, similarity = 1 - distance. Its
-        # similarity is a number from 0 to 1, with more similar items having
-        # similarity closer to 1. A distance should be small for things that
-        # are close together.
-        distance = 1 - similarity
+        distance = cosine_distance(similarity)
 
         wordforms_for_query = wordforms_by_text.get(wordform_query["text"], None)
         if wordforms_for_query is None:
@@ -0,0 +1,190 @@
+"""
+Fuzzy source-language search
+
+The relaxed analyzer copes with most spelling variation in source-language
+queries, but it can only help with words it can analyze. When a misspelled
+query has no analysis and doesn’t match a source-language keyword exactly,
+this stage suggests lemmas and keywords that are within a small
+get_modified_distance() of what was typed.
+
+Candidates are found with a SymSpell-style deletion index: every indexed term
+is stored under each string that can be made by deleting up to `max_edits`
+characters from it. Two terms within `max_edits` plain edits of each other
+always share one of those strings, so a lookup is a handful of dict accesses
+instead of a scan over the whole lexicon. The candidates are then checked
+against the real, Cree-aware distance.
+
+The edits that cost less than 1, diacritics and h’s in a rime, are left out
+of the index keys altogether, so wâhpamêhw and wâpamêw share a key. That way
+only whole-cost edits count towards `max_edits`, and a distance of 1 needs
+an index just one deletion deep.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import defaultdict
+from functools import cached_property
+from typing import Iterable, Iterator, Tuple
+
+from django.conf import settings
+
+from CreeDictionary.utils import get_modified_distances
+from morphodict.lexicon.models import Wordform, SourceLanguageKeyword
+from morphodict.lexicon.util import to_source_language_keyword
+from . import core
+from .affix import fetch_source_language_lemmas_with_ids
+from .types import Result
+
+# Deleting characters from very short words matches almost anything.
+MIN_QUERY_LENGTH = 4
+
+# An h right after a vowel, which costs only ½ to add or drop
+RIME_H = re.compile("(?<=[aeio])h")
+
+
+class FuzzySearcher:
+    """
+    Finds the wordform IDs of indexed words within a bounded edit distance of a
+    query.
+
+    Searches can use any max_distance up to the one the searcher was built for.
+    """
+
+    def __init__(self, words: Iterable[Tuple[str, int]], max_distance: float):
+        max_edits = math.floor(max_distance)
+        self.max_edits = max_edits
+
+        # index key → [(original text, wordform ID)]
+        self._term_entries: dict[str, list[Tuple[str, int]]] = defaultdict(list)
+        for text, wordform_id in words:
+            if term := _index_key(text):
+                self._term_entries[term].append((text, wordform_id))
+
+        # deletion variant → indices into self._terms
+        self._terms = list(self._term_entries.keys())
+        self._variants: dict[str, list[int]] = defaultdict(list)
+        for i, term in enumerate(self._terms):
+            for variant in _deletion_variants(term, max_edits):
+                self._variants[variant].append(i)
+
+    def search(self, query: str, max_distance: float) -> list[Tuple[int, float]]:
+        """
+        :return: (wordform ID, get_modified_distance(text, query)) pairs for
+            indexed words within max_distance of the query
+        """
+        term = _index_key(query)
+        if not term:
+            return []
+
+        term_indices: set[int] = set()
+        for variant in _deletion_variants(term, self.max_edits):
+            term_indices.update(self._variants.get(variant, ()))
+
+        entries = [
+            entry for i in term_indices for entry in self._term_entries[self._terms[i]]
+        ]
+        distances = get_modified_distances(
+            [text for text, _ in entries], query, max_distance=max_distance
+        )
+        return [
+            (wordform_id, float(distance))
+            for (_, wordform_id), distance in zip(entries, distances)
+            if distance <= max_distance
+        ]
+
+
+def _index_key(text: str) -> str:
+    """
+    The text without the parts that get_modified_distance() charges less than
+    1 to change
+
+    >>> _index_key("wâhpamêhw")
+    'wapamew'
+    """
+    return RIME_H.sub("", to_source_language_keyword(text))
+
+
+def _deletion_variants(term: str, max_edits: int) -> Iterator[str]:
+    """
+    Every non-empty string made by deleting up to max_edits characters from
+    term, including term itself.
+
+    >>> sorted(_deletion_variants("abc", 1))
+    ['ab', 'abc', 'ac', 'bc']
+    """
+    seen = {term}
+    frontier = {term}
+    for _ in range(max_edits):
+        frontier = {
+            word[:i] + word[i + 1 :]
+            for word in frontier
+            if len(word) > 1
+            for i in range(len(word))
+        } - seen
+        seen |= frontier
+    return iter(seen)
+
+
+def fetch_source_language_keywords_with_ids():
+    """
+    Return tuple of (text, Wordform ID) pairs for all source-language keywords
+    """
+    return tuple(SourceLanguageKeyword.objects.values_list("text", "wordform__id"))
+
+
+def should_do_fuzzy_search(search_run: core.SearchRun) -> bool:
+    """
+    Only guess at misspellings when nothing else matched the query as a
+    source-language word.
+    """
+    query = search_run.query
+    if len(query.query_terms) != 1:
+        return False
+    if len(to_source_language_keyword(search_run.internal_query)) < MIN_QUERY_LENGTH:
+        return False
+    return not any(r.did_match_source_language for r in search_run.unsorted_results())
+
+
+def do_source_language_fuzzy_search(search_run: core.SearchRun):
+    max_distance = settings.FUZZY_SEARCH_MAX_DISTANCE
+    matches = cache.source_language_fuzzy_searcher.search(
+        search_run.internal_query, max_distance
+    )
+
+    # A wordform can be indexed under several texts; keep the closest one.
+    distances: dict[int, float] = {}
+    for wordform_id, distance in matches:
+        distances[wordform_id] = min(distance, distances.get(wordform_id, math.inf))
+
+    for wordform in Wordform.objects.filter(id__in=distances.keys()):
+        search_run.add_result(
+            Result(
+                wordform,
+                source_language_fuzzy_match=True,
+                query_wordform_edit_distance=distances[wordform.id],
+            )
+        )
+
+
+class _Cache:
+    """A holder for cached properties, like affix._Cache"""
+
+    @cached_property
+    def source_language_fuzzy_searcher(self) -> FuzzySearcher:
+        return FuzzySearcher(
+            fetch_source_language_lemmas_with_ids()
+            + fetch_source_language_keywords_with_ids(),
+            max_distance=settings.FUZZY_SEARCH_MAX_DISTANCE,
+        )
+
+    def preload(self):
+        """Preload caches by accessing cached properties
+
+        To be called on production server startup.
+        """
+        self.source_language_fuzzy_searcher
+
+
+cache = _Cache()
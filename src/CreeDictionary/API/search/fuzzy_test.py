@@ -0,0 +1,55 @@
+import pytest
+
+from CreeDictionary.API.search.fuzzy import FuzzySearcher
+from CreeDictionary.API.search.ranking import assign_relevance_score
+from CreeDictionary.API.search.types import Result
+from morphodict.lexicon.models import Wordform
+
+WORDS = [
+    ("acâhkos", 1),
+    ("wâpamêw", 2),
+    ("nipâw", 3),
+    ("wâpiskisiw", 4),
+    ("acahkos", 5),
+]
+
+
+@pytest.mark.parametrize(
+    ("query", "max_distance", "expected_ids"),
+    [
+        # a deleted letter, plus a diacritic for 5
+        ("acâhko", 1, {1}),
+        ("acâhko", 1.5, {1, 5}),
+        # a wrong letter
+        ("wâpamâw", 1, {2}),
+        # diacritics and an h in a rime are cheap
+        ("wapamew", 0.5, {2}),
+        # two ½-cost edits, each a plain deletion
+        ("wâhpamêhw", 1, {2}),
+        # too far away
+        ("wâpiskw", 1, set()),
+        ("nipâw", 0, {3}),
+    ],
+)
+def test_fuzzy_searcher(query, max_distance, expected_ids):
+    searcher = FuzzySearcher(WORDS, max_distance=1.5)
+    matches = searcher.search(query, max_distance)
+    assert {wordform_id for wordform_id, _ in matches} == expected_ids
+    assert all(distance <= max_distance for _, distance in matches)
+
+
+def test_fuzzy_matches_rank_after_real_matches():
+    def make_result(**kwargs):
+        wf = Wordform(text="nipâw", is_lemma=True)
+        wf.lemma = wf
+        result = Result(wf, **kwargs)
+        assign_relevance_score(result)
+        return result
+
+    fuzzy = make_result(
+        source_language_fuzzy_match=True, query_wordform_edit_distance=0.5
+    )
+    english = make_result(target_language_keyword_match=["sleep"])
+    cree = make_result(source_language_match="nipâw", query_wordform_edit_distance=1)
+
+    assert sorted([fuzzy, english, cree]) == [cree, english, fuzzy]
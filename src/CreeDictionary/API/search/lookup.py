@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import logging
+from typing import Callable, Iterable, Sequence
 
 from django.db.models import Q
 
 from CreeDictionary.utils import (
     get_modified_distance,
+    get_modified_distances,
 )
 from CreeDictionary.utils.english_keyword_extraction import stem_keywords
 from morphodict.analysis import (
+    RichAnalysis,
     strict_generator,
     rich_analyze_relaxed,
 )
-from morphodict.lexicon.models import Wordform, SourceLanguageKeyword
-from morphodict.lexicon.util import to_source_language_keyword
+from morphodict.lexicon.models import (
+    Wordform,
+    SourceLanguageKeyword,
+    TargetLanguageKeyword,
+)
+from morphodict.lexicon.util import (
+    to_source_language_keyword,
+    to_target_language_keyword,
+)
 from . import core
 from .types import Result
 
@@ -23,24 +33,54 @@ logger = logging.getLogger(__name__)
 def fetch_results(search_run: core.SearchRun):
     fetch_results_from_target_language_keywords(search_run)
     fetch_results_from_source_language_keywords(search_run)
+    fetch_results_from_relaxed_analysis(search_run)
+
 
+def fetch_results_from_relaxed_analysis(search_run: core.SearchRun):
     # Use the spelling relaxation to try to decipher the query
     #   e.g., "atchakosuk" becomes "acâhkos+N+A+Pl" --
     #         thus, we can match "acâhkos" in the dictionary!
     fst_analyses = set(rich_analyze_relaxed(search_run.internal_query))
 
     db_matches = list(
-        Wordform.objects.filter(raw_analysis__in=[a.tuple for a in fst_analyses])
+        Wordform.objects.filter(analysis_key__in=[a.smushed() for a in fst_analyses])
+    )
+
+    add_relaxed_analysis_results(
+        search_run,
+        fst_analyses,
+        db_matches,
+        lemma_candidates=lambda analysis: Wordform.objects.filter(
+            text=analysis.lemma, is_lemma=True
+        ),
     )
 
-    for wf in db_matches:
+
+def add_relaxed_analysis_results(
+    search_run: core.SearchRun,
+    fst_analyses: set[RichAnalysis],
+    db_matches: Iterable[Wordform],
+    lemma_candidates: Callable[[RichAnalysis], Sequence[Wordform]],
+):
+    """
+    Add results for the relaxed analyses of the query to search_run.
+
+    db_matches are the wordforms whose analysis is in fst_analyses. For the
+    analyses that have no wordform in the database, lemma_candidates(analysis)
+    must return the lemma wordforms that have the text of analysis.lemma.
+    """
+    fst_analyses = set(fst_analyses)
+
+    db_matches = list(db_matches)
+    distances = get_modified_distances(
+        [wf.text for wf in db_matches], search_run.internal_query
+    )
+    for wf, distance in zip(db_matches, distances):
         search_run.add_result(
             Result(
                 wf,
                 source_language_match=wf.text,
-                query_wordform_edit_distance=get_modified_distance(
-                    wf.text, search_run.internal_query
-                ),
+                query_wordform_edit_distance=float(distance),
             )
         )
 
@@ -72,7 +112,7 @@ def fetch_results(search_run: core.SearchRun):
         )
 
         possible_lemma_wordforms = best_lemma_matches(
-            analysis, Wordform.objects.filter(text=analysis.lemma, is_lemma=True)
+            analysis, lemma_candidates(analysis)
         )
 
         for lemma_wordform in possible_lemma_wordforms:
@@ -136,13 +176,25 @@ def best_lemma_matches(analysis, possible_lemmas) -> list[Wordform]:
 
 
 def fetch_results_from_target_language_keywords(search_run):
-    for stemmed_keyword in stem_keywords(search_run.internal_query):
-        for wordform in Wordform.objects.filter(
-            target_language_keyword__text__iexact=stemmed_keyword
-        ):
-            search_run.add_result(
-                Result(wordform, target_language_keyword_match=[stemmed_keyword])
+    stemmed_keywords = {
+        to_target_language_keyword(stemmed_keyword): stemmed_keyword
+        for stemmed_keyword in stem_keywords(search_run.internal_query)
+    }
+    if not stemmed_keywords:
+        return
+
+    # One indexed IN query for all the keywords, instead of a LIKE per keyword
+    for keyword in TargetLanguageKeyword.objects.filter(
+        normalized_text__in=stemmed_keywords.keys()
+    ).select_related("wordform__lemma"):
+        search_run.add_result(
+            Result(
+                keyword.wordform,
+                target_language_keyword_match=[
+                    stemmed_keywords[keyword.normalized_text]
+                ],
             )
+        )
 
 
 def fetch_results_from_source_language_keywords(search_run):
@@ -0,0 +1,165 @@
+"""
+Running independent search stages concurrently
+
+Keyword lookups, relaxed FST analysis, affix search, and CVD do not depend on
+each other’s results until they are merged into the SearchRun. FST lookups,
+SQLite reads and NumPy all release the GIL for part of their work, so running
+them on a thread pool can cut single-query latency on multi-core hosts.
+
+Each stage runs against a _StageCollector, which buffers the results and
+verbose messages the stage produces. Once a stage finishes, the thread that
+owns the SearchRun merges its buffer in, so the SearchRun is only ever
+mutated from one thread. A stage that has not finished within the timeout is
+dropped: its results are discarded, even if it finishes later.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import cache
+from typing import Callable
+
+from django.conf import settings
+from django.db import connections
+
+from . import core
+from .timing import StageTiming, measure_stage
+from .types import Result
+
+logger = logging.getLogger(__name__)
+
+StageFunction = Callable[[core.SearchRun], None]
+
+
+class _StageCollector:
+    """Stands in for a SearchRun inside a stage running on another thread
+
+    Reads of the query and search options are passed through to the real
+    SearchRun; results and verbose messages are buffered until merge_into() is
+    called. Anything else, like the results found so far, depends on what other
+    stages are doing, so stages that need it can’t run concurrently.
+    """
+
+    # Set when the SearchRun is created, and never changed afterwards
+    READABLE_ATTRIBUTES = frozenset(
+        ["query", "internal_query", "include_auto_definitions"]
+    )
+
+    def __init__(self, search_run: core.SearchRun):
+        self._search_run = search_run
+        self.results: list[Result] = []
+        self.verbose_messages: list[tuple[object, dict]] = []
+        self.timing: StageTiming | None = None
+
+    def __getattr__(self, name):
+        if name not in self.READABLE_ATTRIBUTES:
+            raise AttributeError(
+                f"search stages running concurrently can’t use SearchRun.{name}"
+            )
+        return getattr(self._search_run, name)
+
+    def add_result(self, result: Result):
+        if not isinstance(result, Result):
+            raise TypeError(f"{result} is {type(result)}, not Result")
+        self.results.append(result)
+
+    def add_verbose_message(self, message=None, **messages):
+        if message is None and not messages:
+            raise TypeError("must provide a message or messages")
+        self.verbose_messages.append((message, messages))
+
+    def record_timing(self, timing: StageTiming):
+        self.timing = timing
+
+    def merge_into(self, search_run: core.SearchRun):
+        for message, messages in self.verbose_messages:
+            search_run.add_verbose_message(message, **messages)
+        for result in self.results:
+            search_run.add_result(result)
+        if self.timing is not None:
+            search_run.record_stage_timing(self.timing)
+
+
+@cache
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.SEARCH_THREAD_POOL_SIZE,
+        thread_name_prefix="search-stage",
+    )
+
+
+def _run_stage(name: str, stage: StageFunction, collector: _StageCollector):
+    _close_broken_connections()
+    with measure_stage(
+        name,
+        results_added=lambda: len(collector.results),
+        record=collector.record_timing,
+    ):
+        stage(collector)  # type: ignore
+    return collector
+
+
+def _close_broken_connections():
+    """
+    Django opens one database connection per thread, and only manages them
+    for request threads. The pool threads live as long as the process, so each
+    keeps its connection from one stage to the next instead of reconnecting
+    every time; only one that has stopped working is closed, and reopened by
+    the next query.
+    """
+    for connection in connections.all():
+        if connection.connection is None or not connection.errors_occurred:
+            continue
+        if connection.is_usable():
+            connection.errors_occurred = False
+        else:
+            connection.close()
+
+
+def run_stages_concurrently(
+    search_run: core.SearchRun,
+    stages: list[tuple[str, StageFunction]],
+    timeout: float,
+):
+    """
+    Run the given (name, stage function) pairs on the search thread pool, and
+    merge their results into search_run in the order given.
+
+    Stages that have not finished `timeout` seconds after they were all
+    submitted are dropped, with a verbose message and a timed-out entry in
+    the stage timings.
+    """
+    submitted_at = time.perf_counter()
+    deadline = submitted_at + timeout
+
+    futures: list[tuple[str, Future]] = [
+        (name, _executor().submit(_run_stage, name, stage, _StageCollector(search_run)))
+        for name, stage in stages
+    ]
+
+    for name, future in futures:
+        try:
+            collector = future.result(timeout=max(0, deadline - time.perf_counter()))
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(
+                "search stage %s timed out after %ss for query %r",
+                name,
+                timeout,
+                search_run.internal_query,
+            )
+            search_run.add_verbose_message(stage_timed_out=name)
+            search_run.record_stage_timing(
+                StageTiming(
+                    name=name,
+                    seconds=time.perf_counter() - submitted_at,
+                    query_count=0,
+                    results_added=0,
+                    timed_out=True,
+                )
+            )
+        else:
+            collector.merge_into(search_run)
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from CreeDictionary.API.search.core import SearchRun
+from CreeDictionary.API.search.parallel import run_stages_concurrently
+from CreeDictionary.API.search.types import Result
+from morphodict.lexicon.models import Wordform
+
+
+def make_result(text: str):
+    wf = Wordform(text=text, is_lemma=True)
+    wf.lemma = wf
+    return Result(wf, target_language_keyword_match=[text])
+
+
+def test_concurrent_stages_are_merged_in_order():
+    def first(search_run):
+        time.sleep(0.05)
+        search_run.add_result(make_result("foo"))
+        search_run.add_verbose_message(first="done")
+
+    def second(search_run):
+        search_run.add_result(make_result("bar"))
+        search_run.add_result(make_result("foo"))
+
+    search_run = SearchRun("foo")
+    run_stages_concurrently(search_run, [("first", first), ("second", second)], 5)
+
+    assert {r.wordform.text for r in search_run.unsorted_results()} == {"foo", "bar"}
+    assert [t.name for t in search_run.stage_timings] == ["first", "second"]
+    assert [t.results_added for t in search_run.stage_timings] == [1, 2]
+    assert {"first": "done"} in search_run.verbose_messages
+
+
+def test_slow_stages_are_dropped():
+    def slow(search_run):
+        time.sleep(0.5)
+        search_run.add_result(make_result("slow"))
+
+    def fast(search_run):
+        search_run.add_result(make_result("fast"))
+
+    search_run = SearchRun("foo")
+    run_stages_concurrently(search_run, [("slow", slow), ("fast", fast)], 0.1)
+
+    assert [r.wordform.text for r in search_run.unsorted_results()] == ["fast"]
+    [slow_timing, fast_timing] = search_run.stage_timings
+    assert slow_timing.timed_out
+    assert not fast_timing.timed_out
+
+    # Even once the slow stage finishes, its results do not show up
+    time.sleep(0.5)
+    assert [r.wordform.text for r in search_run.unsorted_results()] == ["fast"]
+
+
+def test_stages_can_only_read_the_query_and_options():
+    seen = {}
+
+    def stage(search_run):
+        seen["query"] = search_run.internal_query
+        search_run.unsorted_results()
+
+    with pytest.raises(AttributeError, match="unsorted_results"):
+        run_stages_concurrently(SearchRun("foo"), [("stage", stage)], 5)
+    assert seen == {"query": "foo"}
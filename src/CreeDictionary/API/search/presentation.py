@@ -4,19 +4,23 @@ from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Literal, Optional, TypedDict, cast
 
 from django.conf import settings
+from django.db.models import prefetch_related_objects
 from django.forms import model_to_dict
 
 from CreeDictionary.API.search import core, types
 from CreeDictionary.CreeDictionary.relabelling import read_labels
-from CreeDictionary.utils import get_modified_distance
 from CreeDictionary.utils.fst_analysis_parser import partition_analysis
 from CreeDictionary.utils.types import ConcatAnalysis, FSTTag, Label
 from crkeng.app.preferences import DisplayMode, AnimateEmoji
 from morphodict.analysis import RichAnalysis
-from morphodict.lexicon.models import Wordform
+from morphodict.lexicon.models import LemmaCard, Wordform
 
 from ..schema import SerializedDefinition, SerializedWordform
-from .types import Preverb
+from .preverbs import preverb_index
+
+# Bump this whenever what _serialize_wordform() returns changes. Search ignores
+# lemma cards of any other version, and the next import rebuilds them.
+LEMMA_CARD_VERSION = 1
 
 
 class AbstractResult:
@@ -213,9 +217,65 @@ def serialize_wordform(wordform: Wordform, animate_emoji: str) -> SerializedWord
     """
     Intended to be passed in a JSON API or into templates.
 
+    Uses the lemma card built at import time, if there is one.
+
     :return: json parsable result
     """
-    result = model_to_dict(wordform)
+    card = lemma_card(wordform)
+    if card is None:
+        return _serialize_wordform(wordform, animate_emoji)
+
+    result = cast(SerializedWordform, dict(card.serialized))
+    if result.get("wordclass_emoji") and animate_emoji != AnimateEmoji.default:
+        result["wordclass_emoji"] = use_preferred_animate_emoji(
+            result["wordclass_emoji"], animate_emoji
+        )
+    return result
+
+
+def serialize_lemma_card(wordform: Wordform) -> SerializedWordform:
+    """
+    What to store in the LemmaCard of wordform, ignoring any existing card.
+    """
+    return _serialize_wordform(wordform, AnimateEmoji.default)
+
+
+def lemma_card(wordform: Wordform) -> Optional[LemmaCard]:
+    """
+    The card of a saved lemma, or None if it has none of LEMMA_CARD_VERSION.
+
+    Does a query unless the card has been prefetched; see
+    prefetch_for_presentation().
+    """
+    if wordform.pk is None or not wordform.is_lemma:
+        return None
+    try:
+        card = wordform.card
+    except LemmaCard.DoesNotExist:
+        return None
+    return card if card.version == LEMMA_CARD_VERSION else None
+
+
+def prefetch_for_presentation(wordforms: list[Wordform]):
+    """
+    Fetch everything that PresentationResults need from the database for
+    these wordforms, in a few queries.
+    """
+    prefetch_related_objects(wordforms, "lemma__card", "definitions__citations")
+    # Lemmas imported before there were cards are serialized on every request
+    prefetch_related_objects(
+        [
+            wordform.lemma
+            for wordform in wordforms
+            if wordform.lemma is not None and lemma_card(wordform.lemma) is None
+        ],
+        "definitions__citations",
+    )
+
+
+def _serialize_wordform(wordform: Wordform, animate_emoji: str) -> SerializedWordform:
+    # analysis_key is only for database lookups
+    result = model_to_dict(wordform, exclude=["analysis_key"])
     result["definitions"] = serialize_definitions(wordform.definitions.all())
     result["lemma_url"] = wordform.get_absolute_url()
 
@@ -329,7 +389,7 @@ def get_lexical_info(result_analysis: RichAnalysis, animate_emoji: str) -> List[
     lexical_info: List[Dict] = []
 
     for (i, tag) in enumerate(result_analysis_tags):
-        preverb_result: Optional[Preverb] = None
+        preverb_entry: Optional[SerializedWordform] = None
         reduplication_string: Optional[str] = None
         _type: Optional[LexicalEntryType] = None
         entry: Optional[
@@ -347,37 +407,7 @@ def get_lexical_info(result_analysis: RichAnalysis, animate_emoji: str) -> List[
             entry = _InitialChangeResult(text=" ", definitions=change_types).serialize()
 
         elif tag.startswith("PV/"):
-            # use altlabel.tsv to figure out the preverb
-
-            # ling_short looks like: "Preverb: âpihci-"
-            ling_short = read_labels().linguistic_short.get(
-                cast(FSTTag, tag.rstrip("+"))
-            )
-            if ling_short:
-                # convert to "âpihci" by dropping prefix and last character
-                normative_preverb_text = ling_short[len("Preverb: ") :]
-                preverb_results = Wordform.objects.filter(
-                    text=normative_preverb_text, raw_analysis__isnull=True
-                )
-
-                # find the one that looks the most similar
-                if preverb_results:
-                    preverb_result = min(
-                        preverb_results,
-                        key=lambda pr: get_modified_distance(
-                            normative_preverb_text,
-                            pr.text.strip("-"),
-                        ),
-                    )
-
-                else:
-                    # Can't find a match for the preverb in the database.
-                    # This happens when searching against the test database for
-                    # ê-kî-nitawi-kâh-kîmôci-kotiskâwêyâhk, as the test database
-                    # lacks lacks ê and kî.
-                    preverb_result = Wordform(
-                        text=normative_preverb_text, is_lemma=True
-                    )
+            preverb_entry = preverb_index.get(tag, animate_emoji)
 
         if reduplication_string is not None:
             entry = _ReduplicationResult(
@@ -392,8 +422,8 @@ def get_lexical_info(result_analysis: RichAnalysis, animate_emoji: str) -> List[
             ).serialize()
             _type = "Reduplication"
 
-        if preverb_result is not None:
-            entry = serialize_wordform(preverb_result, animate_emoji)
+        if preverb_entry is not None:
+            entry = preverb_entry
             _type = "Preverb"
 
         if entry and _type:
@@ -0,0 +1,47 @@
+from CreeDictionary.API.search.presentation import (
+    LEMMA_CARD_VERSION,
+    get_emoji_for_cree_wordclass,
+    lemma_card,
+    serialize_wordform,
+)
+from morphodict.lexicon.models import LemmaCard, Wordform
+
+
+def make_lemma_with_card(serialized, version=LEMMA_CARD_VERSION):
+    lemma = Wordform(id=1, text="minôs", slug="minôs", is_lemma=True)
+    lemma.lemma = lemma
+    lemma.card = LemmaCard(wordform=lemma, serialized=serialized, version=version)
+    return lemma
+
+
+def test_serialize_wordform_uses_lemma_card():
+    card = {"text": "minôs", "definitions": [{"text": "cat"}], "from": "card"}
+    lemma = make_lemma_with_card(card)
+
+    serialized = serialize_wordform(lemma, animate_emoji="iyiniw")
+
+    assert serialized == card
+    # Callers get their own copy to patch
+    assert serialized is not card
+
+
+def test_serialize_wordform_patches_animate_emoji_into_card():
+    lemma = make_lemma_with_card(
+        {
+            "text": "minôs",
+            "wordclass": "NA",
+            "wordclass_emoji": get_emoji_for_cree_wordclass("NA"),
+        }
+    )
+
+    serialized = serialize_wordform(lemma, animate_emoji="wolf")
+
+    assert serialized["wordclass_emoji"] == get_emoji_for_cree_wordclass("NA", "wolf")
+    assert lemma.card.serialized["wordclass_emoji"] == get_emoji_for_cree_wordclass(
+        "NA"
+    )
+
+
+def test_lemma_cards_of_other_versions_are_ignored():
+    assert lemma_card(make_lemma_with_card({})) is not None
+    assert lemma_card(make_lemma_with_card({}, version=LEMMA_CARD_VERSION - 1)) is None
@@ -0,0 +1,111 @@
+"""
+Preverb lookups for lexical info
+
+Cree wordforms can carry several preverbs, each shown in the lexical info of a
+search result along with the serialized preverb wordform. Rather than query
+the database for every `PV/` tag of every result, the best wordform for each
+preverb tag is found once, and serialized for every animate emoji choice.
+
+The index is rebuilt when the dictionary is re-imported.
+"""
+
+from __future__ import annotations
+
+import logging
+from threading import Lock
+from typing import Optional, cast
+
+from CreeDictionary.CreeDictionary.relabelling import read_labels
+from CreeDictionary.utils import get_modified_distance
+from CreeDictionary.utils.types import FSTTag
+from crkeng.app.preferences import AnimateEmoji
+from morphodict.lexicon.models import Wordform
+from ..schema import SerializedWordform
+from .result_cache import ImportStampWatcher
+
+logger = logging.getLogger(__name__)
+
+# How the linguistic_short relabelling of every preverb tag starts, e.g.,
+# "Preverb: âpihci-"
+PREVERB_LABEL_PREFIX = "Preverb: "
+
+
+class PreverbIndex:
+    """
+    Maps preverb tags, like "PV/e+", to the serialized wordform of the preverb
+
+    Values must be treated as immutable by callers, since the same object is
+    handed out to every request.
+    """
+
+    def __init__(self, import_stamp: Optional[ImportStampWatcher] = None):
+        self._import_stamp = import_stamp or ImportStampWatcher()
+        self._lock = Lock()
+        # tag → animate emoji choice → serialized preverb wordform
+        self._serialized: dict[str, dict[str, SerializedWordform]] = {}
+
+    def get(self, tag: str, animate_emoji: str) -> Optional[SerializedWordform]:
+        """
+        :param tag: a prefix tag, with or without the trailing "+"
+        :return: None if tag is not a preverb tag with a label
+        """
+        self._rebuild_if_reimported()
+        by_emoji = self._serialized.get(tag.rstrip("+"))
+        if by_emoji is None:
+            return None
+        return by_emoji.get(animate_emoji) or by_emoji[AnimateEmoji.default]
+
+    def preload(self):
+        """Build the index now; to be called on production server startup."""
+        self._rebuild_if_reimported()
+
+    def _rebuild_if_reimported(self):
+        with self._lock:
+            if self._import_stamp.changed():
+                logger.debug("building preverb index")
+                self._serialized = _build_index()
+
+
+def _build_index() -> dict[str, dict[str, SerializedWordform]]:
+    # Import here to avoid a cycle: presentation uses this module.
+    from .presentation import serialize_wordform
+
+    preverb_texts = {}
+    for tag, ling_short in read_labels().linguistic_short.items():
+        if tag.startswith("PV/") and ling_short:
+            # convert "Preverb: âpihci-" to "âpihci-"
+            preverb_texts[tag] = ling_short[len(PREVERB_LABEL_PREFIX) :]
+
+    wordforms_by_text: dict[str, list[Wordform]] = {}
+    for wordform in (
+        Wordform.objects.filter(
+            text__in=set(preverb_texts.values()), raw_analysis__isnull=True
+        )
+        .order_by("id")
+        .prefetch_related("card", "definitions__citations")
+    ):
+        wordforms_by_text.setdefault(wordform.text, []).append(wordform)
+
+    index: dict[str, dict[str, SerializedWordform]] = {}
+    for tag, text in preverb_texts.items():
+        candidates = wordforms_by_text.get(text)
+        if candidates:
+            # find the one that looks the most similar
+            preverb = min(
+                candidates,
+                key=lambda pr: get_modified_distance(text, pr.text.strip("-")),
+            )
+        else:
+            # Can't find a match for the preverb in the database. This happens
+            # when searching against the test database for
+            # ê-kî-nitawi-kâh-kîmôci-kotiskâwêyâhk, as the test database lacks
+            # ê and kî.
+            preverb = Wordform(text=text, is_lemma=True)
+        index[cast(FSTTag, tag)] = {
+            animate_emoji: serialize_wordform(preverb, animate_emoji)
+            for animate_emoji in AnimateEmoji.choices
+        }
+    return index
+
+
+preverb_index = PreverbIndex()
@@ -0,0 +1,38 @@
+from CreeDictionary.API.search import preverbs
+from CreeDictionary.API.search.preverbs import PreverbIndex
+from CreeDictionary.API.search.result_cache import ImportStampWatcher
+from crkeng.app.preferences import AnimateEmoji
+
+
+class FakeImportStamp:
+    def __init__(self):
+        self.timestamp = 1.0
+
+    def __call__(self):
+        return self.timestamp
+
+
+def test_preverb_index_is_rebuilt_on_reimport(monkeypatch):
+    builds = []
+
+    def fake_build_index():
+        builds.append(None)
+        return {
+            "PV/e": {
+                emoji: {"text": f"ê-{len(builds)}", "emoji": emoji}
+                for emoji in AnimateEmoji.choices
+            }
+        }
+
+    monkeypatch.setattr(preverbs, "_build_index", fake_build_index)
+    stamp = FakeImportStamp()
+    index = PreverbIndex(ImportStampWatcher(stamp, check_interval=0))
+
+    assert index.get("PV/e+", "wolf") == {"text": "ê-1", "emoji": "wolf"}
+    assert index.get("PV/e", "granny")["text"] == "ê-1"
+    assert index.get("PV/xyz+", "wolf") is None
+    assert len(builds) == 1
+
+    stamp.timestamp = 2.0
+    assert index.get("PV/e+", "wolf")["text"] == "ê-2"
+    assert len(builds) == 2
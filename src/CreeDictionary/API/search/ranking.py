@@ -1,48 +1,296 @@
+"""
+Ranking search results
+
+All the results of a search are scored together: their features are gathered
+into a NumPy matrix with one row per result, and a ranking model scores every
+row in one vectorized pass.
+
+The default model is hand-written; see DefaultModel. Other models can be
+loaded from a JSON file named by the MORPHODICT_RANKING_MODEL_FILE setting, in
+one of the formats written by the export functions in
+`search_quality/weighting_nb_code.py`:
+
+  - A linear model, as a mapping from feature name to coefficient, with the
+    constant term under "Intercept". This is the format of the `params` of a
+    statsmodels regression, so the output of the
+    `print(results.params.to_json())` cell in `weighting.ipynb` works as is.
+
+        {"type": "linear", "params": {"Intercept": 0.05, "wordform_length": -0.0005}}
+
+  - A tree ensemble, scored as base_score + scale * (sum of the leaf values
+    reached in every tree). Each tree is a set of parallel node arrays; leaves
+    have a feature of null.
+
+        {"type": "tree_ensemble", "base_score": 0, "scale": 1, "trees": [
+            {"feature": ["keyword_match_len", null, null],
+             "threshold": [0.5, 0, 0], "left": [1, -1, -1], "right": [2, -1, -1],
+             "value": [0, 0.1, 0.3]}]}
+
+Feature names are those of RANKING_FEATURES.
+"""
+
 from __future__ import annotations
 
-from math import log
+import json
+from functools import cache
+from pathlib import Path
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+from django.conf import settings
 
 from . import types
 
+#: Columns of the feature matrix. The first few are named like the terms of
+#: the regression in weighting.ipynb, so that its coefficients can be loaded
+#: directly.
+RANKING_FEATURES = (
+    "wordform_length",
+    "keyword_match_len",
+    "has_morpheme_ranking",
+    # With missing values as 1, like the regression
+    "morpheme_ranking",
+    "has_cosine_vector_distance",
+    "np.log(1 + cosine_vector_distance)",
+    "is_espt_result",
+    "is_lemma",
+    "did_match_source_language",
+    "query_wordform_edit_distance",
+    "source_language_fuzzy_match",
+)
+_COLUMN = {name: i for i, name in enumerate(RANKING_FEATURES)}
 
-def _has_value(value):
-    if value is None:
-        return 0
-    return 1
 
+def feature_matrix(results: Sequence[types.Result]) -> np.ndarray:
+    """Return an array of shape (len(results), len(RANKING_FEATURES))
 
-def _default_if_none(value, *, default):
-    if value is not None:
-        return value
-    return default
+    Each feature is read from all the results in one go, so that the per-result
+    Python work is a handful of attribute reads.
+    """
 
+    def column(values, dtype=np.float64):
+        return np.fromiter(values, dtype=dtype, count=len(results))
 
-def assign_relevance_score(result: types.Result):
-    # Until we have some training data for Cree queries, we keep the intent of
-    # the old sort order:
-    #   - Cree wordforms in the query take precedence over any English hits
-    #   - Then use edit distance
-    #   - Finally, prefer lemmas
-    # The coefficients here are wild guesses that should accomplish that. They
-    # can be replaced with computed values when we have some training data for
-    # Cree-language queries.
-    if result.did_match_source_language:
-        result.relevance_score = (
+    # Missing values become NaN
+    morpheme_ranking = column(r.morpheme_ranking for r in results)
+    cosine_vector_distance = column(r.cosine_vector_distance for r in results)
+    edit_distance = column(r.query_wordform_edit_distance for r in results)
+
+    # The boolean features are bitmasks on Result; see types._Flag
+    flags_set = column((r._flags_set for r in results), np.int64)
+    flag_values = column((r._flag_values for r in results), np.int64)
+
+    def flag_is_true(flag):
+        return (flags_set & flag_values & flag.bit) != 0
+
+    def flag_is_set(flag):
+        return (flags_set & flag.bit) != 0
+
+    has_morpheme_ranking = ~np.isnan(morpheme_ranking)
+    has_cosine_vector_distance = ~np.isnan(cosine_vector_distance)
+
+    # Same as Result.did_match_source_language
+    did_match_source_language = (
+        column((bool(r.source_language_match) for r in results), bool)
+        | flag_is_set(types.Result.source_language_affix_match)
+        | flag_is_true(types.Result.analyzable_inflection_match)
+        | column((bool(r.source_language_keyword_match) for r in results), bool)
+    )
+
+    columns = {
+        "wordform_length": column(r.wordform_length for r in results),
+        "keyword_match_len": column(
+            len(r.target_language_keyword_match) for r in results
+        ),
+        "has_morpheme_ranking": has_morpheme_ranking,
+        "morpheme_ranking": np.where(has_morpheme_ranking, morpheme_ranking, 1),
+        "has_cosine_vector_distance": has_cosine_vector_distance,
+        "np.log(1 + cosine_vector_distance)": np.log1p(
+            np.where(has_cosine_vector_distance, cosine_vector_distance, 1.1)
+        ),
+        "is_espt_result": flag_is_true(types.Result.is_espt_result),
+        "is_lemma": column((r.is_lemma for r in results), bool),
+        "did_match_source_language": did_match_source_language,
+        "query_wordform_edit_distance": np.nan_to_num(edit_distance, nan=0),
+        "source_language_fuzzy_match": flag_is_true(
+            types.Result.source_language_fuzzy_match
+        ),
+    }
+    assert tuple(columns.keys()) == RANKING_FEATURES
+    return np.column_stack(
+        [np.asarray(c, dtype=np.float64) for c in columns.values()]
+    ).reshape(len(results), len(RANKING_FEATURES))
+
+
+class RankingModel(Protocol):
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """Return one relevance score per row of the feature matrix"""
+        ...
+
+
+class DefaultModel:
+    def score(self, features: np.ndarray) -> np.ndarray:
+        def column(name):
+            return features[:, _COLUMN[name]]
+
+        # Until we have some training data for Cree queries, we keep the intent
+        # of the old sort order:
+        #   - Cree wordforms in the query take precedence over any English hits
+        #   - Then use edit distance
+        #   - Finally, prefer lemmas
+        # The coefficients here are wild guesses that should accomplish that.
+        # They can be replaced with computed values when we have some training
+        # data for Cree-language queries.
+        morpheme_ranking_or_20 = np.where(
+            column("has_morpheme_ranking"), column("morpheme_ranking"), 20
+        )
+        source_language_score = (
             1000
-            - 20 * _default_if_none(result.query_wordform_edit_distance, default=0)
-            - _default_if_none(result.morpheme_ranking, default=20)
-            + (1 if result.is_lemma else 0)
+            - 20 * column("query_wordform_edit_distance")
+            - morpheme_ranking_or_20
+            + column("is_lemma")
         )
-    else:
-        result.relevance_score = (
-            # See weighting.ipynb for the model that produced these coefficients.
-            # The ESPT coefficient has been added at random for now--further investigation is needed
+
+        # Only a guess at what a misspelled query meant, so these go after
+        # every real match, closest first.
+        fuzzy_score = source_language_score - 1100
+
+        # See weighting.ipynb for the model that produced these coefficients.
+        # The ESPT coefficient has been added at random for now--further
+        # investigation is needed
+        target_language_score = (
             0.0559011609
-            + -0.0005685605 * result.wordform_length
-            + 0.0325909057 * len(result.target_language_keyword_match)
-            + 0.022778805 * _has_value(result.morpheme_ranking)
-            + -0.0009984537 * _default_if_none(result.morpheme_ranking, default=1)
-            + 0.0036 * _default_if_none(result.is_espt_result, default=0)
-            + -0.1190890019
-            * log(1 + _default_if_none(result.cosine_vector_distance, default=1.1))
+            + -0.0005685605 * column("wordform_length")
+            + 0.0325909057 * column("keyword_match_len")
+            + 0.022778805 * column("has_morpheme_ranking")
+            + -0.0009984537 * column("morpheme_ranking")
+            + 0.0036 * column("is_espt_result")
+            + -0.1190890019 * column("np.log(1 + cosine_vector_distance)")
         )
+
+        return np.select(
+            [
+                column("did_match_source_language") != 0,
+                column("source_language_fuzzy_match") != 0,
+            ],
+            [source_language_score, fuzzy_score],
+            default=target_language_score,
+        )
+
+
+class LinearModel:
+    def __init__(self, params: dict[str, float]):
+        params = dict(params)
+        self.intercept = params.pop("Intercept", 0.0)
+        unknown = set(params) - set(RANKING_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features in ranking model: {sorted(unknown)}")
+        self.coefficients = np.array(
+            [params.get(name, 0.0) for name in RANKING_FEATURES]
+        )
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        return self.intercept + features @ self.coefficients
+
+
+class TreeEnsembleModel:
+    def __init__(self, trees: list[dict], base_score=0.0, scale=1.0):
+        self.base_score = base_score
+        self.scale = scale
+        self.trees = []
+        for tree in trees:
+            feature = np.array(
+                [_COLUMN[f] if f is not None else -1 for f in tree["feature"]]
+            )
+            self.trees.append(
+                (
+                    feature,
+                    np.array(tree["threshold"], dtype=np.float64),
+                    np.array(tree["left"]),
+                    np.array(tree["right"]),
+                    np.array(tree["value"], dtype=np.float64),
+                )
+            )
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(features))
+        total = np.zeros(len(features))
+        for feature, threshold, left, right, value in self.trees:
+            # Walk every row down the tree at once, one level per iteration
+            nodes = np.zeros(len(features), dtype=np.int64)
+            while True:
+                inner = feature[nodes] >= 0
+                if not inner.any():
+                    break
+                current = nodes[inner]
+                go_left = features[rows[inner], feature[current]] <= threshold[current]
+                nodes[inner] = np.where(go_left, left[current], right[current])
+            total += value[nodes]
+        return self.base_score + self.scale * total
+
+
+def load_model(path: Path) -> RankingModel:
+    data = json.loads(Path(path).read_text())
+    model_type = data.get("type")
+    if model_type == "linear":
+        return LinearModel(data["params"])
+    elif model_type == "tree_ensemble":
+        return TreeEnsembleModel(
+            data["trees"],
+            base_score=data.get("base_score", 0.0),
+            scale=data.get("scale", 1.0),
+        )
+    raise ValueError(f"Unknown ranking model type {model_type!r} in {path}")
+
+
+@cache
+def ranking_model() -> RankingModel:
+    if settings.MORPHODICT_RANKING_MODEL_FILE:
+        return load_model(settings.MORPHODICT_RANKING_MODEL_FILE)
+    return DefaultModel()
+
+
+def assign_relevance_scores(
+    results: Sequence[types.Result], model: Optional[RankingModel] = None
+) -> np.ndarray:
+    """Score all the results at once, setting their relevance_score
+
+    Returns the scores too, in the same order.
+    """
+    if model is None:
+        model = ranking_model()
+    scores = model.score(feature_matrix(results))
+    for result, score in zip(results, scores.tolist()):
+        result.relevance_score = score
+    return scores
+
+
+def assign_relevance_score(result: types.Result):
+    assign_relevance_scores([result])
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    The order is the same as a stable sort on descending score, including
+    which of several tied results make the cut, but only the top k are
+    sorted.
+
+    >>> top_k_indices(np.array([1.0, 3.0, 2.0, 3.0]), 2).tolist()
+    [1, 3]
+    >>> top_k_indices(np.array([1.0, 3.0, 2.0, 3.0])).tolist()
+    [1, 3, 2, 0]
+    """
+    keys = -scores
+    n = len(keys)
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    elif k <= 0:
+        return np.arange(0)
+    else:
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+        better = np.flatnonzero(keys < kth)
+        tied = np.flatnonzero(keys == kth)[: k - len(better)]
+        candidates = np.concatenate([better, tied])
+    return candidates[np.lexsort((candidates, keys[candidates]))]
@@ -1,8 +1,18 @@
+import json
+
+import numpy as np
 import pytest
 from pytest import approx
 
 from CreeDictionary.API.search import search
-from CreeDictionary.API.search.ranking import assign_relevance_score
+from CreeDictionary.API.search.core import SearchRun
+from CreeDictionary.API.search.ranking import (
+    assign_relevance_score,
+    assign_relevance_scores,
+    feature_matrix,
+    load_model,
+    top_k_indices,
+)
 from CreeDictionary.API.search.types import Result
 from morphodict.lexicon.models import Wordform
 
@@ -71,3 +81,94 @@ def test_cvd_exclusive_only_uses_cvd_for_ranking(db):
         return True
 
     assert is_sorted_by_cvd(results)
+
+
+def test_linear_model_file_matches_default_model(tmp_path):
+    """The target-language half of the default model, as a coefficient file"""
+    model_file = tmp_path / "model.json"
+    model_file.write_text(
+        json.dumps(
+            {
+                "type": "linear",
+                "params": {
+                    "Intercept": 0.0559011609,
+                    "wordform_length": -0.0005685605,
+                    "keyword_match_len": 0.0325909057,
+                    "has_morpheme_ranking": 0.022778805,
+                    "morpheme_ranking": -0.0009984537,
+                    "is_espt_result": 0.0036,
+                    "np.log(1 + cosine_vector_distance)": -0.1190890019,
+                },
+            }
+        )
+    )
+    results = [
+        build_result(did_match_target_language=True),
+        build_result(cosine_vector_distance=0.7, morpheme_ranking=12.8),
+        build_result(
+            wordform_length=9,
+            target_language_keyword_match_len=1,
+            cosine_vector_distance=0.248058,
+            morpheme_ranking=17.2326,
+        ),
+    ]
+    expected = assign_relevance_scores(results)
+    assert assign_relevance_scores(results, load_model(model_file)) == approx(expected)
+
+
+def test_tree_ensemble_model(tmp_path):
+    model_file = tmp_path / "model.json"
+    model_file.write_text(
+        json.dumps(
+            {
+                "type": "tree_ensemble",
+                "base_score": 1,
+                "scale": 0.5,
+                "trees": [
+                    {
+                        "feature": [
+                            "keyword_match_len",
+                            None,
+                            "wordform_length",
+                            None,
+                            None,
+                        ],
+                        "threshold": [0.5, 0, 3.5, 0, 0],
+                        "left": [1, -1, 3, -1, -1],
+                        "right": [2, -1, 4, -1, -1],
+                        "value": [0, 10, 0, 20, 30],
+                    },
+                    {
+                        "feature": [None],
+                        "threshold": [0],
+                        "left": [-1],
+                        "right": [-1],
+                        "value": [2],
+                    },
+                ],
+            }
+        )
+    )
+    results = [
+        build_result(did_match_target_language=True),
+        build_result(target_language_keyword_match_len=1, wordform_length=2),
+        build_result(target_language_keyword_match_len=2, wordform_length=8),
+    ]
+    scores = load_model(model_file).score(feature_matrix(results))
+    assert scores.tolist() == [1 + 0.5 * 12, 1 + 0.5 * 22, 1 + 0.5 * 32]
+
+
+@pytest.mark.parametrize("k", [None, 0, 1, 3, 5, 100])
+def test_top_k_matches_stable_sort(k):
+    scores = np.array([2.0, 5.0, 1.0, 5.0, 2.0, 2.0, 7.0, 1.0])
+    expected = sorted(range(len(scores)), key=lambda i: -scores[i])
+    assert top_k_indices(scores, k).tolist() == expected[:k]
+
+
+def test_sorted_results_limit():
+    search_run = SearchRun("foo")
+    for i in range(10):
+        search_run.add_result(
+            build_result(wordform_length=i + 1, did_match_target_language=True)
+        )
+    assert search_run.sorted_results(limit=3) == search_run.sorted_results()[:3]
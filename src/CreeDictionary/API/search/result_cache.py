@@ -0,0 +1,128 @@
+"""
+Process-wide cache of serialized search results
+
+Click-in-text and the main search page see the same small set of queries over
+and over again. Running a search means FST lookups, several SQL queries, affix
+tries, and CVD, so we keep the finished, serialized results around in a
+bounded LRU cache.
+
+The cache is keyed on the normalized query string plus every option that
+changes the output. It is cleared whenever the dictionary is re-imported,
+which we notice by watching `ImportStamp.timestamp`.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from threading import Lock
+from typing import Callable, Hashable, Optional
+
+from django.conf import settings
+
+from morphodict.lexicon.models import ImportStamp
+from morphodict.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Checking the import stamp is a database query, so only do it this often.
+IMPORT_STAMP_CHECK_INTERVAL_SECONDS = 5.0
+
+
+class SearchResultCache:
+    """An LRUCache that is invalidated by new imports
+
+    Values must be treated as immutable by callers, since the same object is
+    handed out to every request that hits the cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        get_import_timestamp: Optional[Callable[[], Optional[float]]] = None,
+        import_stamp_check_interval=IMPORT_STAMP_CHECK_INTERVAL_SECONDS,
+    ):
+        self._cache = LRUCache(maxsize)
+        self._import_stamp = ImportStampWatcher(
+            get_import_timestamp, check_interval=import_stamp_check_interval
+        )
+
+    @property
+    def maxsize(self) -> int:
+        return self._cache.maxsize
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """
+        Return the cached value for key, calling compute() to fill it in if
+        needed; see LRUCache.get_or_compute().
+        """
+        if self.maxsize <= 0:
+            return compute()
+
+        self._clear_if_reimported()
+        return self._cache.get_or_compute(key, compute)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict[str, float]:
+        return self._cache.stats()
+
+    def _clear_if_reimported(self):
+        if self._import_stamp.changed():
+            if self._import_stamp.seen_before:
+                logger.info("dictionary was re-imported; clearing search result cache")
+            self.clear()
+
+
+class ImportStampWatcher:
+    """Notices when the dictionary has been re-imported
+
+    Anything built from the database at startup can call changed() before
+    using what it built, and rebuild when it returns True. It is safe to call
+    from several threads at once; only one of them is told about each change.
+    """
+
+    def __init__(
+        self,
+        get_import_timestamp: Optional[Callable[[], Optional[float]]] = None,
+        check_interval=IMPORT_STAMP_CHECK_INTERVAL_SECONDS,
+    ):
+        self._get_import_timestamp = get_import_timestamp or latest_import_timestamp
+        self._check_interval = check_interval
+        self._import_timestamp: Optional[float] = None
+        self._next_check = 0.0
+        self._checked = False
+        self._lock = Lock()
+        #: Whether the stamp that changed() last reported was preceded by another
+        self.seen_before = False
+
+    def changed(self) -> bool:
+        """
+        Whether the import stamp is different from the last time this was
+        called. The first call always returns True.
+
+        Only reads the stamp from the database once per check interval; in
+        between, returns False.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._checked and now < self._next_check:
+                return False
+            self._next_check = now + self._check_interval
+
+            timestamp = self._get_import_timestamp()
+            if self._checked and timestamp == self._import_timestamp:
+                return False
+
+            self.seen_before = self._checked
+            self._checked = True
+            self._import_timestamp = timestamp
+            return True
+
+
+def latest_import_timestamp() -> Optional[float]:
+    return ImportStamp.objects.values_list("timestamp", flat=True).first()
+
+
+search_result_cache = SearchResultCache(maxsize=settings.SEARCH_RESULT_CACHE_SIZE)
@@ -0,0 +1,85 @@
+from CreeDictionary.API.search.result_cache import ImportStampWatcher, SearchResultCache
+
+
+class FakeImportStamp:
+    def __init__(self):
+        self.timestamp = 1.0
+
+    def __call__(self):
+        return self.timestamp
+
+
+def make_cache(maxsize=2, stamp=None):
+    return SearchResultCache(
+        maxsize,
+        get_import_timestamp=stamp or FakeImportStamp(),
+        import_stamp_check_interval=0,
+    )
+
+
+def test_cache_hits_and_misses():
+    cache = make_cache()
+
+    assert cache.get_or_compute("a", lambda: ["result"]) == ["result"]
+    assert cache.get_or_compute("a", lambda: ["different"]) == ["result"]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = make_cache(maxsize=2)
+
+    cache.get_or_compute("a", lambda: "a")
+    cache.get_or_compute("b", lambda: "b")
+    # touch a, so that b is least recently used
+    cache.get_or_compute("a", lambda: "a")
+    cache.get_or_compute("c", lambda: "c")
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_compute("a", lambda: "new a") == "a"
+    assert cache.get_or_compute("b", lambda: "new b") == "new b"
+
+
+def test_cache_is_cleared_on_reimport():
+    stamp = FakeImportStamp()
+    cache = make_cache(stamp=stamp)
+
+    cache.get_or_compute("a", lambda: "old")
+    assert cache.get_or_compute("a", lambda: "new") == "old"
+
+    stamp.timestamp = 2.0
+    assert cache.get_or_compute("a", lambda: "new") == "new"
+
+
+def test_cache_can_be_disabled():
+    cache = make_cache(maxsize=0)
+
+    cache.get_or_compute("a", lambda: "a")
+    assert cache.get_or_compute("a", lambda: "new") == "new"
+    assert cache.stats()["size"] == 0
+
+
+def test_import_stamp_watcher():
+    stamp = FakeImportStamp()
+    watcher = ImportStampWatcher(stamp, check_interval=0)
+
+    assert watcher.changed()
+    assert not watcher.seen_before
+    assert not watcher.changed()
+
+    stamp.timestamp = 2.0
+    assert watcher.changed()
+    assert watcher.seen_before
+    assert not watcher.changed()
+
+
+def test_import_stamp_watcher_checks_at_most_once_per_interval():
+    stamp = FakeImportStamp()
+    watcher = ImportStampWatcher(stamp, check_interval=3600)
+
+    assert watcher.changed()
+    stamp.timestamp = 2.0
+    assert not watcher.changed()
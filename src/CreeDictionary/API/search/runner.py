@@ -1,4 +1,5 @@
 import re
+from typing import Optional
 
 from django.conf import settings
 
@@ -10,7 +11,16 @@ from CreeDictionary.API.search.affix import (
 from CreeDictionary.API.search.core import SearchRun
 from CreeDictionary.API.search.cvd_search import do_cvd_search
 from CreeDictionary.API.search.espt import EsptSearch
-from CreeDictionary.API.search.lookup import fetch_results
+from CreeDictionary.API.search.fuzzy import (
+    do_source_language_fuzzy_search,
+    should_do_fuzzy_search,
+)
+from CreeDictionary.API.search.lookup import (
+    fetch_results_from_relaxed_analysis,
+    fetch_results_from_source_language_keywords,
+    fetch_results_from_target_language_keywords,
+)
+from CreeDictionary.API.search.parallel import StageFunction, run_stages_concurrently
 from CreeDictionary.API.search.query import CvdSearchType
 from CreeDictionary.API.search.types import Result
 from CreeDictionary.API.search.util import first_non_none_value
@@ -20,21 +30,33 @@ CREE_LONG_VOWEL = re.compile("[êîôâēīōā]")
 
 
 def search(
-    *, query: str, include_affixes=True, include_auto_definitions=False
+    *,
+    query: str,
+    include_affixes=True,
+    include_auto_definitions=False,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> SearchRun:
     """
     Perform an actual search, using the provided options.
 
     This class encapsulates the logic of which search methods to try, and in
     which order, to build up results in a SearchRun.
+
+    limit and offset select which page of the results the SearchRun will
+    present; all results are still found and ranked.
     """
     search_run = SearchRun(
-        query=query, include_auto_definitions=include_auto_definitions
+        query=query,
+        include_auto_definitions=include_auto_definitions,
+        limit=limit,
+        offset=offset,
     )
 
     if search_run.query.espt:
         espt_search = EsptSearch(search_run)
-        espt_search.analyze_query()
+        with search_run.stage("espt_analysis"):
+            espt_search.analyze_query()
 
     if settings.MORPHODICT_ENABLE_CVD:
         cvd_search_type = cast_away_optional(
@@ -48,27 +70,48 @@ def search(
                 return r.cosine_vector_distance
 
             search_run.sort_function = sort_by_cvd
-            do_cvd_search(search_run)
+            with search_run.stage("cvd"):
+                do_cvd_search(search_run)
             return search_run
 
-    fetch_results(search_run)
+    # These stages only depend on the query, not on each other’s results
+    stages: list[tuple[str, StageFunction]] = [
+        ("target_language_keywords", fetch_results_from_target_language_keywords),
+        ("source_language_keywords", fetch_results_from_source_language_keywords),
+        ("relaxed_analysis", fetch_results_from_relaxed_analysis),
+    ]
 
     if (
         settings.MORPHODICT_ENABLE_AFFIX_SEARCH
         and include_affixes
         and not query_would_return_too_many_results(search_run.internal_query)
     ):
-        do_source_language_affix_search(search_run)
-        do_target_language_affix_search(search_run)
+        stages.append(("source_language_affix", do_source_language_affix_search))
+        stages.append(("target_language_affix", do_target_language_affix_search))
 
     if settings.MORPHODICT_ENABLE_CVD:
         if cvd_search_type.should_do_search() and not is_almost_certainly_cree(
             search_run
         ):
-            do_cvd_search(search_run)
+            stages.append(("cvd", do_cvd_search))
+
+    if settings.MORPHODICT_CONCURRENT_SEARCH:
+        run_stages_concurrently(
+            search_run, stages, timeout=settings.SEARCH_STAGE_TIMEOUT_SECONDS
+        )
+    else:
+        for name, stage in stages:
+            with search_run.stage(name):
+                stage(search_run)
+
+    # Depends on what the other stages found, so it can’t run alongside them
+    if settings.MORPHODICT_ENABLE_FUZZY_SEARCH and should_do_fuzzy_search(search_run):
+        with search_run.stage("source_language_fuzzy"):
+            do_source_language_fuzzy_search(search_run)
 
     if search_run.query.espt:
-        espt_search.inflect_search_results()
+        with search_run.stage("espt_inflection"):
+            espt_search.inflect_search_results()
 
     return search_run
 
@@ -0,0 +1,142 @@
+"""
+Per-stage instrumentation for search runs
+
+A search is made up of several stages—ESPT analysis, keyword lookups, relaxed
+FST analysis, affix search, CVD, and so on—that run back to back. When a query
+is slow, it helps to know which stage is responsible, so SearchRun records the
+wall time, number of SQL queries, and number of results added for each stage.
+
+The numbers are reported:
+  - in the verbose messages, when searching with `verbose:1`
+  - in a `Server-Timing` HTTP response header
+  - in a structured log line, so they can be aggregated from production logs
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float
+    query_count: int
+    results_added: int
+    #: Whether the stage was abandoned for taking too long
+    timed_out: bool = False
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def serialize(self):
+        ret = {
+            "stage": self.name,
+            "ms": round(self.milliseconds, 3),
+            "queries": self.query_count,
+            "results_added": self.results_added,
+        }
+        if self.timed_out:
+            ret["timed_out"] = True
+        return ret
+
+
+class QueryCounter:
+    """A django execute_wrapper that counts the SQL queries run through it
+
+    Unlike `connection.queries`, this works even when DEBUG is off.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def measure_stage(
+    name: str,
+    *,
+    results_added: Callable[[], int],
+    record: Callable[[StageTiming], None],
+):
+    """
+    Measure the code run inside this context manager, and pass the resulting
+    StageTiming to `record`.
+
+    `results_added` is called at the end of the stage to find out how many
+    results the stage added. SQL queries are counted on the current thread’s
+    database connection only.
+    """
+    query_counter = QueryCounter()
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(query_counter):
+            yield
+    finally:
+        record(
+            StageTiming(
+                name=name,
+                seconds=time.perf_counter() - start,
+                query_count=query_counter.count,
+                results_added=results_added(),
+            )
+        )
+
+
+def server_timing_header(timings: Iterable[StageTiming]) -> str:
+    """
+    Format stage timings for a `Server-Timing` response header.
+
+    >>> server_timing_header([StageTiming("cvd", 0.0125, 1, 3)])
+    'cvd;dur=12.500;desc="1 queries, 3 results", total;dur=12.500'
+    """
+    metrics = []
+    total_ms = 0.0
+    for timing in timings:
+        total_ms += timing.milliseconds
+        if timing.timed_out:
+            desc = "timed out"
+        else:
+            desc = f"{timing.query_count} queries, {timing.results_added} results"
+        metrics.append(f'{timing.name};dur={timing.milliseconds:.3f};desc="{desc}"')
+    metrics.append(f"total;dur={total_ms:.3f}")
+    return ", ".join(metrics)
+
+
+def attach_stage_timings(response, search_run):
+    """Add the stage timings of search_run to the response, and log them."""
+    timings = search_run.stage_timings
+    response["Server-Timing"] = server_timing_header(timings)
+    log_stage_timings(search_run)
+    return response
+
+
+def log_stage_timings(search_run):
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    timings = search_run.stage_timings
+    logger.info(
+        "search timings %s",
+        json.dumps(
+            {
+                "query": search_run.query.raw_query_string,
+                "total_ms": round(sum(t.milliseconds for t in timings), 3),
+                "total_queries": sum(t.query_count for t in timings),
+                "stages": [t.serialize() for t in timings],
+            },
+            ensure_ascii=False,
+        ),
+    )
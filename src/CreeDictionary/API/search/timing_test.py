@@ -0,0 +1,53 @@
+from django.http import HttpResponse
+
+from CreeDictionary.API.search.core import SearchRun
+from CreeDictionary.API.search.timing import attach_stage_timings
+from CreeDictionary.API.search.types import Result
+from morphodict.lexicon.models import Wordform
+
+
+def make_wf(text: str):
+    ret = Wordform(text=text, is_lemma=True)
+    ret.lemma = ret
+    return ret
+
+
+def test_stage_records_results_added():
+    search_run = SearchRun("foo")
+
+    with search_run.stage("first"):
+        search_run.add_result(Result(make_wf("foo"), cosine_vector_distance=0.5))
+        search_run.add_result(Result(make_wf("bar"), cosine_vector_distance=0.5))
+    with search_run.stage("second"):
+        pass
+
+    [first, second] = search_run.stage_timings
+    assert first.name == "first"
+    assert first.results_added == 2
+    assert first.query_count == 0
+    assert first.seconds >= 0
+    assert second.name == "second"
+    assert second.results_added == 0
+
+
+def test_stage_timings_are_verbose_messages():
+    search_run = SearchRun("verbose:1 foo")
+    assert search_run.verbose_messages == []
+
+    with search_run.stage("cvd"):
+        pass
+
+    [message] = search_run.verbose_messages
+    assert [t["stage"] for t in message["stage_timings"]] == ["cvd"]
+
+
+def test_attach_stage_timings_sets_server_timing_header():
+    search_run = SearchRun("foo")
+    with search_run.stage("target_language_keywords"):
+        pass
+
+    response = attach_stage_timings(HttpResponse(), search_run)
+
+    header = response["Server-Timing"]
+    assert header.startswith("target_language_keywords;dur=")
+    assert "total;dur=" in header
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-import dataclasses
 import json
-from dataclasses import dataclass, field
 from enum import Enum
-from typing import NewType, Optional
+from typing import NewType, Optional, overload
 
 from morphodict.lexicon.models import Wordform, wordform_cache
 from CreeDictionary.API.search import ranking
@@ -21,7 +19,46 @@ class Language(Enum):
     TARGET = "Target"
 
 
-@dataclass
+class _Flag:
+    """
+    An Optional[bool] feature of Result, stored as two bits of an int instead
+    of a whole attribute: one bit for whether it is set at all, and one for
+    its value.
+    """
+
+    def __init__(self, bit: int):
+        self.bit = bit
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner=None) -> _Flag:
+        ...
+
+    @overload
+    def __get__(self, instance: Result, owner=None) -> Optional[bool]:
+        ...
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if not instance._flags_set & self.bit:
+            return None
+        return bool(instance._flag_values & self.bit)
+
+    def __set__(self, instance, value: Optional[bool]):
+        if value is None:
+            instance._flags_set &= ~self.bit
+            instance._flag_values &= ~self.bit
+        else:
+            instance._flags_set |= self.bit
+            if value:
+                instance._flag_values |= self.bit
+            else:
+                instance._flag_values &= ~self.bit
+
+
 class Result:
     """
     A target-language wordform and the features that link it to a query.
@@ -42,13 +79,116 @@ class Result:
     Search methods may generate candidate results that are ultimately not sent
     to users, so any user-friendly tagging/relabelling is instead done in
     PresentationResult class.
+
+    Affix-heavy searches construct and merge thousands of these, so instead of
+    being a dataclass, this uses __slots__, keeps the optional boolean
+    features as bits of a pair of ints, and merges without building
+    intermediate dicts.
     """
 
-    def __post_init__(self):
-        if all(
-            getattr(self, field.name) in (None, [])
-            for field in dataclasses.fields(Result)
-            if field.init and field.name != "wordform"
+    __slots__ = (
+        "wordform",
+        "lemma_wordform",
+        "is_lemma",
+        "wordform_length",
+        "source_language_match",
+        "query_wordform_edit_distance",
+        "target_language_keyword_match",
+        "source_language_keyword_match",
+        "morpheme_ranking",
+        "cosine_vector_distance",
+        "relevance_score",
+        "_flags_set",
+        "_flag_values",
+    )
+
+    wordform: Wordform
+    lemma_wordform: Lemma
+    is_lemma: bool
+    wordform_length: int
+
+    #: What, if any, was the matching string?
+    source_language_match: Optional[str]
+    query_wordform_edit_distance: Optional[float]
+
+    source_language_affix_match = _Flag(1 << 0)
+    #: Was this a guess at what a misspelled source-language query meant?
+    source_language_fuzzy_match = _Flag(1 << 1)
+    target_language_affix_match = _Flag(1 << 2)
+
+    target_language_keyword_match: list[str]
+
+    analyzable_inflection_match = _Flag(1 << 3)
+
+    source_language_keyword_match: list[str]
+
+    is_espt_result = _Flag(1 << 4)
+
+    #: Was anything in the query a target-language match for this result?
+    did_match_target_language = _Flag(1 << 5)
+
+    morpheme_ranking: Optional[float]
+
+    cosine_vector_distance: Optional[float]
+
+    relevance_score: Optional[float]
+
+    def __init__(
+        self,
+        wordform: Wordform,
+        *,
+        source_language_match: Optional[str] = None,
+        query_wordform_edit_distance: Optional[float] = None,
+        source_language_affix_match: Optional[bool] = None,
+        source_language_fuzzy_match: Optional[bool] = None,
+        target_language_affix_match: Optional[bool] = None,
+        target_language_keyword_match: Optional[list[str]] = None,
+        analyzable_inflection_match: Optional[bool] = None,
+        source_language_keyword_match: Optional[list[str]] = None,
+        is_espt_result: Optional[bool] = None,
+        did_match_target_language: Optional[bool] = None,
+        morpheme_ranking: Optional[float] = None,
+        cosine_vector_distance: Optional[float] = None,
+        relevance_score: Optional[float] = None,
+    ):
+        self.wordform = wordform
+        self.source_language_match = source_language_match
+        self.query_wordform_edit_distance = query_wordform_edit_distance
+        self.target_language_keyword_match = (
+            target_language_keyword_match
+            if target_language_keyword_match is not None
+            else []
+        )
+        self.source_language_keyword_match = (
+            source_language_keyword_match
+            if source_language_keyword_match is not None
+            else []
+        )
+        self.morpheme_ranking = morpheme_ranking
+        self.cosine_vector_distance = cosine_vector_distance
+        self.relevance_score = relevance_score
+
+        self._flags_set = 0
+        self._flag_values = 0
+        self.source_language_affix_match = source_language_affix_match
+        self.source_language_fuzzy_match = source_language_fuzzy_match
+        self.target_language_affix_match = target_language_affix_match
+        self.analyzable_inflection_match = analyzable_inflection_match
+        self.is_espt_result = is_espt_result
+        self.did_match_target_language = did_match_target_language
+
+        self._init_derived_features()
+
+    def _init_derived_features(self):
+        if (
+            not self._flags_set
+            and self.source_language_match is None
+            and self.query_wordform_edit_distance is None
+            and not self.target_language_keyword_match
+            and not self.source_language_keyword_match
+            and self.morpheme_ranking is None
+            and self.cosine_vector_distance is None
+            and self.relevance_score is None
         ):
             raise Exception("No features were provided for why this is a result.")
 
@@ -56,7 +196,9 @@ class Result:
         self.lemma_wordform = self.wordform.lemma
         self.wordform_length = len(self.wordform.text)
 
-        if self.did_match_source_language and self.query_wordform_edit_distance is None:
+        if (
+            self.did_match_source_language or self.source_language_fuzzy_match
+        ) and self.query_wordform_edit_distance is None:
             raise Exception("must include edit distance on source language matches")
 
         if self.morpheme_ranking is None:
@@ -75,40 +217,44 @@ class Result:
         self._copy_features_from(other)
 
     def _copy_features_from(self, other: Result):
-        for field_name, other_value in other.features().items():
-            if other_value is not None:
-                self_value = getattr(self, field_name)
-                # combine lists, applying uniq
-                if isinstance(self_value, list):
-                    self_value[:] = list(set(self_value + other_value))
-                elif (
-                    field_name == "cosine_vector_distance"
-                    and self.cosine_vector_distance is not None
-                    # We already checked that other.cosine_vector_distance is
-                    # not None, but mypy can’t infer that.
-                    and other.cosine_vector_distance is not None
-                ):
-                    self.cosine_vector_distance = min(
-                        self.cosine_vector_distance, other.cosine_vector_distance
-                    )
-                elif field_name == "query_wordform_edit_distance":
-                    self.query_wordform_edit_distance = min(
-                        v
-                        for v in (
-                            self.query_wordform_edit_distance,
-                            other.query_wordform_edit_distance,
-                        )
-                        if v is not None
-                    )
-                else:
-                    setattr(self, field_name, other_value)
+        # Features that are set on other overwrite ours, except as noted
+        self.is_lemma = other.is_lemma
+        self.wordform_length = other.wordform_length
+        if other.source_language_match is not None:
+            self.source_language_match = other.source_language_match
+        if other.morpheme_ranking is not None:
+            self.morpheme_ranking = other.morpheme_ranking
+        if other.relevance_score is not None:
+            self.relevance_score = other.relevance_score
+
+        self._flag_values = (self._flag_values & ~other._flags_set) | (
+            other._flag_values & other._flags_set
+        )
+        self._flags_set |= other._flags_set
+
+        # Keep the smallest distances
+        if other.query_wordform_edit_distance is not None and (
+            self.query_wordform_edit_distance is None
+            or other.query_wordform_edit_distance < self.query_wordform_edit_distance
+        ):
+            self.query_wordform_edit_distance = other.query_wordform_edit_distance
+        if other.cosine_vector_distance is not None and (
+            self.cosine_vector_distance is None
+            or other.cosine_vector_distance < self.cosine_vector_distance
+        ):
+            self.cosine_vector_distance = other.cosine_vector_distance
+
+        # Combine lists, without duplicates
+        for keyword in other.target_language_keyword_match:
+            if keyword not in self.target_language_keyword_match:
+                self.target_language_keyword_match.append(keyword)
+        for keyword in other.source_language_keyword_match:
+            if keyword not in self.source_language_keyword_match:
+                self.source_language_keyword_match.append(keyword)
 
     def create_related_result(self, new_wordform, **kwargs):
         """Create a new Result for new_wordform, with features copied over."""
 
-        # Note: we can’t use dataclasses.replace because it does shallow copies
-        # and we have list members.
-
         # TODO: write tests for this
 
         new_result = Result(new_wordform, **kwargs)
@@ -116,45 +262,15 @@ class Result:
         # That copy may have overwritten some features supplied in kwargs
         for k, v in kwargs.items():
             setattr(new_result, k, v)
-        new_result.__post_init__()
+        new_result._init_derived_features()
         return new_result
 
-    wordform: Wordform
-    lemma_wordform: Lemma = field(init=False)
-    is_lemma: bool = field(init=False)
-    wordform_length: int = field(init=False)
-
-    #: What, if any, was the matching string?
-    source_language_match: Optional[str] = None
-    query_wordform_edit_distance: Optional[float] = None
-
-    source_language_affix_match: Optional[bool] = None
-    target_language_affix_match: Optional[bool] = None
-
-    target_language_keyword_match: list[str] = field(default_factory=list)
-
-    analyzable_inflection_match: Optional[bool] = None
-
-    source_language_keyword_match: list[str] = field(default_factory=list)
-
-    is_espt_result: Optional[bool] = None
-
-    #: Was anything in the query a target-language match for this result?
-    did_match_target_language: Optional[bool] = None
-
-    morpheme_ranking: Optional[float] = None
-
-    cosine_vector_distance: Optional[float] = None
-
-    relevance_score: Optional[float] = None
-
     def features(self):
         ret = {}
-        for field in dataclasses.fields(Result):
-            if field.name not in ["wordform", "lemma_wordform"]:
-                value = getattr(self, field.name)
-                if value is not None:
-                    ret[field.name] = value
+        for name in FEATURE_NAMES:
+            value = getattr(self, name)
+            if value is not None:
+                ret[name] = value
         return ret
 
     def features_json(self):
@@ -181,14 +297,44 @@ class Result:
     #     should also be invalidated if the object is mutated. For now code
     #     that uses Result lists is responsible for calling this method
     #     explicitly when done adding results.
-    #  3. Dataclasses make doing custom caching a little trickier
     def assign_default_relevance_score(self):
         ranking.assign_relevance_score(self)
 
+    def __eq__(self, other):
+        if not isinstance(other, Result):
+            return NotImplemented
+        return self.wordform == other.wordform and self.features() == other.features()
+
+    __hash__ = None  # type: ignore
+
     def __lt__(self, other: Result):
         assert self.relevance_score is not None
         assert other.relevance_score is not None
         return self.relevance_score > other.relevance_score
 
+    def __repr__(self):
+        features = ", ".join(f"{k}={v!r}" for k, v in self.features().items())
+        return f"Result(wordform={self.wordform!r}, {features})"
+
     def __str__(self):
         return f"Result<wordform={self.wordform}>"
+
+
+#: The names of the features of a Result, in the order they are output
+FEATURE_NAMES = (
+    "is_lemma",
+    "wordform_length",
+    "source_language_match",
+    "query_wordform_edit_distance",
+    "source_language_affix_match",
+    "source_language_fuzzy_match",
+    "target_language_affix_match",
+    "target_language_keyword_match",
+    "analyzable_inflection_match",
+    "source_language_keyword_match",
+    "is_espt_result",
+    "did_match_target_language",
+    "morpheme_ranking",
+    "cosine_vector_distance",
+    "relevance_score",
+)
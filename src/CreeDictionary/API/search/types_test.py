@@ -25,3 +25,32 @@ def test_result_adding_cvd():
     r4 = Result(make_wf(), cosine_vector_distance=0.3)
     r.add_features_from(r4)
     assert r.cosine_vector_distance == 0.25
+
+
+def test_result_merging_boolean_features():
+    def make_wf(text: str = "foo"):
+        ret = Wordform(text=text, is_lemma=True)
+        ret.lemma = ret
+        return ret
+
+    r = Result(make_wf(), target_language_affix_match=True)
+    assert r.source_language_affix_match is None
+    assert r.is_espt_result is None
+
+    r.add_features_from(Result(make_wf(), is_espt_result=False))
+    # set features are kept, unset ones are not touched, and False is a value
+    assert r.target_language_affix_match is True
+    assert r.is_espt_result is False
+    assert r.source_language_affix_match is None
+
+    r.add_features_from(Result(make_wf(), target_language_affix_match=False))
+    assert r.target_language_affix_match is False
+
+    assert list(r.features().keys()) == [
+        "is_lemma",
+        "wordform_length",
+        "target_language_affix_match",
+        "target_language_keyword_match",
+        "source_language_keyword_match",
+        "is_espt_result",
+    ]
@@ -1,4 +1,4 @@
-from typing import Optional, TypeVar
+from typing import Mapping, Optional, TypeVar
 
 from cree_sro_syllabics import syllabics2sro
 
@@ -38,3 +38,22 @@ def to_sro_circumflex(text: str) -> str:
     """
     text = text.replace("ā", "â").replace("ē", "ê").replace("ī", "î").replace("ō", "ô")
     return syllabics2sro(text)
+
+
+def parse_page_params(params: Mapping[str, str]) -> tuple[Optional[int], int]:
+    """
+    Return (limit, offset) from the `limit` and `offset` request parameters.
+
+    Raises ValueError if either is not a non-negative integer.
+
+    >>> parse_page_params({})
+    (None, 0)
+    >>> parse_page_params({"limit": "10", "offset": "20"})
+    (10, 20)
+    """
+    limit_str = params.get("limit")
+    limit: Optional[int] = int(limit_str) if limit_str else None
+    offset = int(params.get("offset") or 0)
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit and offset must not be negative")
+    return limit, offset
@@ -1,8 +1,11 @@
 from django.conf import settings
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, Http404
 from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
 
-from .search import simple_search
+from .search import cached_serialized_search, search_many
+from .search.timing import attach_stage_timings
+from .search.util import parse_page_params
 
 
 def click_in_text(request) -> HttpResponse:
@@ -17,9 +20,53 @@ def click_in_text(request) -> HttpResponse:
     elif q == "":
         return HttpResponseBadRequest("query param q is an empty string")
 
-    results = simple_search(q, include_auto_definitions=False)
+    try:
+        limit, offset = parse_page_params(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
 
-    response = {"results": results}
+    # Same as simple_search(), but keeping the SearchRun for its timings
+    search_run, results, total_count = cached_serialized_search(
+        q,
+        include_affixes=False,
+        include_auto_definitions=False,
+        limit=limit,
+        offset=offset,
+    )
+
+    response = {"results": results, "total_count": total_count}
+
+    json_response = JsonResponse(response)
+    json_response["Access-Control-Allow-Origin"] = "*"
+    if search_run:
+        attach_stage_timings(json_response, search_run)
+    return json_response
+
+
+@csrf_exempt
+def click_in_text_batch(request) -> HttpResponse:
+    """
+    click-in-text api for many words at once
+
+    Takes any number of q params, either in the query string or as a
+    form-encoded POST body for long paragraphs. The response maps each
+    distinct q to the same results click_in_text() would return for it.
+    """
+    if request.method == "POST":
+        queries = request.POST.getlist("q")
+    else:
+        queries = request.GET.getlist("q")
+
+    if not queries:
+        return HttpResponseBadRequest("query param q missing")
+    elif "" in queries:
+        return HttpResponseBadRequest("query param q is an empty string")
+    elif len(set(queries)) > settings.CLICK_IN_TEXT_BATCH_MAX_QUERIES:
+        return HttpResponseBadRequest(
+            f"too many distinct queries; the limit is {settings.CLICK_IN_TEXT_BATCH_MAX_QUERIES}"
+        )
+
+    response = {"results": search_many(queries, include_auto_definitions=False)}
 
     json_response = JsonResponse(response)
     json_response["Access-Control-Allow-Origin"] = "*"
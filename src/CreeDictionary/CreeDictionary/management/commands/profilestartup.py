@@ -0,0 +1,111 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+import morphodict
+from morphodict.site.startup_profile import parse_importtime
+
+
+class Command(BaseCommand):
+    help = """Profile the cold start of a web server process
+
+    Starts a fresh Python process, which sets up Django and then runs each of
+    the initializers that the server runs at startup: affix searchers,
+    morpheme rankings, relabellings, paradigm layouts, FSTs, vector models,
+    and so on. Prints a JSON report of the time and memory used by each, and
+    the import time of every module, to compare between releases.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.formatter_class = ArgumentDefaultsHelpFormatter
+
+        parser.add_argument(
+            "--output-file", help="Write the report here instead of standard output"
+        )
+        parser.add_argument(
+            "--no-trace-memory",
+            dest="trace_memory",
+            action="store_false",
+            help="""
+                Don’t measure Python allocations with tracemalloc, which slows
+                everything down
+            """,
+        )
+        parser.add_argument(
+            "--top-imports",
+            type=int,
+            default=None,
+            help="Only report this many modules, by cumulative import time",
+        )
+
+    def handle(self, output_file, trace_memory, top_imports, **options):
+        src_dir = Path(morphodict.__file__).parent.parent
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                [os.fspath(src_dir)]
+                + ([os.environ["PYTHONPATH"]] if os.environ.get("PYTHONPATH") else [])
+            ),
+            "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"],
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            steps_file = Path(tmpdir) / "steps.json"
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    "-X",
+                    "importtime",
+                    "-m",
+                    "morphodict.site.startup_profile",
+                    os.fspath(steps_file),
+                    "trace-memory" if trace_memory else "no-trace-memory",
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if process.returncode != 0:
+                raise CommandError(
+                    f"Profiling process failed with status {process.returncode}:\n"
+                    + "\n".join(
+                        line
+                        for line in process.stderr.splitlines()
+                        if not line.startswith("import time:")
+                    )
+                )
+            steps = json.loads(steps_file.read_text())
+
+        imports = parse_importtime(process.stderr)
+        if top_imports is not None:
+            imports = dict(
+                sorted(
+                    imports.items(),
+                    key=lambda item: item[1]["cumulative_us"],
+                    reverse=True,
+                )[:top_imports]
+            )
+
+        report = {
+            "python_version": platform.python_version(),
+            "settings_module": os.environ["DJANGO_SETTINGS_MODULE"],
+            "debug": settings.DEBUG,
+            "traced_memory": trace_memory,
+            "total_seconds": sum(step["seconds"] for step in steps),
+            "steps": steps,
+            "imports": imports,
+        }
+
+        output = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+        if output_file:
+            Path(output_file).write_text(output + "\n", encoding="UTF-8")
+        else:
+            self.stdout.write(output)
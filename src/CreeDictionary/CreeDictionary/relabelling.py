@@ -61,14 +61,17 @@ class Relabelling:
 
     def __init__(self, data: _DataStructure) -> None:
         self._data = data
+        trie = _TagTrie.from_data(data)
 
         self.linguistic_short = _RelabelFetcher(
-            data, _LabelFriendliness.LINGUISTIC_SHORT
+            data, trie, _LabelFriendliness.LINGUISTIC_SHORT
         )
-        self.linguistic_long = _RelabelFetcher(data, _LabelFriendliness.LINGUISTIC_LONG)
-        self.english = _RelabelFetcher(data, _LabelFriendliness.ENGLISH)
-        self.cree = _RelabelFetcher(data, _LabelFriendliness.NEHIYAWEWIN)
-        self.emoji = _RelabelFetcher(data, _LabelFriendliness.EMOJI)
+        self.linguistic_long = _RelabelFetcher(
+            data, trie, _LabelFriendliness.LINGUISTIC_LONG
+        )
+        self.english = _RelabelFetcher(data, trie, _LabelFriendliness.ENGLISH)
+        self.cree = _RelabelFetcher(data, trie, _LabelFriendliness.NEHIYAWEWIN)
+        self.emoji = _RelabelFetcher(data, trie, _LabelFriendliness.EMOJI)
 
     def __contains__(self, key: object) -> bool:
         if isinstance(key, str):
@@ -101,6 +104,34 @@ class Relabelling:
         return cls(res)
 
 
+class _TagTrie:
+    """
+    The tag sets of all the relabellings, as a trie keyed on one tag per level.
+    """
+
+    __slots__ = ("children", "labels")
+
+    def __init__(self):
+        self.children: dict[FSTTag, _TagTrie] = {}
+        # Set on nodes where a tag set with relabellings ends
+        self.labels: Optional[dict[_LabelFriendliness, Optional[Label]]] = None
+
+    @classmethod
+    def from_data(cls, data: Relabelling._DataStructure) -> _TagTrie:
+        root = cls()
+        for tag_set, labels in data.items():
+            node = root
+            for tag in tag_set:
+                node = node.children.setdefault(tag, cls())
+            node.labels = labels
+        return root
+
+
+# Results are memoized per distinct tag sequence. There are only so many
+# distinct analyses to relabel, but just in case, start over past this many.
+_MAX_MEMOIZED_TAG_SEQUENCES = 50_000
+
+
 class _RelabelFetcher:
     """
     Makes accessing relabellings for a particular label friendliness easier.
@@ -109,11 +140,22 @@ class _RelabelFetcher:
     def __init__(
         self,
         data: Relabelling._DataStructure,
+        trie: _TagTrie,
         label: _LabelFriendliness,
     ):
         self._data = data
+        self._trie = trie
         self._friendliness = label
 
+        # tag sequence → (length of longest relabelled prefix, its label)
+        self._longest_prefixes: dict[
+            tuple[FSTTag, ...], tuple[int, Optional[Label]]
+        ] = {}
+        # tag sequence → chunks
+        self._chunks: dict[tuple[FSTTag, ...], tuple[tuple[FSTTag, ...], ...]] = {}
+        # tag sequence → full relabelling
+        self._full_relabellings: dict[tuple[FSTTag, ...], tuple[Label, ...]] = {}
+
     def __getitem__(self, key: FSTTag) -> Optional[Label]:
         return self._data[(key,)][self._friendliness]
 
@@ -123,11 +165,19 @@ class _RelabelFetcher:
         """
         return self._data.get((key,), {}).get(self._friendliness, default)
 
+    def items(self) -> Iterable[tuple[FSTTag, Optional[Label]]]:
+        """
+        The relabellings of every single FST tag.
+        """
+        for tag_set, labels in self._data.items():
+            if len(tag_set) == 1:
+                yield tag_set[0], labels[self._friendliness]
+
     def get_longest(self, tags: Iterable[FSTTag]) -> Optional[Label]:
         """
         Get a relabelling for the longest prefix of the given tags.
         """
-        _unmatched, label = self._get_longest(tags)
+        _prefix_length, label = self._longest_prefix(tuple(tags))
         return label
 
     def chunk(self, tags: Iterable[FSTTag]) -> Iterable[tuple[FSTTag, ...]]:
@@ -135,60 +185,85 @@ class _RelabelFetcher:
         Chunk FST Labels that match relabellings and yield the tags.
         """
         tag_set = tuple(tags)
-        while tag_set:
-            unmatched, _ = self._get_longest(tag_set)
-            prefix_length = len(tag_set) - len(unmatched)
-            if prefix_length == 0:
-                # There was no relabelling found, but we can just return the first tag.
-                prefix_length = 1
-
-            yield tag_set[:prefix_length]
-            tag_set = tag_set[prefix_length:]
+        chunks = self._chunks.get(tag_set)
+        if chunks is None:
+            chunks = self._memoize(self._chunks, tag_set, tuple(self._chunk(tag_set)))
+        return iter(chunks)
 
     def get_full_relabelling(self, tags: Iterable[FSTTag]) -> list[Label]:
         """
         Relabels all tags, trying to match prefixes
         """
-
-        labels = []
         tag_set = tuple(tags)
-        while tag_set:
-            unmatched, maybe_label = self._get_longest(tag_set)
+        labels = self._full_relabellings.get(tag_set)
+        if labels is None:
+            labels = self._memoize(
+                self._full_relabellings,
+                tag_set,
+                tuple(self._full_relabelling(tag_set)),
+            )
+        return list(labels)
+
+    def _chunk(self, tag_set: tuple[FSTTag, ...]) -> Iterable[tuple[FSTTag, ...]]:
+        start = 0
+        while start < len(tag_set):
+            prefix_length, _ = self._longest_prefix_at(tag_set, start)
+            if prefix_length == 0:
+                # There was no relabelling found, but we can just return the first tag.
+                prefix_length = 1
+
+            yield tag_set[start : start + prefix_length]
+            start += prefix_length
+
+    def _full_relabelling(self, tag_set: tuple[FSTTag, ...]) -> Iterable[Label]:
+        start = 0
+        while start < len(tag_set):
+            prefix_length, maybe_label = self._longest_prefix_at(tag_set, start)
             if maybe_label is None:
                 # No relabelling available! Just return the tag itself
                 # TODO: raise a warning?
-                label = Label(tag_set[0])
-                tag_set = tag_set[1:]
+                yield Label(tag_set[start])
+                start += 1
             else:
-                assert len(unmatched) < len(tag_set)
-                label = maybe_label
-                tag_set = unmatched
-            labels.append(label)
+                yield maybe_label
+                start += prefix_length
 
-        return labels
-
-    def _get_longest(
-        self, tags: Iterable[FSTTag]
-    ) -> tuple[tuple[FSTTag, ...], Optional[Label]]:
+    def _longest_prefix(
+        self, tag_set: tuple[FSTTag, ...]
+    ) -> tuple[int, Optional[Label]]:
         """
-        Returns the unmatched tags, and the relabelling of the matched tags from the
-        prefix.
-
-        Returns a tuple of all tags if no prefix matched.
+        Returns the length of the longest prefix of tag_set that has a
+        relabelling, and that relabelling. The length is 0 if no prefix
+        matched.
         """
-
-        # TODO: better algorithm than this. Probably a trie
-        try_tags = tuple(tags)
-        end = len(try_tags)
-        while end > 0:
-            try:
-                entry = self._data[try_tags[:end]]
-            except KeyError:
-                end -= 1
-            else:
-                return try_tags[end:], entry[self._friendliness]
-
-        return try_tags, None
+        result = self._longest_prefixes.get(tag_set)
+        if result is None:
+            result = self._memoize(
+                self._longest_prefixes, tag_set, self._longest_prefix_at(tag_set, 0)
+            )
+        return result
+
+    def _longest_prefix_at(
+        self, tag_set: tuple[FSTTag, ...], start: int
+    ) -> tuple[int, Optional[Label]]:
+        """Like _longest_prefix(), for tag_set[start:], walking the trie once"""
+        node = self._trie
+        longest: tuple[int, Optional[Label]] = (0, None)
+        for i in range(start, len(tag_set)):
+            child = node.children.get(tag_set[i])
+            if child is None:
+                break
+            node = child
+            if node.labels is not None:
+                longest = (i - start + 1, node.labels[self._friendliness])
+        return longest
+
+    @staticmethod
+    def _memoize(memo: dict, key, value):
+        if len(memo) >= _MAX_MEMOIZED_TAG_SEQUENCES:
+            memo.clear()
+        memo[key] = value
+        return value
 
 
 def _label_from_column_or_none(column_no: _LabelFriendliness, row) -> Optional[Label]:
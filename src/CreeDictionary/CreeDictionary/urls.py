@@ -56,6 +56,12 @@ urlpatterns = [
         api_views.click_in_text,
         name="cree-dictionary-word-click-in-text-api",
     ),
+    # many words at once, for annotating whole paragraphs
+    path(
+        "click-in-text-batch/",
+        api_views.click_in_text_batch,
+        name="cree-dictionary-word-click-in-text-batch-api",
+    ),
     path(
         "click-in-text-embedded-test/",
         api_views.click_in_text_embedded_test,
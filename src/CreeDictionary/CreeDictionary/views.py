@@ -11,7 +11,9 @@ from django.shortcuts import redirect, render
 from django.views.decorators.http import require_GET
 
 import morphodict.analysis
-from CreeDictionary.API.search import presentation, search_with_affixes
+from CreeDictionary.API.search import cached_serialized_search, presentation
+from CreeDictionary.API.search.timing import attach_stage_timings
+from CreeDictionary.API.search.util import parse_page_params
 from CreeDictionary.CreeDictionary.forms import WordSearchForm
 from CreeDictionary.CreeDictionary.paradigm.generation import default_paradigm_manager
 from CreeDictionary.phrase_translate.translate import (
@@ -104,18 +106,24 @@ def index(request):  # pragma: no cover
     user_query = request.GET.get("q", None)
     search_run = None
 
+    try:
+        limit, offset = parse_page_params(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
     if user_query:
-        search_run = search_with_affixes(
+        search_run, search_results, total_count = cached_serialized_search(
             user_query,
             include_auto_definitions=should_include_auto_definitions(request),
-        )
-        search_results = search_run.serialized_presentation_results(
             display_mode=DisplayMode.current_value_from_request(request),
             animate_emoji=AnimateEmoji.current_value_from_request(request),
+            limit=limit,
+            offset=offset,
         )
         did_search = True
     else:
         search_results = []
+        total_count = 0
         did_search = False
 
     if did_search:
@@ -130,30 +138,50 @@ def index(request):  # pragma: no cover
         query_string=user_query,
         search_results=search_results,
         did_search=did_search,
+        **result_page_context(search_results, total_count, offset),
     )
     if search_run and search_run.verbose_messages and search_run.query.verbose:
         context["verbose_messages"] = json.dumps(
             search_run.verbose_messages, indent=2, ensure_ascii=False
         )
-    return render(request, "CreeDictionary/index.html", context)
+    response = render(request, "CreeDictionary/index.html", context)
+    response["X-Total-Count"] = total_count
+    if search_run:
+        attach_stage_timings(response, search_run)
+    return response
 
 
 def search_results(request, query_string: str):  # pragma: no cover
     """
     returns rendered boxes of search results according to user query
     """
-    results = search_with_affixes(
-        query_string, include_auto_definitions=should_include_auto_definitions(request)
-    ).serialized_presentation_results(
+    try:
+        limit, offset = parse_page_params(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    search_run, results, total_count = cached_serialized_search(
+        query_string,
+        include_auto_definitions=should_include_auto_definitions(request),
         # mypy cannot infer this property, but it exists!
         display_mode=DisplayMode.current_value_from_request(request),  # type: ignore
         animate_emoji=AnimateEmoji.current_value_from_request(request),  # type: ignore
+        limit=limit,
+        offset=offset,
     )
-    return render(
+    response = render(
         request,
         "CreeDictionary/search-results.html",
-        {"query_string": query_string, "search_results": results},
+        {
+            "query_string": query_string,
+            "search_results": results,
+            **result_page_context(results, total_count, offset),
+        },
     )
+    response["X-Total-Count"] = total_count
+    if search_run:
+        attach_stage_timings(response, search_run)
+    return response
 
 
 @require_GET
@@ -291,6 +319,8 @@ def fst_tool(request):
             ),
         }
 
+    context["fst_lookup_cache_stats"] = morphodict.analysis.fst_lookup_cache_stats()
+
     return render(request, "CreeDictionary/fst-tool.html", context)
 
 
@@ -323,6 +353,19 @@ def create_context_for_index_template(mode: IndexPageMode, **kwargs) -> Dict[str
     return context
 
 
+def result_page_context(results: list, total_count: int, offset: int) -> Dict[str, Any]:
+    """
+    Context vars describing which page of the search results is being shown.
+
+    The positions are 1-based, for display.
+    """
+    return {
+        "total_result_count": total_count,
+        "result_page_start": offset + 1 if results else 0,
+        "result_page_end": offset + len(results),
+    }
+
+
 def google_site_verification(request):
     code = settings.GOOGLE_SITE_VERIFICATION
     return HttpResponse(
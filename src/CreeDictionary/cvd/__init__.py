@@ -3,6 +3,7 @@ import re
 from functools import cache
 from os import fspath
 
+import numpy as np
 from django.conf import settings
 from gensim.models import KeyedVectors
 
@@ -26,8 +27,35 @@ def _load_vectors(path):
     return KeyedVectors.load(fspath(path), mmap="r")
 
 
+def news_vector_bundle_dir():
+    """Where buildnewsvectorbundle puts the bundle
+
+    Like definition_vectors_dir(), a symlink to the latest build.
+    """
+    return language_specific_vector_model_dir / "news_vectors_bundle"
+
+
+def news_vector_bundle_path(directory=None):
+    if directory is None:
+        directory = news_vector_bundle_dir()
+    return directory / "news_vectors.kv"
+
+
 @cache
 def google_news_vectors():
+    """The news vectors that CVD looks up query words in
+
+    The bundle of just the words this dictionary needs, if
+    buildnewsvectorbundle made one, or else the full shared news vectors.
+    """
+    path = news_vector_bundle_path()
+    if path.exists():
+        return _load_vectors(path)
+    return full_google_news_vectors()
+
+
+@cache
+def full_google_news_vectors():
     return _load_vectors(shared_vector_model_dir / "news_vectors.kv")
 
 
@@ -38,11 +66,32 @@ class DefinitionVectorsNotFoundException(Exception):
         )
 
 
-def definition_vectors_path():
-    filename = f"definitions_v{CVD_KEY_FORMAT}.kv"
+def definition_vectors_dir():
+    """Where builddefinitionvectors puts the definition vectors
+
+    A symlink to the directory of the latest build, so that a new build can be
+    swapped in atomically.
+    """
+    name = f"definitions_v{CVD_KEY_FORMAT}"
     if settings.USE_TEST_DB:
-        filename = f"test_db_definitions_v{CVD_KEY_FORMAT}.kv"
-    return language_specific_vector_model_dir / filename
+        name = f"test_db_definitions_v{CVD_KEY_FORMAT}"
+    return language_specific_vector_model_dir / name
+
+
+def definition_vectors_path(directory=None):
+    """The definition vectors file in directory, by default
+    definition_vectors_dir()
+
+    Falls back to the single file that builddefinitionvectors used to write
+    instead of a directory, until it is next run.
+    """
+    if directory is None:
+        directory = definition_vectors_dir()
+    path = directory / "definitions.kv"
+    legacy_path = directory.with_name(f"{directory.name}.kv")
+    if not path.exists() and legacy_path.exists():
+        return legacy_path
+    return path
 
 
 @cache
@@ -54,16 +103,57 @@ def definition_vectors():
         raise DefinitionVectorsNotFoundException
 
 
+@cache
+def definition_vector_index():
+    """What CVD search scans for the definitions closest to a query
+
+    The approximate nearest-neighbour index of definition_vectors(), if
+    builddefinitionvectors built one, or else its quantized copy, or else
+    definition_vectors() itself. Either way, call
+    .similar_by_vector(vector, topn).
+    """
+    # Import here to avoid a cycle
+    from .ann import IVFIndex, ivf_path
+    from .quantized import QuantizedVectors, quantized_path
+
+    full_vectors = definition_vectors()
+    vectors_path = definition_vectors_path()
+
+    path = ivf_path(vectors_path)
+    if path.exists():
+        try:
+            return IVFIndex(path, full_vectors, settings.MORPHODICT_CVD_ANN_PROBES)
+        except ValueError:
+            logger.exception("Not using approximate nearest-neighbour index")
+
+    path = quantized_path(vectors_path)
+    if not path.exists():
+        return full_vectors
+    try:
+        return QuantizedVectors(path, full_vectors)
+    except ValueError:
+        logger.exception("Not using quantized definition vectors")
+        return full_vectors
+
+
 def preload_models():
+    preload_definition_vectors()
+    preload_news_vectors()
+
+
+def preload_definition_vectors():
     try:
-        definition_vectors()
+        definition_vector_index()
     except DefinitionVectorsNotFoundException:
         logger.exception("")
 
+
+def preload_news_vectors():
     # doing a similarity search compares against every other vector, so by doing
     # similar_by_key for any key at all, we preload the entire vector model into
     # memory.
-    google_news_vectors().similar_by_key("hello")
+    news_vectors = google_news_vectors()
+    news_vectors.similar_by_key(news_vectors.index_to_key[0])
 
 
 # Implementation from https://stackoverflow.com/a/48027864/14558 which cites
@@ -79,7 +169,7 @@ def vector_for_keys(keyed_vectors, keys: list[str]):
     if not keys:
         raise ValueError("keys cannot be empty")
 
-    return keyed_vectors[keys].sum(axis=0)
+    return keyed_vectors[keys].sum(axis=0, dtype=np.float32)
 
 
 RE_PUNCTUATION = re.compile(r'[!,.\[\]\(\)\{\};:"/\?]+')
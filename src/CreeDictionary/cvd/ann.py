@@ -0,0 +1,197 @@
+"""
+An approximate nearest-neighbour index for the definition vectors
+
+Instead of comparing a query against every definition vector, IVFIndex (an
+inverted file index) clusters the definition vectors ahead of time, and at
+query time only compares the query against the vectors in the `probes`
+clusters whose centroids are closest to it. More probes find more of the true
+nearest neighbours, at the cost of comparing against more vectors; the
+benchmarkcvd command measures both.
+
+The clusters come from spherical k-means, in plain NumPy, run by
+builddefinitionvectors. The index is a directory next to the KeyedVectors file
+it was built from:
+
+    definitions_v2/definitions.kv
+    definitions_v2/definitions.ivf/
+        meta.json       count, vector size, and number of clusters
+        centroids.npy   (n_lists, vector_size) float32 unit vectors
+        order.npy       (count,) row numbers, grouped by cluster
+        offsets.npy     (n_lists + 1,) where each cluster starts in order
+        norms.npy       (count,) float32 norms of the full vectors
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from gensim.models import KeyedVectors
+
+logger = logging.getLogger(__name__)
+
+# Vectors compared against all the centroids at a time, to bound the memory
+# used by the similarity matrix
+_ASSIGN_CHUNK_ROWS = 8192
+
+
+def ivf_path(vectors_path: Path) -> Path:
+    """Where the index of the KeyedVectors at vectors_path goes"""
+    return vectors_path.with_suffix(".ivf")
+
+
+def default_list_count(vector_count: int) -> int:
+    """
+    >>> default_list_count(40_000)
+    200
+    """
+    return max(1, int(math.sqrt(vector_count)))
+
+
+def _normalize(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+    return vectors / np.where(norms == 0, 1, norms)[:, np.newaxis], norms
+
+
+def _nearest_centroids(unit: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(unit), dtype=np.int64)
+    for start in range(0, len(unit), _ASSIGN_CHUNK_ROWS):
+        end = start + _ASSIGN_CHUNK_ROWS
+        assignments[start:end] = np.argmax(unit[start:end] @ centroids.T, axis=1)
+    return assignments
+
+
+def spherical_kmeans(
+    unit: np.ndarray, k: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity, returning unit centroids"""
+    centroids = unit[rng.choice(len(unit), size=k, replace=False)].copy()
+    for iteration in range(iterations):
+        assignments = _nearest_centroids(unit, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, unit)
+        counts = np.bincount(assignments, minlength=k)
+
+        # Restart empty clusters from random vectors
+        empty = np.flatnonzero(counts == 0)
+        sums[empty] = unit[rng.choice(len(unit), size=len(empty), replace=False)]
+
+        centroids, _ = _normalize(sums)
+        logger.debug(f"k-means iteration {iteration}: {len(empty)} empty clusters")
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    def __init__(self, directory: Path, full_vectors: KeyedVectors, probes: int):
+        """Open the index in directory, built from full_vectors
+
+        Raises ValueError if the index does not match full_vectors.
+        """
+        meta = json.loads((directory / "meta.json").read_text())
+        if (meta["count"], meta["vector_size"]) != (
+            len(full_vectors),
+            full_vectors.vector_size,
+        ):
+            raise ValueError(
+                f"{directory} indexes {meta['count']}×{meta['vector_size']} vectors"
+                f" but the full vectors are"
+                f" {len(full_vectors)}×{full_vectors.vector_size};"
+                " re-run builddefinitionvectors"
+            )
+
+        self.centroids = np.load(directory / "centroids.npy")
+        self.order = np.load(directory / "order.npy")
+        self.offsets = np.load(directory / "offsets.npy")
+        self.norms = np.load(directory / "norms.npy")
+        self.full_vectors = full_vectors
+        self.probes = probes
+
+    @property
+    def list_count(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        directory: Path,
+        vectors: np.ndarray,
+        list_count: Optional[int] = None,
+        iterations: int = 15,
+        seed: int = 0,
+    ):
+        """Cluster vectors, a (count, vector_size) array, into directory"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if list_count is None:
+            list_count = default_list_count(len(vectors))
+        list_count = min(list_count, len(vectors))
+
+        unit, norms = _normalize(vectors)
+        centroids = spherical_kmeans(
+            unit, list_count, iterations, np.random.default_rng(seed)
+        )
+        assignments = _nearest_centroids(unit, centroids)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=list_count))]
+        )
+
+        if directory.exists():
+            shutil.rmtree(directory)
+        directory.mkdir(parents=True)
+        np.save(directory / "centroids.npy", centroids)
+        np.save(directory / "order.npy", order)
+        np.save(directory / "offsets.npy", offsets)
+        np.save(directory / "norms.npy", norms)
+        (directory / "meta.json").write_text(
+            json.dumps(
+                {
+                    "count": len(vectors),
+                    "vector_size": vectors.shape[1],
+                    "list_count": list_count,
+                }
+            )
+        )
+
+    def similar_by_vector(
+        self, vector, topn: int = 10, probes: Optional[int] = None
+    ) -> list[tuple[str, float]]:
+        """Like KeyedVectors.similar_by_vector(), but approximate
+
+        :param probes: how many clusters to search; defaults to the number the
+            index was opened with
+        """
+        if probes is None:
+            probes = self.probes
+        probes = max(1, min(probes, self.list_count))
+
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0 or len(self.order) == 0:
+            return []
+        unit_query = query / query_norm
+
+        centroid_similarities = self.centroids @ unit_query
+        lists = np.argpartition(-centroid_similarities, probes - 1)[:probes]
+        rows = np.concatenate(
+            [self.order[self.offsets[i] : self.offsets[i + 1]] for i in lists]
+        )
+        # Sorted row order reads the memory-mapped full vectors sequentially
+        rows.sort()
+
+        norms = self.norms[rows]
+        similarities = (self.full_vectors.vectors[rows] @ unit_query) / np.where(
+            norms == 0, 1, norms
+        )
+
+        count = min(topn, len(rows))
+        if count == 0:
+            return []
+        best = np.argpartition(-similarities, count - 1)[:count]
+        best = best[np.argsort(-similarities[best], kind="stable")]
+        index_to_key = self.full_vectors.index_to_key
+        return [(index_to_key[rows[i]], float(similarities[i])) for i in best.tolist()]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from gensim.models import KeyedVectors
+
+from CreeDictionary.cvd.ann import IVFIndex
+from CreeDictionary.cvd.quantized import recall
+
+
+@pytest.fixture
+def full_vectors():
+    rng = np.random.default_rng(1)
+    # Points scattered around a few dozen topics, like real definitions
+    topics = rng.normal(size=(30, 40))
+    vectors = (
+        topics[rng.integers(len(topics), size=2_000)]
+        + rng.normal(scale=0.3, size=(2_000, 40))
+    ).astype(np.float32)
+    kv = KeyedVectors(vector_size=40)
+    kv.add_vectors([f"definition{i}" for i in range(len(vectors))], vectors)
+    return kv
+
+
+def test_probing_every_list_is_exact(tmp_path, full_vectors):
+    IVFIndex.build(tmp_path / "ivf", full_vectors.vectors, list_count=20)
+    index = IVFIndex(tmp_path / "ivf", full_vectors, probes=20)
+
+    query = full_vectors.vectors[0] + full_vectors.vectors[1]
+    expected = full_vectors.similar_by_vector(query, 10)
+    actual = index.similar_by_vector(query, 10)
+
+    assert [key for key, _ in actual] == [key for key, _ in expected]
+    assert [similarity for _, similarity in actual] == pytest.approx(
+        [similarity for _, similarity in expected], abs=1e-5
+    )
+
+
+def test_more_probes_find_more(tmp_path, full_vectors):
+    IVFIndex.build(tmp_path / "ivf", full_vectors.vectors, list_count=40)
+    queries = full_vectors.vectors[:50]
+
+    recalls = [
+        recall(IVFIndex(tmp_path / "ivf", full_vectors, probes), full_vectors, queries)
+        for probes in (1, 4, 40)
+    ]
+
+    assert recalls == sorted(recalls)
+    assert recalls[1] >= 0.9
+    assert recalls[-1] == 1.0
+
+
+def test_index_must_match_full_vectors(tmp_path, full_vectors):
+    IVFIndex.build(tmp_path / "ivf", full_vectors.vectors[:10])
+
+    with pytest.raises(ValueError):
+        IVFIndex(tmp_path / "ivf", full_vectors, probes=8)
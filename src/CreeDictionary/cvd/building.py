@@ -0,0 +1,153 @@
+"""
+Building the definition vectors, incrementally and in parallel
+
+A definition’s vector is the sum of the news vectors of the words that
+extract_keyed_words() finds in its semantic definition. Each vector in the
+file is tagged with a hash of that text, so that a rebuild after an
+incremental import can reuse the vectors of definitions whose text has not
+changed, and only compute the rest. Those are computed in batches, summed with
+one NumPy call per batch, spread across a pool of processes by
+DefinitionVectorComputer.
+
+Each build is written to a new directory, which swap_in() then makes current
+by atomically replacing the symlink at definition_vectors_dir(), so that a
+server process loading the vectors never sees a half-written build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import django
+import numpy as np
+
+from . import extract_keyed_words, full_google_news_vectors
+
+logger = logging.getLogger(__name__)
+
+# The name of the KeyedVectors vector attribute holding semantic_hash() of the
+# text each definition vector was computed from
+SEMANTIC_HASH_ATTRIBUTE = "semantic_hash"
+
+
+def semantic_hash(text: str) -> int:
+    """A hash of text that is the same in every process
+
+    >>> semantic_hash("a bear") == semantic_hash("a bear")
+    True
+    >>> semantic_hash("a bear") == semantic_hash("a fish")
+    False
+    """
+    digest = hashlib.blake2b(text.encode("UTF-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+@dataclass
+class DefinitionVectorBatch:
+    # The news-vector keys found in each text, empty for texts with none
+    keys: list[list[str]]
+    # One row for each text with any keys, in order
+    vectors: np.ndarray
+
+
+def compute_definition_vectors(texts: list[str]) -> DefinitionVectorBatch:
+    """Compute the vectors of a batch of semantic definitions"""
+    news_vectors = full_google_news_vectors()
+    already_warned: set[str] = set()
+    keys = [extract_keyed_words(text, news_vectors, already_warned) for text in texts]
+
+    indices = [news_vectors.get_index(key) for text_keys in keys for key in text_keys]
+    lengths = [len(text_keys) for text_keys in keys if text_keys]
+    if not lengths:
+        vectors = np.empty((0, news_vectors.vector_size), dtype=np.float32)
+    else:
+        starts = np.cumsum([0] + lengths[:-1])
+        vectors = np.add.reduceat(
+            news_vectors.vectors[indices], starts, axis=0, dtype=np.float32
+        )
+    return DefinitionVectorBatch(keys=keys, vectors=vectors)
+
+
+class DefinitionVectorComputer:
+    """Runs compute_definition_vectors() over batches, in a process pool if asked
+
+    Use as a context manager, so that the pool is shut down afterwards:
+
+        with DefinitionVectorComputer(processes=4) as computer:
+            for texts, batch in zip(batches, computer.run(batches)):
+                ...
+    """
+
+    def __init__(self, processes: int = 1):
+        """
+        :param processes: the number of worker processes; with 1, everything
+            runs in the calling process
+        """
+        self._processes = processes
+        self._pool: Optional[Pool] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run(self, batches: Iterable[list[str]]) -> Iterator[DefinitionVectorBatch]:
+        """Yield the result for each batch of texts, in the same order"""
+        if self._processes <= 1:
+            return map(compute_definition_vectors, batches)
+
+        if self._pool is None:
+            # Load the memory-mapped vectors before forking, so that the
+            # workers share them
+            full_google_news_vectors()
+            logger.info(f"Computing definition vectors in {self._processes} processes")
+            self._pool = Pool(self._processes, initializer=django.setup)
+        return self._pool.imap(compute_definition_vectors, batches)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+def new_build_dir(live_dir: Path) -> Path:
+    """Make an empty directory for a build to be swapped in at live_dir"""
+    live_dir.parent.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(
+        tempfile.mkdtemp(prefix=f"{live_dir.name}.build-", dir=live_dir.parent)
+    )
+    # mkdtemp() makes it private, but the web server may run as another user
+    build_dir.chmod(0o755)
+    return build_dir
+
+
+def swap_in(build_dir: Path, live_dir: Path):
+    """Atomically point the symlink at live_dir to build_dir
+
+    Then delete all older builds but the one just replaced, which a process
+    may still be in the middle of loading.
+    """
+    previous = live_dir.resolve() if live_dir.is_symlink() else None
+    if live_dir.exists() and not live_dir.is_symlink():
+        # Only a symlink can be replaced atomically
+        shutil.rmtree(live_dir)
+
+    new_link = live_dir.with_name(f"{live_dir.name}.link-{os.getpid()}")
+    new_link.unlink(missing_ok=True)
+    # Relative, so that the whole directory can be moved
+    new_link.symlink_to(build_dir.name, target_is_directory=True)
+    os.replace(new_link, live_dir)
+
+    for old_build in live_dir.parent.glob(f"{live_dir.name}.build-*"):
+        if old_build.resolve() not in (build_dir.resolve(), previous):
+            shutil.rmtree(old_build)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from django.core.management import call_command
+from gensim.models import KeyedVectors
+
+from CreeDictionary.cvd import building, definition_vectors_path, vector_for_keys
+from CreeDictionary.cvd.building import compute_definition_vectors, swap_in
+from CreeDictionary.cvd.management.commands import builddefinitionvectors
+from morphodict.lexicon.models import Definition, Wordform
+
+
+@pytest.fixture
+def news_vectors(monkeypatch):
+    words = ["a", "bear", "big", "fish", "little", "water"]
+    rng = np.random.default_rng(1)
+    kv = KeyedVectors(vector_size=8)
+    kv.add_vectors(words, rng.normal(size=(len(words), 8)).astype(np.float32))
+
+    monkeypatch.setattr(building, "full_google_news_vectors", lambda: kv)
+    monkeypatch.setattr(builddefinitionvectors, "full_google_news_vectors", lambda: kv)
+    return kv
+
+
+def test_batch_vectors_are_sums_of_word_vectors(news_vectors):
+    batch = compute_definition_vectors(["a big bear", "xyzzy", "little fish"])
+
+    assert batch.keys == [["a", "big", "bear"], [], ["little", "fish"]]
+    assert batch.vectors == pytest.approx(
+        np.array(
+            [
+                vector_for_keys(news_vectors, ["a", "big", "bear"]),
+                vector_for_keys(news_vectors, ["little", "fish"]),
+            ]
+        )
+    )
+
+
+def test_swap_in_keeps_only_current_and_previous_builds(tmp_path):
+    live = tmp_path / "definitions_v2"
+    builds = [tmp_path / f"definitions_v2.build-{i}" for i in range(3)]
+
+    for build in builds:
+        build.mkdir()
+        swap_in(build, live)
+        assert live.resolve() == build.resolve()
+
+    assert [build.exists() for build in builds] == [False, True, True]
+
+
+def test_incremental_build_only_computes_changed_definitions(
+    tmp_path, db, news_vectors, monkeypatch
+):
+    lemma = Wordform.objects.create(
+        text="maskwa", raw_analysis=[[], "maskwa", ["+N", "+A", "+Sg"]]
+    )
+    lemma.lemma = lemma
+    lemma.save()
+    bear = Definition.objects.create(wordform=lemma, text="a bear")
+    big = Definition.objects.create(wordform=lemma, text="a big bear")
+
+    def build():
+        call_command(
+            "builddefinitionvectors",
+            output_dir=tmp_path / "definitions",
+            incremental=True,
+            processes=1,
+        )
+        return KeyedVectors.load(str(definition_vectors_path(tmp_path / "definitions")))
+
+    build()
+    big.raw_semantic_definition = "little fish"
+    big.save()
+
+    computed = []
+    original = building.compute_definition_vectors
+
+    def spy(texts):
+        computed.extend(texts)
+        return original(texts)
+
+    monkeypatch.setattr(building, "compute_definition_vectors", spy)
+    vectors = build()
+
+    # Definitions with no known words have no vectors to reuse, so the other
+    # definitions of the test database get computed again too
+    assert "little fish" in computed
+    assert "a bear" not in computed
+    by_id = {
+        int(key.rsplit(",", 1)[1].rstrip("]")): key for key in vectors.index_to_key
+    }
+    assert vectors[by_id[bear.id]] == pytest.approx(
+        vector_for_keys(news_vectors, ["a", "bear"])
+    )
+    assert vectors[by_id[big.id]] == pytest.approx(
+        vector_for_keys(news_vectors, ["little", "fish"])
+    )
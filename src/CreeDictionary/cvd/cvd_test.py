@@ -1,12 +1,16 @@
 import random
 
+import numpy as np
 import pytest
+from gensim.models import KeyedVectors
 
 from morphodict.lexicon.models import Wordform, Definition
 from CreeDictionary.cvd import extract_keyed_words
 from CreeDictionary.cvd.definition_keys import (
+    WORDFORM_ID_ATTRIBUTE,
     definition_to_cvd_key,
     cvd_key_to_wordform_query,
+    cvd_keys_to_wordform_ids,
 )
 
 FAKE_WORD_SET = {"loose", "leaf", "paper", "news_paper", "you're", "that"}
@@ -66,3 +70,13 @@ def test_definition_keys(slug, expect_null_analysis, db):
         wordforms = Wordform.objects.filter(**kwargs)
         assert wordforms.count() == 1
         assert wordforms.get() == d.wordform
+
+
+def test_cvd_keys_to_wordform_ids():
+    vectors = KeyedVectors(vector_size=2)
+    vectors.add_vectors(["key1", "key2", "key3"], np.zeros((3, 2)))
+    assert cvd_keys_to_wordform_ids(vectors, ["key1"]) is None
+
+    vectors.allocate_vecattrs([WORDFORM_ID_ATTRIBUTE], [np.int64])
+    vectors.expandos[WORDFORM_ID_ATTRIBUTE][:] = [10, 20, 10]
+    assert cvd_keys_to_wordform_ids(vectors, ["key3", "key2"]) == [10, 20]
@@ -13,18 +13,25 @@ import json
 import logging
 from typing import TypedDict, cast, Optional
 
-from morphodict.lexicon.models import Wordform, Definition
+from gensim.models import KeyedVectors
+
+from morphodict.lexicon.models import Wordform, Definition, analysis_key
 
 logger = logging.getLogger(__name__)
 
 CvdKey = str
 
+# The name of the KeyedVectors vector attribute holding the id of the wordform
+# of each definition, so that search can fetch the wordforms by primary key
+# without parsing keys
+WORDFORM_ID_ATTRIBUTE = "wordform_id"
+
 
 class WordformQuery(TypedDict, total=False):
     text: str
     lemma__slug: str
-    raw_analysis: Optional[str]
-    raw_analysis__isnull: Optional[bool]
+    analysis_key: str
+    analysis_key__isnull: Optional[bool]
 
 
 def definition_to_cvd_key(d: Definition) -> CvdKey:
@@ -58,10 +65,11 @@ def cvd_key_to_wordform_query(s: CvdKey) -> WordformQuery:
         "text": text,
         "lemma__slug": slug,
     }
-    if raw_analysis:
-        ret["raw_analysis"] = raw_analysis
+    key = analysis_key(raw_analysis) if raw_analysis else None
+    if key is not None:
+        ret["analysis_key"] = key
     else:
-        ret["raw_analysis__isnull"] = True
+        ret["analysis_key__isnull"] = True
     return ret
 
 
@@ -69,8 +77,23 @@ def wordform_query_matches(query: WordformQuery, wordform: Wordform):
     return (
         wordform.text == query["text"]
         and (
-            ("raw_analysis" in query and wordform.raw_analysis == query["raw_analysis"])
-            or ("raw_analysis__isnull" in query and wordform.raw_analysis is None)
+            ("analysis_key" in query and wordform.analysis_key == query["analysis_key"])
+            or ("analysis_key__isnull" in query and wordform.analysis_key is None)
         )
         and wordform.lemma.slug == query["lemma__slug"]
     )
+
+
+def cvd_keys_to_wordform_ids(
+    definition_vectors: KeyedVectors, keys: list[CvdKey]
+) -> Optional[list[int]]:
+    """Return the wordform id of each key, from the wordform id attribute
+
+    Returns None for vectors built before builddefinitionvectors stored the
+    ids. The ids are those of the database the vectors were built from.
+    """
+    ids = definition_vectors.expandos.get(WORDFORM_ID_ATTRIBUTE)
+    if ids is None:
+        return None
+    key_to_index = definition_vectors.key_to_index
+    return [int(ids[key_to_index[key]]) for key in keys]
@@ -0,0 +1,135 @@
+import statistics
+import tempfile
+import time
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from pathlib import Path
+
+import numpy as np
+from django.core.management import BaseCommand, CommandError
+
+from CreeDictionary.cvd import (
+    definition_vectors,
+    definition_vectors_path,
+    extract_keyed_words,
+    google_news_vectors,
+    vector_for_keys,
+)
+from CreeDictionary.cvd.ann import IVFIndex, ivf_path
+from CreeDictionary.cvd.quantized import QuantizedVectors, quantized_path
+
+
+class Command(BaseCommand):
+    help = """Compare approximate CVD search with a brute-force scan
+
+    Runs the same queries against the full definition vectors, the quantized
+    copy if there is one, and the approximate nearest-neighbour index at each
+    of several probe counts, and reports the recall of the exact top results
+    and the latency of each.
+
+    Uses the index that builddefinitionvectors built, or builds a temporary
+    one if there is none.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.formatter_class = ArgumentDefaultsHelpFormatter
+
+        parser.add_argument(
+            "--query-file",
+            help="""
+                English queries, one per line. By default, queries with a
+                random sample of the definition vectors.
+            """,
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=200,
+            help="How many definition vectors to query with, without --query-file",
+        )
+        parser.add_argument(
+            "--probes",
+            default="1,2,4,8,16,32",
+            help="Comma-separated probe counts to try",
+        )
+        parser.add_argument(
+            "--ann-lists",
+            type=int,
+            help="Clusters in the temporary index, if there is no built index",
+        )
+        parser.add_argument("--topn", type=int, default=50)
+
+    def handle(self, query_file, queries, probes, ann_lists, topn, **options):
+        full_vectors = definition_vectors()
+        if query_file:
+            query_vectors = self.vectors_for_query_file(Path(query_file))
+        else:
+            rng = np.random.default_rng(0)
+            query_vectors = full_vectors.vectors[
+                rng.choice(
+                    len(full_vectors),
+                    size=min(queries, len(full_vectors)),
+                    replace=False,
+                )
+            ]
+        if not len(query_vectors):
+            raise CommandError("No queries to run")
+
+        self.stdout.write(
+            f"{len(query_vectors):,} queries against {len(full_vectors):,}"
+            f" definition vectors, top {topn}\n"
+        )
+        self.stdout.write(f"{'method':<24} {'recall':>7} {'mean ms':>8} {'p95 ms':>8}")
+
+        def run(index):
+            latencies = []
+            results = []
+            for query in query_vectors:
+                start = time.perf_counter()
+                result = index.similar_by_vector(query, topn)
+                latencies.append((time.perf_counter() - start) * 1000)
+                results.append({key for key, _ in result})
+            return results, latencies
+
+        exact, latencies = run(full_vectors)
+        self.report("brute force", exact, exact, latencies)
+
+        path = quantized_path(definition_vectors_path())
+        if path.exists():
+            results, latencies = run(QuantizedVectors(path, full_vectors))
+            self.report("quantized", exact, results, latencies)
+
+        path = ivf_path(definition_vectors_path())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if not path.exists():
+                path = Path(tmpdir) / "ivf"
+                self.stdout.write("(building temporary index)")
+                IVFIndex.build(path, full_vectors.vectors, ann_lists)
+
+            index = IVFIndex(path, full_vectors, probes=1)
+            for probe_count in [int(p) for p in probes.split(",")]:
+                index.probes = probe_count
+                results, latencies = run(index)
+                self.report(
+                    f"ann {probe_count}/{index.list_count} probes",
+                    exact,
+                    results,
+                    latencies,
+                )
+
+    def vectors_for_query_file(self, query_file: Path) -> list[np.ndarray]:
+        news_vectors = google_news_vectors()
+        vectors = []
+        for line in query_file.read_text(encoding="UTF-8").splitlines():
+            keys = extract_keyed_words(line, news_vectors)
+            if keys:
+                vectors.append(vector_for_keys(news_vectors, keys))
+        return vectors
+
+    def report(self, name, exact, results, latencies):
+        found = sum(len(e & r) for e, r in zip(exact, results))
+        total = sum(len(e) for e in exact)
+        recall = found / total if total else 1.0
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+        self.stdout.write(
+            f"{name:<24} {recall:>7.1%} {statistics.mean(latencies):>8.2f} {p95:>8.2f}"
+        )
@@ -1,76 +1,337 @@
 import json
 import logging
+import shutil
 from argparse import ArgumentParser
 from contextlib import contextmanager
+from dataclasses import dataclass
 from os import fspath
+from pathlib import Path
+from typing import Optional
 
-from django.core.management import BaseCommand
+import numpy as np
+from django.conf import settings
+from django.core.management import BaseCommand, call_command
 from gensim.models import KeyedVectors
 from tqdm import tqdm
 
 from CreeDictionary.cvd import (
-    google_news_vectors,
-    extract_keyed_words,
-    vector_for_keys,
+    definition_vectors_dir,
     definition_vectors_path,
+    full_google_news_vectors,
+    news_vector_bundle_dir,
+)
+from CreeDictionary.cvd.ann import IVFIndex, ivf_path
+from CreeDictionary.cvd.building import (
+    SEMANTIC_HASH_ATTRIBUTE,
+    DefinitionVectorComputer,
+    new_build_dir,
+    semantic_hash,
+    swap_in,
+)
+from CreeDictionary.cvd.definition_keys import (
+    WORDFORM_ID_ATTRIBUTE,
+    definition_to_cvd_key,
+)
+from CreeDictionary.cvd.quantized import (
+    QUANTIZATIONS,
+    QuantizedVectors,
+    quantized_path,
+    recall,
 )
-from CreeDictionary.cvd.definition_keys import definition_to_cvd_key
 from morphodict.lexicon.models import Definition
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PendingDefinition:
+    """A definition whose vector has to be computed"""
+
+    # Index into the list of all definitions
+    position: int
+    text: str
+    semantic_text: str
+    wordform_text: str
+
+
 class Command(BaseCommand):
     help = """Create a vector model from current definitions"""
 
     def add_arguments(self, parser: ArgumentParser):
-        parser.add_argument("--output-file", default=definition_vectors_path())
-        parser.add_argument("--debug-output-file")
+        parser.add_argument(
+            "--output-dir",
+            default=definition_vectors_dir(),
+            help="""
+                Where to put the vectors. Each build is written to a new
+                directory next to this, and then this is atomically replaced
+                with a symlink to it.
+            """,
+        )
+        parser.add_argument(
+            "--debug-output-file",
+            help="""
+                Write the words extracted from each definition here; with
+                --incremental, only the definitions whose vectors were computed
+            """,
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="""
+                Reuse the vectors of the current build for definitions whose
+                semantic text has not changed
+            """,
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="How many processes to compute vectors in; 1 to use none",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many definitions to compute vectors for at a time",
+        )
+        parser.add_argument(
+            "--quantize",
+            choices=QUANTIZATIONS,
+            default=settings.MORPHODICT_CVD_QUANTIZATION,
+            help="Also write a quantized copy of the vectors for CVD search",
+        )
+        parser.add_argument(
+            "--recall-queries",
+            type=int,
+            default=200,
+            help="""
+                How many definitions to search for, with both the quantized
+                or approximate index and the full vectors, to check that they
+                find the same top 50
+            """,
+        )
+        parser.add_argument(
+            "--ann",
+            action="store_true",
+            default=settings.MORPHODICT_CVD_ANN_INDEX,
+            help="Also build an approximate nearest-neighbour index for CVD search",
+        )
+        parser.add_argument(
+            "--ann-lists",
+            type=int,
+            help="""
+                How many clusters the approximate index divides the vectors
+                into; by default, the square root of the number of vectors
+            """,
+        )
 
-    def handle(self, output_file, debug_output_file, **options):
+    def handle(
+        self,
+        output_dir,
+        debug_output_file,
+        incremental,
+        processes,
+        batch_size,
+        quantize,
+        recall_queries,
+        ann,
+        ann_lists,
+        **options,
+    ):
+        output_dir = Path(output_dir)
         logger.info("Building definition vectors")
 
+        previous = (
+            load_previous_vectors(definition_vectors_path(output_dir))
+            if incremental
+            else None
+        )
+
         definitions = Definition.objects.filter(
             auto_translation_source_id__isnull=True
-        ).prefetch_related("wordform__lemma")
+        ).select_related("wordform__lemma")
 
         count = definitions.count()
 
-        news_vectors = google_news_vectors()
+        # Not the bundle, which may be missing words from new definitions
+        news_vectors = full_google_news_vectors()
 
-        definition_vector_keys = []
-        definition_vector_vectors = []
+        cvd_keys = []
+        hashes = []
+        wordform_ids = []
+        # None until computed, and still None for definitions without any
+        # words in the news vectors
+        vectors: list[Optional[np.ndarray]] = []
+        pending: list[PendingDefinition] = []
 
-        unknown_words = set()
+        for d in tqdm(definitions.iterator(), total=count):
+            cvd_key = definition_to_cvd_key(d)
+            text_hash = semantic_hash(d.semantic_definition)
+            cvd_keys.append(cvd_key)
+            hashes.append(text_hash)
+            wordform_ids.append(d.wordform_id)
 
-        with create_debug_output(debug_output_file) as debug_output:
-            for d in tqdm(definitions.iterator(), total=count):
-                keys = extract_keyed_words(
-                    d.semantic_definition, news_vectors, unknown_words
-                )
-                debug_output(
-                    json.dumps(
-                        {
-                            "definition": d.text,
-                            "wordform_text": d.wordform.text,
-                            "extracted_keys": keys,
-                        },
-                        ensure_ascii=False,
+            previous_index = (
+                previous.key_to_index.get(cvd_key) if previous is not None else None
+            )
+            if (
+                previous_index is not None
+                and previous.expandos[SEMANTIC_HASH_ATTRIBUTE][previous_index]
+                == text_hash
+            ):
+                vectors.append(previous.vectors[previous_index])
+            else:
+                vectors.append(None)
+                pending.append(
+                    PendingDefinition(
+                        position=len(vectors) - 1,
+                        text=d.text,
+                        semantic_text=d.semantic_definition,
+                        wordform_text=d.wordform.text,
                     )
                 )
-                if keys:
-                    vec_sum = vector_for_keys(news_vectors, keys)
 
-                    definition_vector_keys.append(definition_to_cvd_key(d))
-                    definition_vector_vectors.append(vec_sum)
+        logger.info(
+            f"Reusing {count - len(pending):,} definition vectors,"
+            f" computing {len(pending):,}"
+        )
 
-            definition_vectors = KeyedVectors(vector_size=news_vectors.vector_size)
-            definition_vectors.add_vectors(
-                definition_vector_keys, definition_vector_vectors
+        batches = [
+            pending[start : start + batch_size]
+            for start in range(0, len(pending), batch_size)
+        ]
+        with DefinitionVectorComputer(
+            min(processes, len(batches))
+        ) as computer, create_debug_output(debug_output_file) as debug_output:
+            results = computer.run(
+                [p.semantic_text for p in batch] for batch in batches
             )
-            output_file.parent.mkdir(exist_ok=True)
+            for batch, result in tqdm(zip(batches, results), total=len(batches)):
+                rows = iter(result.vectors)
+                for p, keys in zip(batch, result.keys):
+                    debug_output(
+                        json.dumps(
+                            {
+                                "definition": p.text,
+                                "wordform_text": p.wordform_text,
+                                "extracted_keys": keys,
+                            },
+                            ensure_ascii=False,
+                        )
+                    )
+                    if keys:
+                        vectors[p.position] = next(rows)
+
+        kept = [i for i, vector in enumerate(vectors) if vector is not None]
+        definition_vectors = KeyedVectors(vector_size=news_vectors.vector_size)
+        definition_vectors.add_vectors(
+            [cvd_keys[i] for i in kept],
+            np.array([vectors[i] for i in kept], dtype=np.float32).reshape(
+                len(kept), news_vectors.vector_size
+            ),
+        )
+        definition_vectors.allocate_vecattrs(
+            [SEMANTIC_HASH_ATTRIBUTE, WORDFORM_ID_ATTRIBUTE], [np.int64, np.int64]
+        )
+        definition_vectors.expandos[SEMANTIC_HASH_ATTRIBUTE][:] = [
+            hashes[i] for i in kept
+        ]
+        # Always from the current definitions, even for reused vectors, as an
+        # import may have recreated the wordform
+        definition_vectors.expandos[WORDFORM_ID_ATTRIBUTE][:] = [
+            wordform_ids[i] for i in kept
+        ]
+
+        build_dir = new_build_dir(output_dir)
+        try:
+            output_file = definition_vectors_path(build_dir)
             definition_vectors.save(fspath(output_file))
 
+            queries = recall_test_queries(definition_vectors, recall_queries)
+            self.write_quantized(definition_vectors, output_file, quantize, queries)
+            self.build_ann_index(
+                definition_vectors, output_file, ann, ann_lists, queries
+            )
+
+            swap_in(build_dir, output_dir)
+        except BaseException:
+            shutil.rmtree(build_dir)
+            raise
+        logger.info(f"Wrote {len(definition_vectors):,} definition vectors")
+
+        if news_vector_bundle_dir().exists():
+            # New definitions may use words the bundle doesn't have yet
+            call_command("buildnewsvectorbundle")
+
+    def write_quantized(
+        self,
+        definition_vectors: KeyedVectors,
+        output_file: Path,
+        quantize: Optional[str],
+        queries: np.ndarray,
+    ):
+        if not quantize:
+            return
+        quantized_dir = quantized_path(output_file)
+
+        logger.info(f"Writing {quantize} quantized vectors to {quantized_dir}")
+        QuantizedVectors.write(quantized_dir, definition_vectors.vectors, quantize)
+
+        if len(queries):
+            quantized_recall = recall(
+                QuantizedVectors(quantized_dir, definition_vectors),
+                definition_vectors,
+                queries,
+            )
+            logger.info(f"Quantized top-50 recall: {quantized_recall:.1%}")
+
+    def build_ann_index(
+        self,
+        definition_vectors: KeyedVectors,
+        output_file: Path,
+        ann: bool,
+        ann_lists: Optional[int],
+        queries: np.ndarray,
+    ):
+        if not ann or not len(definition_vectors):
+            return
+        ivf_dir = ivf_path(output_file)
+
+        logger.info(f"Building approximate nearest-neighbour index in {ivf_dir}")
+        IVFIndex.build(ivf_dir, definition_vectors.vectors, ann_lists)
+
+        if len(queries):
+            probes = settings.MORPHODICT_CVD_ANN_PROBES
+            ann_recall = recall(
+                IVFIndex(ivf_dir, definition_vectors, probes),
+                definition_vectors,
+                queries,
+            )
+            logger.info(f"Approximate top-50 recall, {probes} probes: {ann_recall:.1%}")
+
+
+def load_previous_vectors(path: Path) -> Optional[KeyedVectors]:
+    """The vectors of the current build, if they can be reused"""
+    if not path.exists():
+        return None
+    previous = KeyedVectors.load(fspath(path), mmap="r")
+    if SEMANTIC_HASH_ATTRIBUTE not in previous.expandos:
+        logger.info(f"{path} predates incremental builds; computing every vector")
+        return None
+    return previous
+
+
+def recall_test_queries(definition_vectors: KeyedVectors, count: int) -> np.ndarray:
+    """A repeatable random sample of count of the definition vectors"""
+    rng = np.random.default_rng(0)
+    return definition_vectors.vectors[
+        rng.choice(
+            len(definition_vectors),
+            size=min(count, len(definition_vectors)),
+            replace=False,
+        )
+    ]
+
 
 @contextmanager
 def create_debug_output(path):
@@ -0,0 +1,71 @@
+import logging
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from pathlib import Path
+
+from django.core.management import BaseCommand
+
+from CreeDictionary.cvd import full_google_news_vectors, news_vector_bundle_dir
+from CreeDictionary.cvd.news_bundle import bundle_keys, bundle_options, write_bundle
+from morphodict.lexicon.models import Definition
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = """Bundle just the news vectors that this dictionary needs
+
+    Writes the vectors for every word of the definitions, plus the most
+    frequent other words, to a much smaller file that CVD search then loads
+    instead of the full shared news vectors. builddefinitionvectors re-runs
+    this, with the same options, whenever a bundle exists; delete the bundle
+    to go back to the full vectors.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.formatter_class = ArgumentDefaultsHelpFormatter
+
+        parser.add_argument("--output-dir", default=news_vector_bundle_dir())
+        parser.add_argument(
+            "--query-vocabulary-size",
+            type=int,
+            help="""
+                How many of the most frequent words to bundle, whether or not
+                any definition uses them. Defaults to what the existing bundle
+                used, or 50,000.
+            """,
+        )
+        parser.add_argument(
+            "--dtype",
+            choices=["float32", "float16"],
+            help="""
+                float16 makes the bundle half the size. Defaults to what the
+                existing bundle used, or float32.
+            """,
+        )
+
+    def handle(self, output_dir, query_vocabulary_size, dtype, **options):
+        output_dir = Path(output_dir)
+        bundle_opts = bundle_options(output_dir)
+        if query_vocabulary_size is not None:
+            bundle_opts["query_vocabulary_size"] = query_vocabulary_size
+        if dtype is not None:
+            bundle_opts["dtype"] = dtype
+
+        news_vectors = full_google_news_vectors()
+
+        definitions = Definition.objects.filter(
+            auto_translation_source_id__isnull=True
+        ).only("text", "raw_semantic_definition")
+        keys = bundle_keys(
+            news_vectors,
+            (d.semantic_definition for d in definitions.iterator()),
+            bundle_opts["query_vocabulary_size"],
+        )
+
+        bundle = write_bundle(output_dir, news_vectors, keys, bundle_opts)
+        logger.info(
+            f"Wrote {len(keys):,} of {len(news_vectors):,} news vectors,"
+            f" {bundle.vectors.nbytes / 2**20:,.1f} MiB"
+            f" instead of {news_vectors.vectors.nbytes / 2**20:,.1f} MiB,"
+            f" to {output_dir}"
+        )
@@ -0,0 +1,95 @@
+"""
+A bundle of just the news vectors that one dictionary can use
+
+CVD only ever looks up single query words in the news vectors, and the
+shared news_vectors.kv has 300,000 of them. The bundle keeps the words of
+the definitions, which are what people search for, and the most frequent
+words beyond those, in a file a fraction of the size. builddefinitionvectors
+rebuilds it whenever there is one, so that it keeps up with the definitions.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from os import fspath
+from pathlib import Path
+from typing import Iterable, TypedDict
+
+import numpy as np
+from gensim.models import KeyedVectors
+
+from . import extract_keyed_words, news_vector_bundle_path
+from .building import new_build_dir, swap_in
+
+DEFAULT_QUERY_VOCABULARY_SIZE = 50_000
+
+# Stored with the bundle, so that rebuilding it after an import keeps them
+OPTIONS_FILENAME = "options.json"
+
+
+class BundleOptions(TypedDict):
+    # How many of the most frequent words to bundle, whether or not any
+    # definition uses them
+    query_vocabulary_size: int
+    # "float32" or "float16"
+    dtype: str
+
+
+def bundle_keys(
+    news_vectors: KeyedVectors, texts: Iterable[str], query_vocabulary_size: int
+) -> list[str]:
+    """The keys to bundle, in the same most-frequent-first order
+
+    Those are the query_vocabulary_size most frequent keys, and every key
+    that extract_keyed_words() finds in texts.
+
+    >>> news_vectors = KeyedVectors(vector_size=2)
+    >>> news_vectors.add_vectors(["the", "of", "ice_cream", "cream", "bear"],
+    ...                          np.zeros((5, 2)))
+    >>> bundle_keys(news_vectors, ["a bear", "ice-cream"], 2)
+    ['the', 'of', 'ice_cream', 'bear']
+    """
+    keys = set(news_vectors.index_to_key[:query_vocabulary_size])
+    for text in texts:
+        keys.update(extract_keyed_words(text, news_vectors))
+    return sorted(keys, key=news_vectors.get_index)
+
+
+def bundle_options(bundle_dir: Path) -> BundleOptions:
+    """The options the bundle in bundle_dir was built with, or the defaults"""
+    options: BundleOptions = {
+        "query_vocabulary_size": DEFAULT_QUERY_VOCABULARY_SIZE,
+        "dtype": "float32",
+    }
+    path = bundle_dir / OPTIONS_FILENAME
+    if path.exists():
+        options.update(json.loads(path.read_text()))
+    return options
+
+
+def write_bundle(
+    bundle_dir: Path,
+    news_vectors: KeyedVectors,
+    keys: list[str],
+    options: BundleOptions,
+) -> KeyedVectors:
+    """Save the vectors of keys from news_vectors as the bundle in bundle_dir
+
+    float16 halves the size again; CVD only adds up a few of these vectors
+    per query, and does that in float32. The bundle is swapped in atomically,
+    like the definition vectors.
+    """
+    dtype = options["dtype"]
+    bundle = KeyedVectors(vector_size=news_vectors.vector_size, dtype=np.dtype(dtype))
+    bundle.add_vectors(keys, news_vectors[keys].astype(dtype))
+
+    build_dir = new_build_dir(bundle_dir)
+    try:
+        bundle.save(fspath(news_vector_bundle_path(build_dir)))
+        (build_dir / OPTIONS_FILENAME).write_text(json.dumps(options))
+        swap_in(build_dir, bundle_dir)
+    except BaseException:
+        shutil.rmtree(build_dir)
+        raise
+    return bundle
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from gensim.models import KeyedVectors
+
+from CreeDictionary.cvd.quantized import QuantizedVectors, recall
+
+
+@pytest.fixture
+def full_vectors():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(2_000, 40)).astype(np.float32)
+    kv = KeyedVectors(vector_size=40)
+    kv.add_vectors([f"definition{i}" for i in range(len(vectors))], vectors)
+    return kv
+
+
+@pytest.mark.parametrize("dtype", ["int8", "float16"])
+def test_quantized_search_matches_full_precision(tmp_path, full_vectors, dtype):
+    QuantizedVectors.write(tmp_path / "quantized", full_vectors.vectors, dtype)
+    index = QuantizedVectors(tmp_path / "quantized", full_vectors)
+
+    query = full_vectors.vectors[0] + full_vectors.vectors[1]
+    expected = full_vectors.similar_by_vector(query, 10)
+    actual = index.similar_by_vector(query, 10)
+
+    assert [key for key, _ in actual] == [key for key, _ in expected]
+    assert [similarity for _, similarity in actual] == pytest.approx(
+        [similarity for _, similarity in expected], abs=1e-5
+    )
+
+    assert recall(index, full_vectors, full_vectors.vectors[:20], topn=50) >= 0.99
+
+
+def test_quantized_vectors_must_match_full_vectors(tmp_path, full_vectors):
+    QuantizedVectors.write(tmp_path / "quantized", full_vectors.vectors[:10], "int8")
+
+    with pytest.raises(ValueError):
+        QuantizedVectors(tmp_path / "quantized", full_vectors)
@@ -12,7 +12,7 @@ from argparse import (
 )
 from argparse import BooleanOptionalAction
 from collections import Counter
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields
 from functools import cache
 from pathlib import Path
 from typing import Iterable
@@ -156,6 +156,11 @@ class TranslationStats:
     # How often are we seeing various unknown tags?
     unknown_tags_during_auto_translation: Counter = field(default_factory=Counter)
 
+    def add(self, other: TranslationStats):
+        """Add the counts in other to these ones"""
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
     def __str__(self):
         ret = []
 
@@ -4,8 +4,17 @@ from typing import TypedDict
 from CreeDictionary.API.schema import SerializedSearchResult
 
 
-class SearchResult(TypedDict):
+class StageTimingJson(TypedDict):
+    stage: str
+    ms: float
+    queries: int
+    results_added: int
+
+
+class SearchResult(TypedDict, total=False):
     time_taken_seconds: float
+    # Older sample results files do not have this key
+    stage_timings: list[StageTimingJson]
     results: list[SerializedSearchResult]
 
 
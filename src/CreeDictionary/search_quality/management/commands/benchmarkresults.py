@@ -0,0 +1,85 @@
+import time
+from argparse import ArgumentParser
+
+from django.core.management import BaseCommand
+
+from CreeDictionary.API.search.core import SearchRun
+from CreeDictionary.API.search.types import Result
+from morphodict.lexicon.models import Wordform, wordform_cache
+
+# Kinds of results, in the proportions an affix-heavy search might produce
+FEATURE_SETS = [
+    dict(source_language_affix_match=True, query_wordform_edit_distance=2.5),
+    dict(source_language_affix_match=True, query_wordform_edit_distance=1),
+    dict(target_language_affix_match=True),
+    dict(target_language_keyword_match=["sleep"]),
+    dict(source_language_match="nipâw", query_wordform_edit_distance=0),
+    dict(cosine_vector_distance=0.25),
+]
+
+
+class Command(BaseCommand):
+    help = """Microbenchmark constructing search Results and merging them into a
+    SearchRun, as happens thousands of times in affix-heavy searches.
+
+    The Results themselves are built from unsaved wordforms, but the
+    wordform cache, which Result construction relies on, is preloaded from
+    the database first, so that needs to be set up.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--count", type=int, default=200_000, help="Results to construct per run"
+        )
+        parser.add_argument(
+            "--distinct",
+            type=int,
+            default=2_000,
+            help="Number of distinct wordforms; the rest of the results get merged",
+        )
+        parser.add_argument("--runs", type=int, default=3, help="Best of how many")
+
+    def handle(self, *args, count, distinct, runs, **options):
+        # Not part of what we’re measuring
+        wordform_cache.preload()
+
+        wordforms = []
+        for i in range(distinct):
+            wf = Wordform(id=i + 1, text=f"wordform{i}", is_lemma=i % 3 == 0)
+            wf.lemma = wf
+            wordforms.append(wf)
+
+        construct_seconds = min(
+            self.time_construction(wordforms, count) for _ in range(runs)
+        )
+        merge_seconds = min(self.time_merging(wordforms, count) for _ in range(runs))
+
+        self.stdout.write(
+            f"constructed: {count / construct_seconds:,.0f} results/s"
+            f" ({construct_seconds * 1e6 / count:.2f} µs each)"
+        )
+        self.stdout.write(
+            f"constructed and added to a SearchRun: {count / merge_seconds:,.0f} results/s"
+            f" ({merge_seconds * 1e6 / count:.2f} µs each,"
+            f" {count - distinct:,} merges)"
+        )
+
+    @staticmethod
+    def time_construction(wordforms, count):
+        start = time.perf_counter()
+        for i in range(count):
+            Result(wordforms[i % len(wordforms)], **FEATURE_SETS[i % len(FEATURE_SETS)])
+        return time.perf_counter() - start
+
+    @staticmethod
+    def time_merging(wordforms, count):
+        search_run = SearchRun("benchmark")
+        start = time.perf_counter()
+        for i in range(count):
+            search_run.add_result(
+                Result(
+                    wordforms[i % len(wordforms)],
+                    **FEATURE_SETS[i % len(FEATURE_SETS)],
+                )
+            )
+        return time.perf_counter() - start
@@ -37,13 +37,15 @@ def gen_run_sample(
         # multiple times in randomized orders to spread out the effects of
         # warmup and caching
         start_time = time.time()
-        results = search_with_affixes(
+        search_run = search_with_affixes(
             query + (" " + append_to_query if append_to_query else "")
         )
+        results = search_run.serialized_presentation_results()
         time_taken = time.time() - start_time
 
         combined_results[query] = {
             "time_taken_seconds": time_taken,
+            "stage_timings": [t.serialize() for t in search_run.stage_timings],
             "results": results,
         }
 
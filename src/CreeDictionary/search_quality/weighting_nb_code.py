@@ -147,3 +147,50 @@ def rank_by_predictor(df, model):
         .groupby("query")
         .rank(ascending=False, method="first", na_option="bottom")
     ).sort_values(["query", "result_rank"])
+
+
+def export_linear_model(results, filename):
+    """Save a fitted statsmodels regression for MORPHODICT_RANKING_MODEL_FILE
+
+    The terms of the formula must be named like the columns of
+    `CreeDictionary.API.search.ranking.RANKING_FEATURES`.
+    """
+    with open(filename, "w") as f:
+        json.dump({"type": "linear", "params": results.params.to_dict()}, f, indent=2)
+
+
+def export_tree_ensemble(trees, feature_names, filename, base_score=0.0, scale=1.0):
+    """Save fitted scikit-learn-style regression trees for
+    MORPHODICT_RANKING_MODEL_FILE
+
+    `trees` are the fitted `tree_` objects, and `feature_names` the
+    ranking.RANKING_FEATURES name of each column the trees were trained on. The
+    score is `base_score + scale * sum(tree predictions)`, so for a random
+    forest use `scale=1 / len(trees)`, and for gradient boosting use the
+    initial prediction as `base_score` and the learning rate as `scale`.
+    """
+    exported = []
+    for tree in trees:
+        is_leaf = tree.children_left == -1
+        exported.append(
+            {
+                "feature": [
+                    None if leaf else feature_names[feature]
+                    for leaf, feature in zip(is_leaf, tree.feature)
+                ],
+                "threshold": tree.threshold.tolist(),
+                "left": tree.children_left.tolist(),
+                "right": tree.children_right.tolist(),
+                "value": tree.value.reshape(len(is_leaf), -1)[:, 0].tolist(),
+            }
+        )
+    with open(filename, "w") as f:
+        json.dump(
+            {
+                "type": "tree_ensemble",
+                "base_score": base_score,
+                "scale": scale,
+                "trees": exported,
+            },
+            f,
+        )
@@ -52,3 +52,49 @@ def test_click_in_text_disables_affix_search(client):
         reverse("cree-dictionary-word-click-in-text-api") + f"?q={ASCII_WAPAMEW}"
     ).content.decode("utf-8")
     assert EXPECTED_SUFFIX_SEARCH_RESULT not in click_in_text_response
+
+
+@pytest.mark.django_db
+def test_click_in_text_batch_matches_single_queries(client):
+    queries = ["niskak", ASCII_WAPAMEW, "niskak"]
+
+    batch_response = client.get(
+        reverse("cree-dictionary-word-click-in-text-batch-api"), {"q": queries}
+    )
+
+    assert batch_response.status_code == 200
+    batch_results = batch_response.json()["results"]
+    assert list(batch_results.keys()) == ["niskak", ASCII_WAPAMEW]
+    for q in batch_results:
+        single_response = client.get(
+            reverse("cree-dictionary-word-click-in-text-api"), {"q": q}
+        )
+        assert batch_results[q] == single_response.json()["results"]
+
+
+@pytest.mark.django_db
+def test_click_in_text_batch_no_params(client):
+    response = client.get(reverse("cree-dictionary-word-click-in-text-batch-api"))
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_click_in_text_pages_results(client):
+    url = reverse("cree-dictionary-word-click-in-text-api")
+    everything = client.get(url, {"q": "see"}).json()
+    assert everything["total_count"] == len(everything["results"]) > 2
+
+    page = client.get(url, {"q": "see", "limit": 2, "offset": 1}).json()
+    assert page["total_count"] == everything["total_count"]
+    assert page["results"] == everything["results"][1:3]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"limit": "many"}, {"offset": "-1"}])
+def test_click_in_text_bad_page_params(client, params):
+    response = client.get(
+        reverse("cree-dictionary-word-click-in-text-api"), {"q": "niskak", **params}
+    )
+
+    assert response.status_code == 400
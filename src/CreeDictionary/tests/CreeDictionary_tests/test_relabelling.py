@@ -80,3 +80,20 @@ def test_chunks_make_full_labels():
         ("Ind",),
         ("3Sg", "4Sg/PlO"),
     ]
+
+
+def test_memoized_relabellings_are_not_shared():
+    tag_set = ("V", "TA", "Prs", "Ind", "3Sg", "4Sg/PlO")
+    first = labels.english.get_full_relabelling(tag_set)
+    first.append("changed by the caller")
+
+    assert labels.english.get_full_relabelling(tag_set) == first[:-1]
+    assert list(labels.english.chunk(tag_set)) == list(labels.english.chunk(tag_set))
+
+
+def test_matched_tag_set_without_label_falls_back_to_tag():
+    # 3Sg+4Sg/PlO has no short linguistic label, so its tags are used instead
+    assert labels.linguistic_short.get_full_relabelling(("3Sg", "4Sg/PlO")) == [
+        "3Sg",
+        "→ 4",
+    ]
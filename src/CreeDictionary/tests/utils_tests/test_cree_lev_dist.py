@@ -1,10 +1,14 @@
 from string import ascii_letters
 
+import math
+
 import pytest
 from hypothesis import assume, example, given
-from hypothesis.strategies import text
+from hypothesis.strategies import floats, lists, none, one_of, text
 from Levenshtein import distance
-from CreeDictionary.utils import get_modified_distance
+from CreeDictionary.utils import get_modified_distance, get_modified_distances
+
+CREE_ISH_LETTERS = "aâāeêēiîīoôōhkmnpstwyAÂH"
 
 
 @given(text(alphabet=ascii_letters), text(alphabet=ascii_letters))
@@ -38,3 +42,27 @@ def test_get_distance_basic_lev(spelling: str, normal_form: str):
 )
 def test_get_distance(spelling: str, normal_form: str, expected_distance):
     assert get_modified_distance(spelling, normal_form) == expected_distance
+
+
+@given(
+    lists(text(alphabet=CREE_ISH_LETTERS)),
+    text(alphabet=CREE_ISH_LETTERS),
+    one_of(none(), floats(min_value=0, max_value=5)),
+)
+@example([], "", None)
+@example(["atâk", "atak", "adak", ""], "atâhk", 1)
+def test_get_distances_matches_get_distance(spellings, normal_form, max_distance):
+    """
+    The batch version must give exactly the same numbers, with anything over
+    max_distance reported as infinity.
+    """
+    expected = [get_modified_distance(s, normal_form) for s in spellings]
+    if max_distance is not None:
+        expected = [d if d <= max_distance else math.inf for d in expected]
+
+    assert (
+        get_modified_distances(
+            spellings, normal_form, max_distance=max_distance
+        ).tolist()
+        == expected
+    )
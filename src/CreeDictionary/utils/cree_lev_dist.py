@@ -1,3 +1,8 @@
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+
 VOWELS = {"a", "e", "i", "o"}
 
 
@@ -119,3 +124,118 @@ def get_modified_distance(spelling: str, normal_form: str) -> float:
             d[i][j] = min((_del_dist, _ins_dist, _sub_dist))
 
     return d[-1][-1]
+
+
+def _ins_costs(normal_form: str) -> np.ndarray:
+    """
+    Cumulative insertion costs for each prefix of normal_form, i.e., the first
+    row of the get_modified_distance() table.
+    """
+    costs = np.zeros(len(normal_form) + 1)
+    for j in range(1, len(normal_form) + 1):
+        costs[j] = ins_dist(normal_form, normal_form[j - 1], j - 1)
+    return np.cumsum(costs)
+
+
+def _char_codes(strings: Sequence[str], length: int) -> np.ndarray:
+    """
+    Code points of the strings as a (len(strings), length) array, padded with
+    -1, which matches no character.
+    """
+    codes = np.full((len(strings), length), -1, dtype=np.int64)
+    for k, string in enumerate(strings):
+        codes[k, : len(string)] = [ord(c) for c in string]
+    return codes
+
+
+_ascii_vowel_codes = np.array([ord(v) for v in VOWELS])
+
+
+def get_modified_distances(
+    spellings: Sequence[str],
+    normal_form: str,
+    *,
+    max_distance: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Compute get_modified_distance(spelling, normal_form) for every spelling at
+    once.
+
+    Instead of filling in one table per spelling cell by cell, this fills in
+    one row at a time, for all spellings together. Insertion costs only depend
+    on normal_form, so within a row the insertions reduce to a running
+    minimum.
+
+    If max_distance is given, spellings are dropped as soon as every cell in
+    their current row exceeds it, since the distance can only grow from
+    there; their distance is reported as infinity.
+
+    >>> get_modified_distances(["atâk", "atak", "adak"], "atâhk").tolist()
+    [0.5, 1.0, 2.0]
+    >>> get_modified_distances(["atâk", "kîsikâw"], "atâhk", max_distance=1).tolist()
+    [0.5, inf]
+    """
+    spellings = [s.lower() for s in spellings]
+    normal_form = normal_form.lower()
+    m = len(normal_form)
+
+    distances = np.full(len(spellings), math.inf)
+    if not spellings:
+        return distances
+
+    lengths = np.array([len(s) for s in spellings])
+    max_length = lengths.max()
+
+    codes = _char_codes(spellings, max_length)
+    ascii_codes = _char_codes(
+        [remove_cree_diacritics(s) for s in spellings], max_length
+    )
+    normal_form_codes = _char_codes([normal_form], m)[0]
+    normal_form_ascii_codes = _char_codes([remove_cree_diacritics(normal_form)], m)[0]
+
+    # Substituting a letter that only differs in its diacritic costs ½, except
+    # on e, where it is free.
+    diacritic_only_cost = np.where(normal_form_ascii_codes == ord("e"), 0.0, 0.5)
+
+    # Deleting an h right after a vowel costs ½
+    del_costs = np.ones((len(spellings), max_length))
+    del_costs[:, 1:][
+        np.isin(ascii_codes[:, :-1], _ascii_vowel_codes) & (codes[:, 1:] == ord("h"))
+    ] = 0.5
+
+    ins_cumulative = _ins_costs(normal_form)
+
+    # Indices into spellings of the rows still being computed
+    active = np.arange(len(spellings))
+    row = np.broadcast_to(ins_cumulative, (len(spellings), m + 1))
+    distances[lengths == 0] = ins_cumulative[m]
+
+    for i in range(1, max_length + 1):
+        keep = lengths[active] >= i
+        active, row = active[keep], row[keep]
+        if len(active) == 0:
+            break
+
+        char = codes[active, i - 1][:, None]
+        ascii_char = ascii_codes[active, i - 1][:, None]
+        sub_costs = np.where(
+            char == normal_form_codes,
+            0.0,
+            np.where(ascii_char == normal_form_ascii_codes, diacritic_only_cost, 1.0),
+        )
+
+        del_cost = del_costs[active, i - 1][:, None]
+        best = row + del_cost
+        best[:, 1:] = np.minimum(best[:, 1:], row[:, :-1] + sub_costs)
+        row = np.minimum.accumulate(best - ins_cumulative, axis=1) + ins_cumulative
+
+        done = lengths[active] == i
+        distances[active[done]] = row[done, m]
+
+        if max_distance is not None:
+            hopeful = row.min(axis=1) <= max_distance
+            active, row = active[hopeful], row[hopeful]
+
+    if max_distance is not None:
+        distances[distances > max_distance] = math.inf
+    return distances
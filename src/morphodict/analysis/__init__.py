@@ -1,24 +1,51 @@
-from functools import cache
+from __future__ import annotations
+
+import sys
+import unicodedata
+from functools import cache, partial
+from multiprocessing.pool import Pool
+from typing import Iterable, Optional
 
 from django.conf import settings
 from hfst_optimized_lookup import TransducerFile, Analysis
 
+from .lookup_cache import CachedTransducer
+
 FST_DIR = settings.BASE_DIR / "resources" / "fst"
 
 
+def _cached_transducer(filename) -> CachedTransducer:
+    return CachedTransducer(
+        TransducerFile(FST_DIR / filename), maxsize=settings.FST_LOOKUP_CACHE_SIZE
+    )
+
+
 @cache
 def strict_generator():
-    return TransducerFile(FST_DIR / settings.STRICT_GENERATOR_FST_FILENAME)
+    return _cached_transducer(settings.STRICT_GENERATOR_FST_FILENAME)
 
 
 @cache
 def relaxed_analyzer():
-    return TransducerFile(FST_DIR / settings.RELAXED_ANALYZER_FST_FILENAME)
+    return _cached_transducer(settings.RELAXED_ANALYZER_FST_FILENAME)
 
 
 @cache
 def strict_analyzer():
-    return TransducerFile(FST_DIR / settings.STRICT_ANALYZER_FST_FILENAME)
+    return _cached_transducer(settings.STRICT_ANALYZER_FST_FILENAME)
+
+
+def fst_lookup_cache_stats() -> dict[str, dict[str, float]]:
+    """Hit rates and sizes of the lookup caches of the FSTs loaded so far"""
+    return {
+        name: transducer().stats()
+        for name, transducer in [
+            ("strict_generator", strict_generator),
+            ("relaxed_analyzer", relaxed_analyzer),
+            ("strict_analyzer", strict_analyzer),
+        ]
+        if transducer.cache_info().currsize
+    }
 
 
 def rich_analyze_relaxed(text):
@@ -33,26 +60,112 @@ def rich_analyze_strict(text):
     )
 
 
+# Stripped from both ends of tokens. Hyphens are kept, since they are part of
+# Cree words, e.g., in preverbs like “ê-”.
+_TOKEN_PUNCTUATION = ".,;:!?\"'()[]{}<>«»“”‘’…—–/"
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into words, dropping surrounding punctuation.
+
+    >>> tokenize("“Tânisi,” itwêw. ê-nipât!")
+    ['Tânisi', 'itwêw', 'ê-nipât']
+    """
+    tokens = (word.strip(_TOKEN_PUNCTUATION) for word in text.split())
+    return [token for token in tokens if token]
+
+
+def analyze_many(
+    texts: Iterable[str], strict=False, pool: Optional[Pool] = None
+) -> dict[str, list[RichAnalysis]]:
+    """
+    Analyze all the words in a batch of texts at once.
+
+    Each distinct token, as returned by tokenize(), is analyzed once, after
+    NFC-normalizing and lowercasing it. Tokens that are not in the FST lookup
+    cache are analyzed in the worker processes of `pool` if one is given,
+    which is worth it for whole corpora but not for a single request.
+
+    :return: a dict mapping each distinct token, in order of first
+        appearance, to its analyses
+    """
+    normalized_tokens: dict[str, str] = {}
+    for text in texts:
+        for token in tokenize(text):
+            if token not in normalized_tokens:
+                normalized_tokens[token] = unicodedata.normalize("NFC", token).lower()
+
+    analyzer = strict_analyzer() if strict else relaxed_analyzer()
+    map_misses = None
+    if pool is not None:
+
+        def map_misses(misses):
+            return pool.map(partial(_analyze, strict), misses, chunksize=100)
+
+    analyses = analyzer.bulk_lookup_lemma_with_affixes(
+        normalized_tokens.values(), map_misses=map_misses
+    )
+
+    return {
+        token: [RichAnalysis(a) for a in analyses[normalized]]
+        for token, normalized in normalized_tokens.items()
+    }
+
+
+def _analyze(strict, text):
+    # Runs in the worker processes of analyze_many()
+    analyzer = strict_analyzer() if strict else relaxed_analyzer()
+    return analyzer.lookup_lemma_with_affixes(text)
+
+
+# Every distinct sequence of tags, with the tags interned, so that analyses
+# share their tag tuples and compare tags by identity. The FSTs only produce so
+# many tag sequences, but stop adding to this past a generous limit.
+_interned_tag_tuples: dict[tuple[str, ...], tuple[str, ...]] = {}
+_MAX_INTERNED_TAG_TUPLES = 100_000
+
+
+def _intern_tags(tags) -> tuple[str, ...]:
+    tags = tuple(tags)
+    interned = _interned_tag_tuples.get(tags)
+    if interned is None:
+        interned = tuple(sys.intern(tag) for tag in tags)
+        if len(_interned_tag_tuples) < _MAX_INTERNED_TAG_TUPLES:
+            _interned_tag_tuples[interned] = interned
+    return interned
+
+
 class RichAnalysis:
     """The one true FST analysis class.
 
     Put all your methods for dealing with things like `PV/e+nipâw+V+AI+Cnj+3Pl`
     here.
+
+    Instances are immutable, so derived values like smushed() are computed at
+    most once.
     """
 
+    __slots__ = ("_tuple", "_tag_set", "_smushed", "_hash")
+
     def __init__(self, analysis):
-        if isinstance(analysis, Analysis):
-            self._tuple = analysis
-        elif (isinstance(analysis, list) or isinstance(analysis, tuple)) and len(
+        if (isinstance(analysis, list) or isinstance(analysis, tuple)) and len(
             analysis
         ) == 3:
+            # Analysis is a tuple too
             prefix_tags, lemma, suffix_tags = analysis
             self._tuple = Analysis(
-                prefixes=tuple(prefix_tags), lemma=lemma, suffixes=tuple(suffix_tags)
+                prefixes=_intern_tags(prefix_tags),
+                lemma=lemma,
+                suffixes=_intern_tags(suffix_tags),
             )
         else:
             raise Exception(f"Unsupported argument: {analysis=!r}")
 
+        self._tag_set: Optional[frozenset[str]] = None
+        self._smushed: Optional[str] = None
+        self._hash: Optional[int] = None
+
     @property
     def tuple(self):
         return self._tuple
@@ -73,28 +186,42 @@ class RichAnalysis:
         return strict_generator().lookup(self.smushed())
 
     def smushed(self):
-        return "".join(self.prefix_tags) + self.lemma + "".join(self.suffix_tags)
+        if self._smushed is None:
+            self._smushed = (
+                "".join(self.prefix_tags) + self.lemma + "".join(self.suffix_tags)
+            )
+        return self._smushed
 
-    def tag_set(self):
-        return set(self.suffix_tags + self.prefix_tags)
+    def tag_set(self) -> frozenset[str]:
+        if self._tag_set is None:
+            self._tag_set = frozenset(self.suffix_tags + self.prefix_tags)
+        return self._tag_set
 
     def tag_intersection_count(self, other):
         """How many tags does this analysis have in common with another?"""
         if not isinstance(other, RichAnalysis):
             raise Exception(f"Unsupported argument: {other=!r}")
-        return len(self.tag_set().intersection(other.tag_set()))
+        return len(self.tag_set() & other.tag_set())
 
     def __iter__(self):
         """Allows doing `head, _, tail = rich_analysis`"""
         return iter(self._tuple)
 
     def __hash__(self):
-        return hash(self._tuple)
+        if self._hash is None:
+            self._hash = hash(self._tuple)
+        return self._hash
 
     def __eq__(self, other):
         if not isinstance(other, RichAnalysis):
             return NotImplemented
-        return self._tuple == other.tuple
+        return self is other or self._tuple == other._tuple
+
+    def __getstate__(self):
+        return self._tuple
+
+    def __setstate__(self, state):
+        self.__init__(state)
 
     def __repr__(self):
         return f"RichAnalysis({[self.prefix_tags, self.lemma, self.suffix_tags]!r})"
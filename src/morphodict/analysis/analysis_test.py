@@ -0,0 +1,47 @@
+from hfst_optimized_lookup import Analysis
+
+import morphodict.analysis
+from morphodict.analysis import RichAnalysis, analyze_many
+from morphodict.analysis.lookup_cache import CachedTransducer
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.looked_up = []
+
+    def lookup_lemma_with_affixes(self, string):
+        self.looked_up.append(string)
+        if string == "xyz":
+            return []
+        return [Analysis(prefixes=(), lemma=string, suffixes=("+V", "+AI"))]
+
+
+def test_analyze_many_analyzes_each_distinct_word_once(monkeypatch):
+    fake = FakeAnalyzer()
+    cached = CachedTransducer(fake, maxsize=100)
+    monkeypatch.setattr(morphodict.analysis, "relaxed_analyzer", lambda: cached)
+
+    results = analyze_many(["Nipâw, nipâw!", "“xyz” nipâw."])
+
+    assert list(results.keys()) == ["Nipâw", "nipâw", "xyz"]
+    assert results["Nipâw"] == [RichAnalysis(([], "nipâw", ["+V", "+AI"]))]
+    assert results["nipâw"] == results["Nipâw"]
+    assert results["xyz"] == []
+    assert fake.looked_up == ["nipâw", "xyz"]
+
+
+def test_rich_analysis_shares_interned_tags_and_caches_derived_values():
+    a = RichAnalysis((["PV/e+"], "nipâw", ["+V", "+AI", "+Cnj", "+3Pl"]))
+    b = RichAnalysis(
+        Analysis(
+            prefixes=("PV/e+",), lemma="nipâw", suffixes=("+V", "+AI", "+Cnj", "+3Pl")
+        )
+    )
+
+    assert a == b and hash(a) == hash(b)
+    assert a.suffix_tags is b.suffix_tags
+    assert a.smushed() == "PV/e+nipâw+V+AI+Cnj+3Pl"
+    assert a.smushed() is a.smushed()
+    assert a.tag_set() == {"PV/e+", "+V", "+AI", "+Cnj", "+3Pl"}
+    assert a.tag_set() is a.tag_set()
+    assert a.tag_intersection_count(RichAnalysis(([], "nipâw", ["+V", "+II"]))) == 1
@@ -0,0 +1,89 @@
+"""
+Memoized FST lookups
+
+Popular queries and paradigm cells look up the same strings over and over, and
+every lookup walks the transducer again. CachedTransducer wraps a
+TransducerFile with a bounded, thread-safe LRU cache of its results.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, Optional, Sequence
+
+from hfst_optimized_lookup import Analysis, TransducerFile
+
+from morphodict.lru_cache import LRUCache
+
+_MISSING = object()
+
+
+class CachedTransducer:
+    """
+    The parts of the TransducerFile API that morphodict uses, with every
+    result memoized.
+
+    Methods return fresh lists and sets, like TransducerFile does, so callers
+    may modify them.
+    """
+
+    def __init__(self, transducer: TransducerFile, maxsize: int):
+        self._transducer = transducer
+        self.cache = LRUCache(maxsize)
+
+    def lookup(self, string: str) -> list[str]:
+        return list(self._lookup(string))
+
+    def lookup_lemma_with_affixes(self, string: str) -> list[Analysis]:
+        return list(
+            self.cache.get_or_compute(
+                ("lookup_lemma_with_affixes", string),
+                lambda: tuple(self._transducer.lookup_lemma_with_affixes(string)),
+            )
+        )
+
+    def bulk_lookup(self, strings: Iterable[str]) -> dict[str, set[str]]:
+        return {string: set(self._lookup(string)) for string in strings}
+
+    def bulk_lookup_lemma_with_affixes(
+        self,
+        strings: Iterable[str],
+        map_misses: Optional[
+            Callable[[Sequence[str]], Iterable[Sequence[Analysis]]]
+        ] = None,
+    ) -> dict[str, list[Analysis]]:
+        """
+        lookup_lemma_with_affixes() for many strings at once.
+
+        The strings missing from the cache are analyzed by
+        `map_misses(misses)`, which must return their analyses in the same
+        order; by default, one after the other in this thread. Pass something
+        like a `Pool.map` to analyze them in other processes.
+        """
+        results: dict[str, list[Analysis]] = {}
+        misses = []
+        for string in dict.fromkeys(strings):
+            cached = self.cache.get(("lookup_lemma_with_affixes", string), _MISSING)
+            if cached is _MISSING:
+                misses.append(string)
+            else:
+                results[string] = list(cached)
+
+        if map_misses is None:
+            map_misses = self._analyze_each
+        for string, analyses in zip(misses, map_misses(misses)):
+            analyses = tuple(analyses)
+            self.cache.put(("lookup_lemma_with_affixes", string), analyses)
+            results[string] = list(analyses)
+
+        return results
+
+    def stats(self) -> dict[str, float]:
+        return self.cache.stats()
+
+    def _analyze_each(self, strings: Sequence[str]) -> Iterable[Sequence[Analysis]]:
+        return (self._transducer.lookup_lemma_with_affixes(s) for s in strings)
+
+    def _lookup(self, string: str) -> tuple[str, ...]:
+        return self.cache.get_or_compute(
+            ("lookup", string), lambda: tuple(self._transducer.lookup(string))
+        )
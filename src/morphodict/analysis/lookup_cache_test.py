@@ -0,0 +1,78 @@
+from hfst_optimized_lookup import Analysis
+
+from morphodict.analysis.lookup_cache import CachedTransducer
+
+
+class FakeTransducer:
+    """Counts the lookups that actually reach the FST"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lookup(self, string):
+        self.calls += 1
+        return [string + "+N", string + "+V"]
+
+    def lookup_lemma_with_affixes(self, string):
+        self.calls += 1
+        return [Analysis(prefixes=(), lemma=string, suffixes=("+N",))]
+
+
+def test_cached_transducer_looks_up_each_string_once():
+    fst = FakeTransducer()
+    cached = CachedTransducer(fst, maxsize=10)
+
+    assert cached.lookup("a") == ["a+N", "a+V"]
+    assert cached.lookup("a") == ["a+N", "a+V"]
+    assert cached.bulk_lookup(["a", "b"]) == {"a": {"a+N", "a+V"}, "b": {"b+N", "b+V"}}
+    assert fst.calls == 2
+
+    assert cached.lookup_lemma_with_affixes("a") == [
+        Analysis(prefixes=(), lemma="a", suffixes=("+N",))
+    ]
+    cached.lookup_lemma_with_affixes("a")
+    assert fst.calls == 3
+
+    stats = cached.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cached_results_can_be_modified_by_callers():
+    cached = CachedTransducer(FakeTransducer(), maxsize=10)
+
+    cached.lookup("a").append("junk")
+    cached.bulk_lookup(["a"])["a"].add("junk")
+
+    assert cached.lookup("a") == ["a+N", "a+V"]
+
+
+def test_lookup_cache_can_be_disabled():
+    fst = FakeTransducer()
+    cached = CachedTransducer(fst, maxsize=0)
+    cached.lookup("a")
+    cached.lookup("a")
+    assert fst.calls == 2
+
+
+def test_bulk_lookup_lemma_with_affixes_only_maps_misses():
+    fst = FakeTransducer()
+    cached = CachedTransducer(fst, maxsize=10)
+    cached.lookup_lemma_with_affixes("a")
+
+    mapped = []
+
+    def map_misses(misses):
+        mapped.extend(misses)
+        return [fst.lookup_lemma_with_affixes(s) for s in misses]
+
+    results = cached.bulk_lookup_lemma_with_affixes(
+        ["b", "a", "b", "c"], map_misses=map_misses
+    )
+
+    assert mapped == ["b", "c"]
+    assert set(results) == {"a", "b", "c"}
+    assert results["c"] == [Analysis(prefixes=(), lemma="c", suffixes=("+N",))]
+    assert cached.lookup_lemma_with_affixes("c") == results["c"]
+    assert fst.calls == 3
@@ -0,0 +1,141 @@
+"""
+Generating the inflected forms of lemmas at import time
+
+When auto-translation is on, the import generates every wordform in the
+paradigm of every lemma, and runs every definition of the lemma through the
+English phrase FSTs for each of them. That is CPU-bound FST work with no
+database access, so InflectionGenerator can spread it across a pool of
+processes, each of which loads its own transducers. Results come back in the
+order the jobs were submitted, so that the import inserts the same rows in the
+same order whatever the number of processes.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from multiprocessing.pool import Pool
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+import django
+
+from CreeDictionary.CreeDictionary.paradigm.generation import default_paradigm_manager
+from CreeDictionary.phrase_translate.translate import (
+    TranslationStats,
+    translate_single_definition,
+)
+from morphodict.analysis import RichAnalysis, strict_generator
+
+if TYPE_CHECKING:
+    # Worker processes may import this file before Django is set up, when
+    # importing models would fail.
+    from morphodict.lexicon.models import Wordform
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InflectionJob:
+    """Everything a worker needs to know to inflect and translate one lemma"""
+
+    # The lemma as the generator FST knows it
+    lemma_text: str
+    paradigm: str
+    # The analysis of the lemma itself, which is not generated again
+    lemma_analysis: Optional[RichAnalysis]
+    definition_texts: list[str]
+
+
+@dataclass
+class GeneratedInflection:
+    text: str
+    analysis: RichAnalysis
+    # One entry per InflectionJob.definition_texts; None where there is no
+    # translation. At least one entry is not None.
+    translations: list[Optional[str]]
+
+
+@dataclass
+class InflectionJobResult:
+    inflections: list[GeneratedInflection] = field(default_factory=list)
+    stats: TranslationStats = field(default_factory=TranslationStats)
+
+
+def generate_inflections(job: InflectionJob) -> InflectionJobResult:
+    """Generate and translate the inflections of one lemma
+
+    Only inflections that get at least one translated definition are returned.
+    """
+    from morphodict.lexicon.models import Wordform
+
+    result = InflectionJobResult()
+
+    for (
+        prefix_tags,
+        suffix_tags,
+    ) in default_paradigm_manager().all_analysis_template_tags(job.paradigm):
+        analysis = RichAnalysis((prefix_tags, job.lemma_text, suffix_tags))
+        for generated in strict_generator().lookup(analysis.smushed()):
+            # Skip re-instantiating lemma
+            if analysis == job.lemma_analysis:
+                continue
+
+            # Unsaved, only for translate_single_definition() to look at
+            wordform = Wordform(text=generated, raw_analysis=analysis.tuple)
+            translations = [
+                translate_single_definition(wordform, text, result.stats)
+                for text in job.definition_texts
+            ]
+            if any(t is not None for t in translations):
+                result.inflections.append(
+                    GeneratedInflection(
+                        text=generated, analysis=analysis, translations=translations
+                    )
+                )
+
+    return result
+
+
+class InflectionGenerator:
+    """Runs generate_inflections() over many jobs, in a process pool if asked
+
+    Use as a context manager, so that the pool is shut down afterwards:
+
+        with InflectionGenerator(processes=4) as generator:
+            for job, result in zip(jobs, generator.run(jobs)):
+                ...
+    """
+
+    def __init__(self, processes: int = 1, chunksize: int = 16):
+        """
+        :param processes: the number of worker processes; with 1, everything
+            runs in the calling process
+        :param chunksize: how many jobs to send to a worker at a time
+        """
+        self._processes = processes
+        self._chunksize = chunksize
+        self._pool: Optional[Pool] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run(self, jobs: Iterable[InflectionJob]) -> Iterator[InflectionJobResult]:
+        """Yield the result of each job, in the same order as jobs"""
+        if self._processes <= 1:
+            return map(generate_inflections, jobs)
+
+        if self._pool is None:
+            logger.info(f"Generating inflections in {self._processes} processes")
+            # Where workers are spawned rather than forked, as on macOS, they
+            # start without Django set up
+            self._pool = Pool(self._processes, initializer=django.setup)
+        return self._pool.imap(generate_inflections, jobs, chunksize=self._chunksize)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
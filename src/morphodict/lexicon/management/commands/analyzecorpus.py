@@ -0,0 +1,90 @@
+import json
+import sys
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+from itertools import islice
+from multiprocessing import Pool
+
+import django
+from django.core.management import BaseCommand
+
+from morphodict.analysis import analyze_many
+
+
+class Command(BaseCommand):
+    help = """Analyze every word of a text corpus
+
+    Writes one JSON object per line for each distinct word, in order of first
+    appearance:
+
+        {"token": "nipâw", "analyses": [{"prefixes": [], "lemma": "nipâw",
+         "suffixes": ["+V", "+AI", "+Ind", "+3Sg"], "smushed": "nipâw+V+AI+Ind+3Sg"}]}
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.formatter_class = ArgumentDefaultsHelpFormatter
+
+        parser.add_argument(
+            "corpus", help="A UTF-8 text file to analyze, or - for standard input"
+        )
+        parser.add_argument(
+            "--output-file", help="Write NDJSON here instead of to standard output"
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Use the strict analyzer instead of the relaxed one",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Worker processes to run the analyzer in; 1 to use none",
+        )
+        parser.add_argument(
+            "--batch-lines",
+            type=int,
+            default=10_000,
+            help="Analyze this many lines of the corpus at a time",
+        )
+
+    def handle(self, corpus, output_file, strict, processes, batch_lines, **options):
+        infile = sys.stdin if corpus == "-" else open(corpus, encoding="UTF-8")
+        outfile = (
+            open(output_file, "w", encoding="UTF-8") if output_file else self.stdout
+        )
+
+        pool = Pool(processes, initializer=django.setup) if processes > 1 else None
+        seen = set()
+        try:
+            while batch := list(islice(infile, batch_lines)):
+                analyses = analyze_many(batch, strict=strict, pool=pool)
+                for token, token_analyses in analyses.items():
+                    if token in seen:
+                        continue
+                    seen.add(token)
+                    outfile.write(
+                        json.dumps(
+                            {
+                                "token": token,
+                                "analyses": [
+                                    {
+                                        "prefixes": list(a.prefix_tags),
+                                        "lemma": a.lemma,
+                                        "suffixes": list(a.suffix_tags),
+                                        "smushed": a.smushed(),
+                                    }
+                                    for a in token_analyses
+                                ],
+                            },
+                            ensure_ascii=False,
+                        )
+                        + "\n"
+                    )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            if infile is not sys.stdin:
+                infile.close()
+            if output_file:
+                outfile.close()
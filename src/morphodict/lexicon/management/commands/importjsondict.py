@@ -14,17 +14,17 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management import BaseCommand, call_command
 from django.db import transaction
-from django.db.models import Max
+from django.db.models import Max, Q
 from tqdm import tqdm
 
-from CreeDictionary.CreeDictionary.paradigm.generation import default_paradigm_manager
-from CreeDictionary.phrase_translate.translate import (
-    translate_single_definition,
-    TranslationStats,
+from CreeDictionary.API.search.presentation import (
+    LEMMA_CARD_VERSION,
+    serialize_lemma_card,
 )
+from CreeDictionary.phrase_translate.translate import TranslationStats
 from CreeDictionary.utils.english_keyword_extraction import stem_keywords
-from morphodict.analysis import RichAnalysis, strict_generator
 from morphodict.lexicon import DEFAULT_IMPORTJSON_FILE
+from morphodict.lexicon.generation import InflectionGenerator, InflectionJob
 from morphodict.lexicon.management.commands.buildtestimportjson import entry_sort_key
 from morphodict.lexicon.models import (
     Wordform,
@@ -33,8 +33,13 @@ from morphodict.lexicon.models import (
     TargetLanguageKeyword,
     SourceLanguageKeyword,
     ImportStamp,
+    LemmaCard,
+    analysis_key,
+)
+from morphodict.lexicon.util import (
+    to_source_language_keyword,
+    to_target_language_keyword,
 )
-from morphodict.lexicon.util import to_source_language_keyword
 
 logger = logging.getLogger(__name__)
 
@@ -236,12 +241,21 @@ class Import:
         incremental: bool,
         atomic=True,
         skip_building_vectors_because_testing=False,
+        generation_processes=1,
+        rebuild_lemma_cards=False,
     ):
         """
         Create an Import process.
 
         If atomic is False, this will use batch processing that still works when
         not in a transaction.
+
+        generation_processes is how many processes to generate and translate
+        inflected wordforms in, if translate_wordforms is set.
+
+        rebuild_lemma_cards rebuilds the card of every lemma, instead of only
+        those that are missing or out of date, as a non-incremental import
+        always does.
         """
         self.dictionary_source_cache = DictionarySourceCache()
         self.data = importjson
@@ -251,11 +265,15 @@ class Import:
         self.skip_building_vectors_because_testing = (
             skip_building_vectors_because_testing
         )
+        self.generation_processes = generation_processes
+        self.rebuild_lemma_cards = rebuild_lemma_cards
 
         self._has_run = False
 
-        self.paradigm_manager = default_paradigm_manager()
         self.translation_stats = TranslationStats()
+        # Lemmas to generate inflected wordforms for, with the
+        # definitions_and_sources of each; see create_inflected_wordforms()
+        self.pending_inflections: list[tuple[Wordform, InflectionJob, list]] = []
 
         trigger_deps = not atomic
 
@@ -330,6 +348,7 @@ class Import:
             wf = Wordform(
                 text=entry["head"],
                 raw_analysis=entry.get("analysis", None),
+                analysis_key=analysis_key(entry.get("analysis", None)),
                 fst_lemma=fst_lemma,
                 paradigm=entry.get("paradigm", None),
                 slug=entry["slug"],
@@ -363,6 +382,8 @@ class Import:
             if wf.raw_analysis is None:
                 self.index_unanalyzed_form(wf, seen_source_language_keywords)
 
+        self.create_inflected_wordforms()
+
         # Make sure everything is saved for upcoming formOf queries
         self.flush_insert_buffers()
 
@@ -382,7 +403,8 @@ class Import:
             wf = Wordform.objects.get_or_create(
                 lemma=lemma,
                 text=entry["head"],
-                raw_analysis=entry["analysis"],
+                analysis_key=analysis_key(entry["analysis"]),
+                defaults={"raw_analysis": entry["analysis"]},
             )[0]
             self.create_definitions(wf, entry["senses"])
 
@@ -401,6 +423,10 @@ class Import:
                     breakdown,
                 )
 
+        self.build_lemma_cards(
+            rebuild_all=self.rebuild_lemma_cards or not self.incremental
+        )
+
         timestamp = time.time()
         stamp, created = ImportStamp.objects.get_or_create(
             defaults={"timestamp": timestamp}
@@ -412,7 +438,7 @@ class Import:
         if not self.skip_building_vectors_because_testing:
             # Don’t overwrite the normal test_db definition vectors when doing a
             # test import with only a word or two
-            call_command("builddefinitionvectors")
+            call_command("builddefinitionvectors", incremental=self.incremental)
 
     def populate_wordform_definitions(self, wf, senses):
         should_do_translation = self.translate_wordforms
@@ -438,43 +464,62 @@ class Import:
             else wf.fst_lemma
         )
 
-        for (
-            prefix_tags,
-            suffix_tags,
-        ) in self.paradigm_manager.all_analysis_template_tags(wf.paradigm):
-            analysis = RichAnalysis((prefix_tags, lemma_text, suffix_tags))
-            for generated in strict_generator().lookup(analysis.smushed()):
-                # Skip re-instantiating lemma
-                if analysis == wf.analysis:
-                    continue
-
-                inflected_wordform = Wordform(
-                    # For now, leaving paradigm and linguist_info empty;
-                    # code can get that info from the lemma instead.
-                    text=generated,
-                    raw_analysis=analysis.tuple,
-                    lemma=wf,
-                    is_lemma=False,
-                )
+        self.pending_inflections.append(
+            (
+                wf,
+                InflectionJob(
+                    lemma_text=lemma_text,
+                    paradigm=wf.paradigm,
+                    lemma_analysis=wf.analysis,
+                    definition_texts=[d.text for d, sources in definitions_and_sources],
+                ),
+                definitions_and_sources,
+            )
+        )
 
-                for d, sources in definitions_and_sources:
+    def create_inflected_wordforms(self):
+        """Generate, translate, and add the inflections of pending lemmas
 
-                    translation = translate_single_definition(
-                        inflected_wordform, d.text, self.translation_stats
-                    )
-                    if translation is None:
-                        continue
-
-                    is_inflected_wordform_unsaved = inflected_wordform.id is None
-                    if is_inflected_wordform_unsaved:
-                        self.wordform_buffer.add(inflected_wordform)
-
-                    self._add_definition(
-                        inflected_wordform,
-                        translation,
-                        ("🤖" + source for source in sources),
-                        auto_translation_source=d,
+        The FST work is done by an InflectionGenerator, in parallel if
+        generation_processes > 1; the results are added to the insert buffers
+        here, in order.
+        """
+        pending = self.pending_inflections
+        self.pending_inflections = []
+        if not pending:
+            return
+
+        with InflectionGenerator(self.generation_processes) as generator:
+            results = generator.run(job for wf, job, _ in pending)
+            for (wf, job, definitions_and_sources), result in tqdm(
+                zip(pending, results), total=len(pending), smoothing=0
+            ):
+                self.translation_stats.add(result.stats)
+
+                for inflection in result.inflections:
+                    inflected_wordform = Wordform(
+                        # For now, leaving paradigm and linguist_info empty;
+                        # code can get that info from the lemma instead.
+                        text=inflection.text,
+                        raw_analysis=inflection.analysis.tuple,
+                        analysis_key=inflection.analysis.smushed(),
+                        lemma=wf,
+                        is_lemma=False,
                     )
+                    self.wordform_buffer.add(inflected_wordform)
+
+                    for (d, sources), translation in zip(
+                        definitions_and_sources, inflection.translations
+                    ):
+                        if translation is None:
+                            continue
+
+                        self._add_definition(
+                            inflected_wordform,
+                            translation,
+                            ("🤖" + source for source in sources),
+                            auto_translation_source=d,
+                        )
 
     def _add_definition(self, wordform, text, sources: list[str], **kwargs):
         """Lower-level method to add a definition.
@@ -522,11 +567,54 @@ class Import:
 
         for kw in keywords:
             self.target_language_keyword_buffer.add(
-                TargetLanguageKeyword(text=kw, wordform=wordform)
+                TargetLanguageKeyword(
+                    text=kw,
+                    normalized_text=to_target_language_keyword(kw),
+                    wordform=wordform,
+                )
             )
 
         return definitions_and_sources
 
+    def build_lemma_cards(self, rebuild_all: bool):
+        """Serialize lemmas into LemmaCards
+
+        Unless rebuild_all is set, only the lemmas without an up-to-date card:
+        every lemma imported by this run, plus any with a card of an older
+        LEMMA_CARD_VERSION, or none at all.
+
+        Cards also go out of date when the relabelling files or anything else
+        that serialize_lemma_card() reads change; after such changes, do a
+        non-incremental import, or pass --rebuild-lemma-cards.
+        """
+        lemmas = Wordform.objects.filter(is_lemma=True)
+        if not rebuild_all:
+            lemmas = lemmas.filter(
+                Q(card__isnull=True) | ~Q(card__version=LEMMA_CARD_VERSION)
+            )
+        lemma_ids = list(lemmas.order_by("id").values_list("id", flat=True))
+        if not lemma_ids:
+            return
+
+        # Not .iterator(), which ignores prefetch_related() in Django < 4.1
+        batch_size = 2000
+        with tqdm(total=len(lemma_ids)) as progress:
+            for start in range(0, len(lemma_ids), batch_size):
+                batch_ids = lemma_ids[start : start + batch_size]
+                LemmaCard.objects.filter(wordform_id__in=batch_ids).delete()
+                lemmas = Wordform.objects.filter(id__in=batch_ids).prefetch_related(
+                    "definitions__citations"
+                )
+                LemmaCard.objects.bulk_create(
+                    LemmaCard(
+                        wordform=lemma,
+                        serialized=serialize_lemma_card(lemma),
+                        version=LEMMA_CARD_VERSION,
+                    )
+                    for lemma in lemmas
+                )
+                progress.update(len(lemmas))
+
     def gather_slugs(self):
         # For purging, this is used to track what existed initially
         return {
@@ -619,6 +707,25 @@ class Command(BaseCommand):
                 the last import.
             """,
         )
+        parser.add_argument(
+            "--generation-processes",
+            type=int,
+            default=1,
+            help="""
+                How many processes to generate and translate inflected
+                wordforms in, with --translate-wordforms; by default, all in
+                this process
+            """,
+        )
+        parser.add_argument(
+            "--rebuild-lemma-cards",
+            action="store_true",
+            help="""
+                Rebuild the pre-serialized cards of all lemmas, even with
+                --incremental, for example after changing the relabelling
+                files
+            """,
+        )
         parser.add_argument(
             "--skip-building-vectors-because-testing",
             default=False,
@@ -639,6 +746,8 @@ class Command(BaseCommand):
         translate_wordforms,
         incremental=False,
         skip_building_vectors_because_testing=False,
+        generation_processes=1,
+        rebuild_lemma_cards=False,
         **options,
     ):
         logger.info(f"Importing {json_file}")
@@ -651,6 +760,8 @@ class Command(BaseCommand):
             translate_wordforms=translate_wordforms,
             incremental=incremental,
             skip_building_vectors_because_testing=skip_building_vectors_because_testing,
+            generation_processes=generation_processes,
+            rebuild_lemma_cards=rebuild_lemma_cards,
         )
 
         if atomic:
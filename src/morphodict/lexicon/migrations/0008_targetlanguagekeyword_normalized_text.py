@@ -0,0 +1,52 @@
+from django.db import migrations, models
+from django.db.migrations import RunPython
+
+BATCH_SIZE = 1000
+
+
+def populate_normalized_text(apps, schema_editor):
+    TargetLanguageKeyword = apps.get_model("lexicon", "TargetLanguageKeyword")
+    batch = []
+    for kw in TargetLanguageKeyword.objects.only("id", "text").iterator():
+        # Must match morphodict.lexicon.util.to_target_language_keyword
+        kw.normalized_text = kw.text.lower()
+        batch.append(kw)
+        if len(batch) >= BATCH_SIZE:
+            TargetLanguageKeyword.objects.bulk_update(batch, ["normalized_text"])
+            batch = []
+    if batch:
+        TargetLanguageKeyword.objects.bulk_update(batch, ["normalized_text"])
+
+
+def noop(apps, schema_editor):
+    """Empty operation to allow this migration to be reversed
+
+    The column is dropped by reversing the AddField.
+    """
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lexicon", "0007_merge_20211001_1712"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="targetlanguagekeyword",
+            name="normalized_text",
+            field=models.CharField(
+                default="",
+                help_text="\n            The text, case-normalized by to_target_language_keyword(), so that\n            lookups can use a plain indexed equality or IN comparison instead\n            of a case-insensitive LIKE.\n        ",
+                max_length=60,
+            ),
+        ),
+        RunPython(populate_normalized_text, noop),
+        migrations.AddIndex(
+            model_name="targetlanguagekeyword",
+            index=models.Index(
+                fields=["normalized_text"], name="lexicon_tar_normali_1e9eee_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import morphodict.lexicon.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lexicon", "0008_targetlanguagekeyword_normalized_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LemmaCard",
+            fields=[
+                (
+                    "wordform",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="card",
+                        serialize=False,
+                        to="lexicon.wordform",
+                    ),
+                ),
+                (
+                    "serialized",
+                    models.JSONField(
+                        encoder=morphodict.lexicon.models.DiacriticPreservingJsonEncoder,
+                        help_text="\n            The output of serialize_wordform() for the default animate emoji.\n        ",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations, models
+from django.db.migrations import RunPython
+
+BATCH_SIZE = 1000
+
+
+def populate_analysis_key(apps, schema_editor):
+    Wordform = apps.get_model("lexicon", "Wordform")
+    batch = []
+    for wf in (
+        Wordform.objects.filter(raw_analysis__isnull=False)
+        .only("id", "raw_analysis")
+        .iterator()
+    ):
+        # Must match morphodict.lexicon.models.analysis_key
+        prefixes, lemma, suffixes = wf.raw_analysis
+        wf.analysis_key = "".join(prefixes) + lemma + "".join(suffixes)
+        batch.append(wf)
+        if len(batch) >= BATCH_SIZE:
+            Wordform.objects.bulk_update(batch, ["analysis_key"])
+            batch = []
+    if batch:
+        Wordform.objects.bulk_update(batch, ["analysis_key"])
+
+
+def noop(apps, schema_editor):
+    """Empty operation to allow this migration to be reversed
+
+    The column is dropped by reversing the AddField.
+    """
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lexicon", "0009_lemmacard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wordform",
+            name="analysis_key",
+            field=models.CharField(
+                help_text="\n            raw_analysis as a canonical string, e.g., “PV/e+nipâw+V+AI+Cnj+3Sg”,\n            set by analysis_key() whenever the wordform is saved. Look up\n            wordforms by analysis with this indexed column rather than by\n            comparing JSON.\n        ",
+                max_length=200,
+                null=True,
+            ),
+        ),
+        RunPython(populate_analysis_key, noop),
+        migrations.AddIndex(
+            model_name="wordform",
+            index=models.Index(
+                fields=["analysis_key"], name="lexicon_wor_analysi_c11a69_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lexicon", "0010_wordform_analysis_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lemmacard",
+            name="version",
+            # Existing cards are out of date, as they include analysis_key
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="\n            The LEMMA_CARD_VERSION of the code that serialized this card.\n        ",
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Dict, Literal, Union
+from typing import Dict, Literal, Optional, Union
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
@@ -14,6 +14,7 @@ from CreeDictionary.utils import (
     shared_res_dir,
 )
 from morphodict.analysis import RichAnalysis
+from morphodict.lexicon.util import to_target_language_keyword
 
 # How long a wordform or dictionary head can be. Not actually enforced in SQLite.
 MAX_WORDFORM_LENGTH = 60
@@ -36,6 +37,22 @@ class WordformLemmaManager(models.Manager):
 WordformKey = Union[int, tuple[str, str]]
 
 
+def analysis_key(raw_analysis) -> Optional[str]:
+    """The value of Wordform.analysis_key for the given raw_analysis
+
+    This is the smushed() form of the analysis, so for a RichAnalysis, query
+    with `analysis_key=rich_analysis.smushed()`.
+
+    >>> analysis_key([["PV/e+"], "nipâw", ["+V", "+AI", "+Cnj", "+3Sg"]])
+    'PV/e+nipâw+V+AI+Cnj+3Sg'
+    >>> analysis_key(None) is None
+    True
+    """
+    if raw_analysis is None:
+        return None
+    return RichAnalysis(raw_analysis).smushed()
+
+
 class DiacriticPreservingJsonEncoder(DjangoJSONEncoder):
     """Stores Unicode strings, e.g., "pê", in the database
 
@@ -55,6 +72,17 @@ class Wordform(models.Model):
 
     raw_analysis = models.JSONField(null=True, encoder=DiacriticPreservingJsonEncoder)
 
+    analysis_key = models.CharField(
+        max_length=MAX_TEXT_LENGTH,
+        null=True,
+        help_text="""
+            raw_analysis as a canonical string, e.g., “PV/e+nipâw+V+AI+Cnj+3Sg”,
+            set by analysis_key() whenever the wordform is saved. Look up
+            wordforms by analysis with this indexed column rather than by
+            comparing JSON.
+        """,
+    )
+
     fst_lemma = models.CharField(
         max_length=MAX_WORDFORM_LENGTH,
         null=True,
@@ -131,6 +159,8 @@ class Wordform(models.Model):
             #  - affix tree intialization
             #  - sitemap generation
             models.Index(fields=["is_lemma", "text"]),
+            # Analysis lookups from the relaxed analyzer, ESPT and CVD
+            models.Index(fields=["analysis_key"]),
         ]
 
     def __str__(self):
@@ -140,11 +170,26 @@ class Wordform(models.Model):
         cls_name = type(self).__name__
         return f"<{cls_name}: {self.text} {self.analysis}>"
 
+    def save(self, *args, **kwargs):
+        self.analysis_key = analysis_key(self.raw_analysis)
+        super().save(*args, **kwargs)
+
     @property
     def analysis(self):
-        if self.raw_analysis is None:
+        """
+        The RichAnalysis of raw_analysis, built once per wordform object.
+
+        Assigning a new raw_analysis makes a new one, but changing the contents
+        of the old raw_analysis in place does not.
+        """
+        raw_analysis = self.raw_analysis
+        if raw_analysis is None:
             return None
-        return RichAnalysis(self.raw_analysis)
+        cached = self.__dict__.get("_analysis_cache")
+        if cached is None or cached[0] is not raw_analysis:
+            cached = (raw_analysis, RichAnalysis(raw_analysis))
+            self._analysis_cache = cached
+        return cached[1]
 
     @property
     def key(self) -> WordformKey:
@@ -281,6 +326,16 @@ class Definition(models.Model):
 class TargetLanguageKeyword(models.Model):
     text = models.CharField(max_length=MAX_WORDFORM_LENGTH)
 
+    normalized_text = models.CharField(
+        max_length=MAX_WORDFORM_LENGTH,
+        default="",
+        help_text="""
+            The text, case-normalized by to_target_language_keyword(), so that
+            lookups can use a plain indexed equality or IN comparison instead
+            of a case-insensitive LIKE.
+        """,
+    )
+
     wordform = models.ForeignKey(
         Wordform, on_delete=models.CASCADE, related_name="target_language_keyword"
     )
@@ -291,7 +346,15 @@ class TargetLanguageKeyword(models.Model):
                 fields=["text", "wordform_id"], name="target_kw_text_and_wordform"
             )
         ]
-        indexes = [models.Index(fields=["text"])]
+        indexes = [
+            models.Index(fields=["text"]),
+            models.Index(fields=["normalized_text"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Always, so that it can’t go stale when the text is edited
+        self.normalized_text = to_target_language_keyword(self.text)
+        super().save(*args, **kwargs)
 
     def __repr__(self) -> str:
         return f"<TargetLanguageKeyword(text={self.text!r} of {self.wordform!r} ({self.id})>"
@@ -328,6 +391,35 @@ class SourceLanguageKeyword(models.Model):
         return f"<SourceLanguageKeyword(text={self.text!r} of {self.wordform!r} ({self.id})>"
 
 
+class LemmaCard(models.Model):
+    """The serialized form of a lemma, as shown with every search result
+
+    Built at import time so that search results don’t have to serialize each
+    lemma, with its definitions and relabellings, on every request. Deleting
+    or re-importing the lemma deletes its card.
+    """
+
+    wordform = models.OneToOneField(
+        Wordform, on_delete=models.CASCADE, primary_key=True, related_name="card"
+    )
+
+    serialized = models.JSONField(
+        encoder=DiacriticPreservingJsonEncoder,
+        help_text="""
+            The output of serialize_wordform() for the default animate emoji.
+        """,
+    )
+
+    version = models.PositiveIntegerField(
+        help_text="""
+            The LEMMA_CARD_VERSION of the code that serialized this card.
+        """,
+    )
+
+    def __repr__(self) -> str:
+        return f"<LemmaCard of {self.wordform_id}>"
+
+
 class ImportStamp(models.Model):
     """Holds timestamp of the last import
 
@@ -0,0 +1,45 @@
+from collections import Counter
+
+from CreeDictionary.phrase_translate.translate import TranslationStats
+from morphodict.analysis import RichAnalysis
+from morphodict.lexicon.generation import InflectionGenerator, InflectionJob
+
+
+def test_translation_stats_add():
+    stats = TranslationStats(wordforms_examined=2, definitions_created=1)
+    stats.unknown_tags_during_auto_translation["+X"] += 1
+
+    stats.add(
+        TranslationStats(
+            wordforms_examined=3,
+            unknown_tags_during_auto_translation=Counter({"+X": 2, "+Y": 1}),
+        )
+    )
+
+    assert stats.wordforms_examined == 5
+    assert stats.definitions_created == 1
+    assert stats.unknown_tags_during_auto_translation == Counter({"+X": 3, "+Y": 1})
+
+
+def test_process_pool_generates_the_same_inflections_in_order():
+    jobs = [
+        InflectionJob(
+            lemma_text=lemma,
+            paradigm="VAI",
+            lemma_analysis=RichAnalysis(((), lemma, ("+V", "+AI", "+Ind", "+3Sg"))),
+            definition_texts=[definition],
+        )
+        for lemma, definition in [
+            ("nipâw", "s/he sleeps"),
+            ("mîcisow", "s/he eats"),
+            ("pimipahtâw", "s/he runs"),
+        ]
+    ]
+
+    with InflectionGenerator(processes=1) as generator:
+        in_process = list(generator.run(jobs))
+    with InflectionGenerator(processes=2, chunksize=1) as generator:
+        in_pool = list(generator.run(jobs))
+
+    assert in_pool == in_process
+    assert all(result.inflections for result in in_process)
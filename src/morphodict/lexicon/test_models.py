@@ -0,0 +1,35 @@
+from morphodict.lexicon.models import TargetLanguageKeyword, Wordform
+
+
+def test_wordform_analysis_is_cached_until_raw_analysis_changes():
+    wordform = Wordform(text="nipâw", raw_analysis=[[], "nipâw", ["+V", "+AI"]])
+
+    analysis = wordform.analysis
+    assert analysis.smushed() == "nipâw+V+AI"
+    assert wordform.analysis is analysis
+
+    wordform.raw_analysis = [[], "nipâw", ["+V", "+AI", "+Ind", "+3Sg"]]
+    assert wordform.analysis.smushed() == "nipâw+V+AI+Ind+3Sg"
+
+    wordform.raw_analysis = None
+    assert wordform.analysis is None
+
+
+def test_saving_wordform_sets_analysis_key(db):
+    wordform = Wordform(text="nipâw", raw_analysis=[[], "nipâw", ["+V", "+AI"]])
+    wordform.save()
+    assert Wordform.objects.filter(analysis_key="nipâw+V+AI").get() == wordform
+
+    wordform.raw_analysis = None
+    wordform.save()
+    assert Wordform.objects.get(id=wordform.id).analysis_key is None
+
+
+def test_saving_target_language_keyword_renormalizes_text(db):
+    wordform = Wordform.objects.create(text="nipâw")
+    keyword = TargetLanguageKeyword.objects.create(text="Sleep", wordform=wordform)
+    assert keyword.normalized_text == "sleep"
+
+    keyword.text = "Nap"
+    keyword.save()
+    assert TargetLanguageKeyword.objects.get(id=keyword.id).normalized_text == "nap"
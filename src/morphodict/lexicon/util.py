@@ -19,3 +19,13 @@ def to_source_language_keyword(s: str) -> str:
         .translate(EXTRA_REPLACEMENTS)
         .strip("-")
     )
+
+
+def to_target_language_keyword(s: str) -> str:
+    """Convert a target-language keyword to the form stored in
+    TargetLanguageKeyword.normalized_text
+
+    >>> to_target_language_keyword("Goose")
+    'goose'
+    """
+    return s.lower()
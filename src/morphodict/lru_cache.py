@@ -0,0 +1,89 @@
+"""
+A bounded, thread-safe LRU cache
+
+Shared by the FST lookup cache and the search result cache.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable
+
+
+class LRUCache:
+    """A thread-safe LRU cache with hit, miss, and eviction counters
+
+    Values must be immutable, or treated as such, since they are shared by
+    every caller. A maxsize of 0 or less disables the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """
+        Return the cached value for key, calling compute() to fill it in if
+        needed.
+
+        compute() is called without holding the lock, so two threads missing
+        on the same key at the same time may both compute it; the second one
+        wins. That’s cheaper than making every other caller wait.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value for key, counting a hit or a miss"""
+        if self.maxsize <= 0:
+            return default
+
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+
+    def put(self, key: Hashable, value):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_MISSING = object()
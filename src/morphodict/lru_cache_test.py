@@ -0,0 +1,33 @@
+from threading import Thread
+
+from morphodict.lru_cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("a", lambda: "new") == 1
+    assert cache.get_or_compute("b", lambda: "new") == "new"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_lru_cache_is_thread_safe():
+    cache = LRUCache(maxsize=50)
+
+    def work():
+        for i in range(2_000):
+            cache.get_or_compute(i % 100, lambda: i % 100)
+
+    threads = [Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8_000
+    assert stats["size"] <= 50
@@ -0,0 +1,156 @@
+"""
+Sharing preloaded caches between uwsgi workers
+
+uwsgi loads the WSGI application in its master process and then forks the
+workers, unless it is run with lazy-apps. So anything the application loads
+at startup—see APIConfig.perform_time_consuming_initializations()—can be
+shared between all the workers, as long as the pages holding it are never
+written to. The garbage collector writes to every object it tracks, so
+prepare_to_fork() moves everything loaded so far into the permanent
+generation with gc.freeze(), where the collector leaves it alone.
+
+Each worker logs its unique set size, the memory that is not shared with any
+other process, when it starts and then every WORKER_MEMORY_REPORT_INTERVAL
+seconds.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SMAPS_ROLLUP = Path("/proc/self/smaps_rollup")
+
+
+class MemoryUsage(NamedTuple):
+    """Memory use of a process, in kiB"""
+
+    # Resident set size: all the memory mapped into the process
+    rss: int
+    # Proportional set size: shared pages count 1/n for each of n sharers
+    pss: int
+    # Unique set size: pages not shared with any other process
+    uss: int
+
+    def __str__(self):
+        return (
+            f"USS {self.uss / 1024:,.1f} MiB, PSS {self.pss / 1024:,.1f} MiB, "
+            f"RSS {self.rss / 1024:,.1f} MiB"
+        )
+
+
+def parse_smaps_rollup(text: str) -> MemoryUsage:
+    """
+    >>> parse_smaps_rollup('''\\
+    ... 55d1e3a4a000-7ffd8a5f3000 ---p 00000000 00:00 0       [rollup]
+    ... Rss:              204800 kB
+    ... Pss:               81920 kB
+    ... Private_Clean:      2048 kB
+    ... Private_Dirty:     38912 kB
+    ... ''')
+    MemoryUsage(rss=204800, pss=81920, uss=40960)
+    """
+    fields = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(":")
+        if value.strip().endswith("kB"):
+            fields[name] = int(value.split()[0])
+    return MemoryUsage(
+        rss=fields["Rss"],
+        pss=fields["Pss"],
+        uss=fields["Private_Clean"] + fields["Private_Dirty"],
+    )
+
+
+def memory_usage() -> Optional[MemoryUsage]:
+    """The memory use of this process, or None if the OS does not say"""
+    try:
+        return parse_smaps_rollup(SMAPS_ROLLUP.read_text())
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def prepare_to_fork():
+    """Get the preloaded master process ready to be forked into workers"""
+    # SQLite connections must not be shared across a fork; workers reconnect
+    # on first use.
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count():,} objects before forking")
+
+
+def _log_memory_usage(label: str):
+    usage = memory_usage()
+    if usage is not None:
+        logger.info(f"{label} (pid {os.getpid()}): {usage}")
+
+
+def _report_memory_periodically(label: str, interval: float):
+    while True:
+        time.sleep(interval)
+        _log_memory_usage(label)
+
+
+def after_fork(worker_id: int):
+    """Run in each worker process right after it is forked"""
+    label = f"uwsgi worker {worker_id}"
+    _log_memory_usage(f"{label} started")
+    interval = settings.WORKER_MEMORY_REPORT_INTERVAL
+    if interval:
+        threading.Thread(
+            target=_report_memory_periodically,
+            args=(label, interval),
+            name="memory-report",
+            daemon=True,
+        ).start()
+
+
+def _is_uwsgi_option_on(value) -> bool:
+    """
+    >>> _is_uwsgi_option_on(b"true"), _is_uwsgi_option_on(b"false")
+    (True, False)
+    >>> _is_uwsgi_option_on(None)
+    False
+    """
+    if isinstance(value, bytes):
+        value = value.decode()
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+def preload_for_uwsgi():
+    """Call from the WSGI module once the application has been loaded
+
+    Does nothing outside of uwsgi, or when uwsgi loads the application
+    separately in each worker.
+    """
+    try:
+        import uwsgi
+        from uwsgidecorators import postfork
+    except ImportError:
+        return
+
+    if _is_uwsgi_option_on(uwsgi.opt.get("lazy-apps")) or _is_uwsgi_option_on(
+        uwsgi.opt.get("lazy")
+    ):
+        logger.warning(
+            "MORPHODICT_PRELOAD_BEFORE_FORK has no effect with uwsgi lazy-apps"
+        )
+        return
+
+    _log_memory_usage("uwsgi master preloaded")
+    prepare_to_fork()
+
+    @postfork
+    def _after_fork():
+        after_fork(uwsgi.worker_id())
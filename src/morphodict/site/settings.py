@@ -350,6 +350,32 @@ LOGGING = {
 # We only apply affix search for user queries longer than the threshold length
 AFFIX_SEARCH_THRESHOLD = 4
 
+# How many distinct searches to keep serialized results for, per process. The
+# cache is cleared whenever the dictionary is re-imported. Set to 0 to disable.
+SEARCH_RESULT_CACHE_SIZE = 1024
+
+# Run the independent search stages—keyword lookups, relaxed analysis, affix
+# search, and CVD—concurrently on a thread pool instead of one after another.
+MORPHODICT_CONCURRENT_SEARCH = env.bool("MORPHODICT_CONCURRENT_SEARCH", default=False)
+# Size of the thread pool shared by all concurrent searches in a process
+SEARCH_THREAD_POOL_SIZE = 6
+# With concurrent search, stages still running after this many seconds are
+# dropped from the results instead of holding up the whole request.
+SEARCH_STAGE_TIMEOUT_SECONDS = 2.0
+
+# The most queries the batch click-in-text API will accept in one request
+CLICK_IN_TEXT_BATCH_MAX_QUERIES = 500
+
+# Under uwsgi, load every cache in the master process before it forks the
+# workers, and gc.freeze() it all, so that the workers share those pages
+# copy-on-write instead of each building their own copies.
+MORPHODICT_PRELOAD_BEFORE_FORK = env.bool(
+    "MORPHODICT_PRELOAD_BEFORE_FORK", default=True
+)
+# How often each uwsgi worker logs its unique memory usage, in seconds. Set to
+# 0 to only log it when the worker starts.
+WORKER_MEMORY_REPORT_INTERVAL = 600
+
 # This defaults to False, because in order to work it requires that there
 # be correct tag mappings for all analyzable forms.
 MORPHODICT_SUPPORTS_AUTO_DEFINITIONS = False
@@ -357,11 +383,32 @@ MORPHODICT_SUPPORTS_AUTO_DEFINITIONS = False
 # Enable semantic search via cosine vector distance. Optional because mobile
 # requires libraries we do not currently build, and a smaller vector file.
 MORPHODICT_ENABLE_CVD = True
+# Have builddefinitionvectors also write a quantized copy of the definition
+# vectors, "int8" or "float16", which CVD search scans instead of the full
+# vectors; see CreeDictionary/cvd/quantized.py. None to scan the full vectors.
+MORPHODICT_CVD_QUANTIZATION = None
+# Have builddefinitionvectors also build an approximate nearest-neighbour
+# index, which CVD search uses instead of scanning every definition vector;
+# see CreeDictionary/cvd/ann.py. Takes precedence over the quantized copy.
+MORPHODICT_CVD_ANN_INDEX = False
+# How many clusters of the approximate index to search for each query. More
+# find more of the exact results, but take longer; measure with benchmarkcvd.
+MORPHODICT_CVD_ANN_PROBES = 8
 
 # Enable affix search. Optional because it requires a C++ library which we do
 # not currently build for mobile.
 MORPHODICT_ENABLE_AFFIX_SEARCH = True
 
+# Enable suggestions for misspelled source-language queries that nothing else
+# matched. Costs some memory per process for the deletion index.
+MORPHODICT_ENABLE_FUZZY_SEARCH = True
+# How far, by get_modified_distance(), a suggestion may be from the query
+FUZZY_SEARCH_MAX_DISTANCE = 1.0
+
+# A JSON ranking model to use instead of the built-in one; see
+# CreeDictionary/API/search/ranking.py for the formats.
+MORPHODICT_RANKING_MODEL_FILE = env.path("MORPHODICT_RANKING_MODEL_FILE", default=None)
+
 # Feature currently in development: use fst_lemma database field instead of
 # lemma text when generating wordforms
 MORPHODICT_ENABLE_FST_LEMMA_SUPPORT = False
@@ -371,6 +418,10 @@ STRICT_ANALYZER_FST_FILENAME = "analyser-gt-norm.hfstol"
 RELAXED_ANALYZER_FST_FILENAME = "analyser-gt-desc.hfstol"
 STRICT_GENERATOR_FST_FILENAME = "generator-gt-norm.hfstol"
 
+# How many lookup results to keep, per FST per process. Popular queries and
+# paradigm cells look up the same strings again and again. Set to 0 to disable.
+FST_LOOKUP_CACHE_SIZE = 20_000
+
 # Show a big banner at the top warning that the dictionary is a work in
 # progress. Set this to false once it’s gone through a reasonable amount of
 # testing.
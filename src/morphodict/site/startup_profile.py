@@ -0,0 +1,134 @@
+"""
+Profiling what a fresh process spends on startup
+
+Run by the profilestartup management command in a new interpreter, with
+`python -X importtime`, so that nothing is loaded yet. This times
+django.setup() and then each of the startup_initializers() that
+APIConfig.perform_time_consuming_initializations() runs, and writes the
+results as JSON to the file named on the command line.
+
+Only the standard library is imported at the top of this file, so that the
+first import of everything else is part of what gets measured.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional, TypedDict
+
+
+class StepProfile(TypedDict):
+    name: str
+    seconds: float
+    # Python allocations still live after the step, and the most at any point
+    # during it, from tracemalloc. None when not tracing memory. Memory-mapped
+    # files and most allocations by C libraries are not included.
+    allocated_bytes: Optional[int]
+    peak_allocated_bytes: Optional[int]
+    # Change in resident set size, which does include those, in kiB; None if
+    # the OS does not say
+    rss_delta_kib: Optional[int]
+    # repr() of the exception, if the step failed
+    error: Optional[str]
+
+
+class ImportProfile(TypedDict):
+    self_us: int
+    cumulative_us: int
+
+
+def _rss_kib() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def profile_step(
+    name: str, step: Callable[[], object], trace_memory: bool
+) -> StepProfile:
+    rss_before = _rss_kib()
+    if trace_memory:
+        tracemalloc.start()
+    error = None
+
+    start = time.perf_counter()
+    try:
+        step()
+    except Exception as e:
+        error = repr(e)
+    seconds = time.perf_counter() - start
+
+    allocated = peak = None
+    if trace_memory:
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    rss_after = _rss_kib()
+
+    return {
+        "name": name,
+        "seconds": seconds,
+        "allocated_bytes": allocated,
+        "peak_allocated_bytes": peak,
+        "rss_delta_kib": (
+            rss_after - rss_before
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+        "error": error,
+    }
+
+
+def profile_startup(trace_memory: bool = True) -> list[StepProfile]:
+    """Set up Django and run every startup initializer, timing each"""
+    import django
+
+    steps = [profile_step("django.setup", django.setup, trace_memory)]
+
+    from CreeDictionary.API.apps import startup_initializers
+
+    for name, initializer in startup_initializers():
+        steps.append(profile_step(name, initializer, trace_memory))
+    return steps
+
+
+def parse_importtime(stderr: str) -> dict[str, ImportProfile]:
+    """Parse the output of `python -X importtime`
+
+    >>> parse_importtime('''\\
+    ... import time: self [us] | cumulative | imported package
+    ... import time:       120 |        120 |     _io
+    ... import time:      1500 |       1620 |   gensim.models
+    ... Some other output
+    ... ''')
+    {'_io': {'self_us': 120, 'cumulative_us': 120}, 'gensim.models': {'self_us': 1500, 'cumulative_us': 1620}}
+    """
+    imports: dict[str, ImportProfile] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # header
+            continue
+        imports[module.strip()] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        }
+    return imports
+
+
+if __name__ == "__main__":
+    output_file, trace_memory = sys.argv[1], sys.argv[2] == "trace-memory"
+    # Don’t let APIConfig.ready() preload everything inside django.setup()
+    os.environ.pop("RUN_MAIN", None)
+    os.environ.pop("PERFORM_TIME_CONSUMING_INITIALIZATIONS", None)
+
+    with open(output_file, "w", encoding="UTF-8") as f:
+        json.dump(profile_startup(trace_memory), f)
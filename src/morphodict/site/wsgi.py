@@ -1,5 +1,6 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 """
@@ -28,6 +29,12 @@ os.environ.setdefault("PERFORM_TIME_CONSUMING_INITIALIZATIONS", "True")
 # setting points here.
 application = get_wsgi_application()
 
+# Under uwsgi, share the caches loaded above with all the worker processes
+if settings.MORPHODICT_PRELOAD_BEFORE_FORK:
+    from morphodict.site.preload import preload_for_uwsgi
+
+    preload_for_uwsgi()
+
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication
 # application = HelloWorldApplication(application)